@@ -59,6 +59,9 @@ from .stage_instance import *
 from .interactions import *
 from .components import *
 from .threads import *
+from .ratelimit import *
+from .session import *
+from .monitor import *
 
 
 class VersionInfo(NamedTuple):
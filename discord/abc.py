@@ -1164,6 +1164,7 @@ class Messageable:
         reference: Union[Message, MessageReference, PartialMessage] = ...,
         mention_author: bool = ...,
         view: View = ...,
+        deadline: datetime = ...,
     ) -> Message:
         ...
 
@@ -1182,6 +1183,7 @@ class Messageable:
         reference: Union[Message, MessageReference, PartialMessage] = ...,
         mention_author: bool = ...,
         view: View = ...,
+        deadline: datetime = ...,
     ) -> Message:
         ...
 
@@ -1200,6 +1202,7 @@ class Messageable:
         reference: Union[Message, MessageReference, PartialMessage] = ...,
         mention_author: bool = ...,
         view: View = ...,
+        deadline: datetime = ...,
     ) -> Message:
         ...
 
@@ -1218,6 +1221,7 @@ class Messageable:
         reference: Union[Message, MessageReference, PartialMessage] = ...,
         mention_author: bool = ...,
         view: View = ...,
+        deadline: datetime = ...,
     ) -> Message:
         ...
 
@@ -1237,6 +1241,7 @@ class Messageable:
         reference=None,
         mention_author=None,
         view=None,
+        deadline=None,
     ):
         """|coro|
 
@@ -1306,6 +1311,12 @@ class Messageable:
         stickers: Sequence[Union[:class:`~discord.GuildSticker`, :class:`~discord.StickerItem`]]
             A list of stickers to upload. Must be a maximum of 3.
 
+            .. versionadded:: 2.0
+        deadline: :class:`datetime.datetime`
+            If provided, the message is not sent if it cannot be sent before this time,
+            for example because it would have to wait for a rate limit.
+            Naive datetimes are assumed to be local time.
+
             .. versionadded:: 2.0
 
         Raises
@@ -1314,6 +1325,8 @@ class Messageable:
             Sending the message failed.
         ~discord.Forbidden
             You do not have the proper permissions to send the message.
+        ~discord.DeadlineExceeded
+            The message could not be sent before the ``deadline``.
         ~discord.InvalidArgument
             The ``files`` list is not of the appropriate size,
             you specified both ``file`` and ``files``,
@@ -1391,6 +1404,7 @@ class Messageable:
                     message_reference=reference,
                     stickers=stickers,
                     components=components,
+                    deadline=deadline,
                 )
             finally:
                 file.close()
@@ -1414,6 +1428,7 @@ class Messageable:
                     message_reference=reference,
                     stickers=stickers,
                     components=components,
+                    deadline=deadline,
                 )
             finally:
                 for f in files:
@@ -1430,6 +1445,7 @@ class Messageable:
                 message_reference=reference,
                 stickers=stickers,
                 components=components,
+                deadline=deadline,
             )
 
         ret = state.create_message(channel=channel, data=data)
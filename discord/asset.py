@@ -24,9 +24,12 @@ DEALINGS IN THE SOFTWARE.
 
 from __future__ import annotations
 
+import asyncio
 import io
 import os
-from typing import Any, Literal, Optional, TYPE_CHECKING, Tuple, Union
+import tempfile
+from collections import OrderedDict
+from typing import Any, AsyncIterator, BinaryIO, Callable, List, Literal, Optional, TYPE_CHECKING, Tuple, TypeVar, Union
 from .errors import DiscordException
 from .errors import InvalidArgument
 from . import utils
@@ -46,11 +49,209 @@ VALID_ASSET_FORMATS = VALID_STATIC_FORMATS | {"gif"}
 
 
 MISSING = utils.MISSING
+T = TypeVar('T')
+
+
+class AssetCache:
+    """An on-disk cache of downloaded assets.
+
+    Assets are stored under their key, size and format, e.g. ``a_1234-1024.gif``,
+    so any two assets with the same content share an entry. Once the files in
+    the cache take up more than ``max_size`` bytes, the least recently read
+    ones are deleted.
+
+    Files are written to a temporary file first and then moved into place,
+    so a crash or a concurrent process never sees a partially written asset.
+    The files are read and written in the event loop's default executor.
+
+    Parameters
+    -----------
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The directory to store the assets in. It is created if it does not exist.
+    max_size: :class:`int`
+        The maximum number of bytes to store.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], *, max_size: int = 256 * 1024 * 1024) -> None:
+        self.path: str = os.fspath(path)
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.size: int = 0
+        # file name -> size, least recently used first
+        self._entries: Optional[OrderedDict[str, int]] = None
+
+    def _run(self, func: Callable[..., T], *args: Any) -> asyncio.Future[T]:
+        return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _scan(self) -> OrderedDict[str, int]:
+        os.makedirs(self.path, exist_ok=True)
+        files = []
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.startswith('.'):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+
+        # the modification time is bumped on every hit, so it doubles as the LRU order
+        files.sort()
+        return OrderedDict((name, size) for _, name, size in files)
+
+    async def _load(self) -> OrderedDict[str, int]:
+        if self._entries is None:
+            entries = await self._run(self._scan)
+            # another task might have finished loading in the meantime
+            if self._entries is None:
+                self._entries = entries
+                self.size = sum(entries.values())
+        return self._entries
+
+    def _remove_files(self, names: List[str]) -> None:
+        for name in names:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _open(path: str) -> BinaryIO:
+        fp = open(path, 'rb')
+        os.utime(path)
+        return fp
+
+    async def open(self, name: str) -> Optional[BinaryIO]:
+        entries = await self._load()
+        if name not in entries:
+            self.misses += 1
+            return None
+
+        try:
+            fp = await self._run(self._open, os.path.join(self.path, name))
+        except FileNotFoundError:
+            # removed behind our back
+            self.size -= entries.pop(name, 0)
+            self.misses += 1
+            return None
+
+        entries.move_to_end(name)
+        self.hits += 1
+        return fp
+
+    async def get(self, name: str) -> Optional[bytes]:
+        fp = await self.open(name)
+        if fp is None:
+            return None
+
+        try:
+            return await self._run(fp.read)
+        finally:
+            fp.close()
+
+    async def writer(self, name: str) -> _AssetCacheWriter:
+        await self._load()
+        fd, tmp = await self._run(tempfile.mkstemp, '', '.', self.path)
+        return _AssetCacheWriter(self, name, os.fdopen(fd, 'wb'), tmp)
+
+    async def set(self, name: str, data: bytes) -> None:
+        if len(data) > self.max_size:
+            return
+
+        writer = await self.writer(name)
+        try:
+            await writer.write(data)
+        except BaseException:
+            await writer.abort()
+            raise
+        await writer.commit()
+
+    async def _add(self, name: str, size: int) -> None:
+        entries = await self._load()
+        self.size += size - entries.pop(name, 0)
+        entries[name] = size
+
+        evicted = []
+        while self.size > self.max_size:
+            oldest, oldest_size = entries.popitem(last=False)
+            self.size -= oldest_size
+            evicted.append(oldest)
+
+        if evicted:
+            await self._run(self._remove_files, evicted)
+
+    async def clear(self) -> None:
+        """Deletes every cached asset."""
+        entries = await self._load()
+        names = list(entries)
+        entries.clear()
+        self.size = 0
+        await self._run(self._remove_files, names)
+
+
+class _AssetCacheWriter:
+    # writes an asset into the cache as it is downloaded, it is only
+    # moved into place once it is complete
+    def __init__(self, cache: AssetCache, name: str, fp: BinaryIO, tmp: str) -> None:
+        self.cache: AssetCache = cache
+        self.name: str = name
+        self.size: int = 0
+        self._fp: Optional[BinaryIO] = fp
+        self._tmp: str = tmp
+
+    async def write(self, data: bytes) -> None:
+        if self._fp is None:
+            return
+
+        self.size += len(data)
+        if self.size > self.cache.max_size:
+            # too large to be cached, the download itself carries on
+            await self.abort()
+            return
+
+        await self.cache._run(self._fp.write, data)
+
+    def _finish(self, fp: BinaryIO) -> None:
+        fp.close()
+        os.replace(self._tmp, os.path.join(self.cache.path, self.name))
+
+    def _discard(self, fp: BinaryIO) -> None:
+        fp.close()
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
+
+    async def commit(self) -> None:
+        if self._fp is None:
+            return
+
+        fp, self._fp = self._fp, None
+        try:
+            await self.cache._run(self._finish, fp)
+        except BaseException:
+            await self.cache._run(self._discard, fp)
+            raise
+        await self.cache._add(self.name, self.size)
+
+    async def abort(self) -> None:
+        if self._fp is None:
+            return
+
+        fp, self._fp = self._fp, None
+        await self.cache._run(self._discard, fp)
+
 
 class AssetMixin:
     url: str
     _state: Optional[Any]
 
+    def _cache_key(self) -> Optional[str]:
+        return None
+
+    def _get_cache(self) -> Optional[AssetCache]:
+        if self._state is None or self._cache_key() is None:
+            return None
+        return self._state.http.asset_cache
+
     async def read(self) -> bytes:
         """|coro|
 
@@ -73,13 +274,101 @@ class AssetMixin:
         if self._state is None:
             raise DiscordException('Invalid state (no ConnectionState provided)')
 
-        return await self._state.http.get_from_cdn(self.url)
+        cache = self._get_cache()
+        if cache is None:
+            return await self._state.http.get_from_cdn(self.url)
+
+        key: str = self._cache_key()  # type: ignore
+        data = await cache.get(key)
+        if data is None:
+            data = await self._state.http.get_from_cdn(self.url)
+            await cache.set(key, data)
+        return data
+
+    async def _stream_cached(self, cache: AssetCache, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        key: str = self._cache_key()  # type: ignore
+        fp = await cache.open(key)
+        if fp is not None:
+            try:
+                while True:
+                    chunk = await cache._run(fp.read, chunk_size)
+                    if not chunk:
+                        return
+                    yield chunk
+            finally:
+                fp.close()
+
+        writer = await cache.writer(key)
+        try:
+            async for chunk in self._state.http.stream_from_cdn(self.url, chunk_size=chunk_size):  # type: ignore
+                await writer.write(chunk)
+                yield chunk
+        except BaseException:
+            await writer.abort()
+            raise
+        await writer.commit()
+
+    async def stream(
+        self, *, offset: int = 0, size: Optional[int] = None, chunk_size: int = 65536
+    ) -> AsyncIterator[bytes]:
+        """Retrieves the content of this asset in chunks as they are downloaded.
+
+        This is useful for large assets that should not be held in memory as a whole.
+
+        .. versionadded:: 2.0
+
+        Examples
+        ---------
+
+        Usage ::
+
+            with open('banner.png', 'wb') as f:
+                async for chunk in asset.stream():
+                    f.write(chunk)
 
-    async def save(self, fp: Union[str, bytes, os.PathLike, io.BufferedIOBase], *, seek_begin: bool = True) -> int:
+        Parameters
+        ----------
+        offset: :class:`int`
+            The position in the asset to start reading from.
+        size: Optional[:class:`int`]
+            The maximum number of bytes to read. If ``None``, then
+            the asset is read until the end.
+        chunk_size: :class:`int`
+            The maximum size of a single chunk.
+
+        Raises
+        ------
+        DiscordException
+            There was no internal connection state.
+        HTTPException
+            Downloading the asset failed.
+        NotFound
+            The asset was deleted.
+
+        Yields
+        -------
+        :class:`bytes`
+            The next chunk of the asset.
+        """
+        if self._state is None:
+            raise DiscordException('Invalid state (no ConnectionState provided)')
+
+        async for chunk in self._state.http.stream_from_cdn(self.url, offset=offset, size=size, chunk_size=chunk_size):
+            yield chunk
+
+    async def save(
+        self,
+        fp: Union[str, bytes, os.PathLike, io.BufferedIOBase],
+        *,
+        seek_begin: bool = True,
+        resume: bool = False,
+    ) -> int:
         """|coro|
 
         Saves this asset into a file-like object.
 
+        The asset is written in chunks as it is downloaded.
+
         Parameters
         ----------
         fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
@@ -89,6 +378,12 @@ class AssetMixin:
         seek_begin: :class:`bool`
             Whether to seek to the beginning of the file after saving is
             successfully done.
+        resume: :class:`bool`
+            Whether to continue a previous download if a filename is passed and
+            the file already exists. Only the missing part of the asset is downloaded
+            and appended to the file.
+
+            .. versionadded:: 2.0
 
         Raises
         ------
@@ -105,15 +400,25 @@ class AssetMixin:
             The number of bytes written.
         """
 
-        data = await self.read()
+        # a resumed download is not the whole asset, so it bypasses the cache
+        cache = self._get_cache()
+        chunks = self.stream() if cache is None or resume else self._stream_cached(cache)
+
+        written = 0
         if isinstance(fp, io.BufferedIOBase):
-            written = fp.write(data)
+            async for chunk in chunks:
+                written += fp.write(chunk)
             if seek_begin:
                 fp.seek(0)
             return written
         else:
-            with open(fp, 'wb') as f:
-                return f.write(data)
+            offset = os.path.getsize(fp) if resume and os.path.exists(fp) else 0
+            if offset:
+                chunks = self.stream(offset=offset)
+            with open(fp, 'ab' if offset else 'wb') as f:
+                async for chunk in chunks:
+                    written += f.write(chunk)
+            return written
 
 
 class Asset(AssetMixin):
@@ -272,6 +577,12 @@ class Asset(AssetMixin):
         """:class:`str`: Returns the identifying key of the asset."""
         return self._key
 
+    def _cache_key(self) -> Optional[str]:
+        url = yarl.URL(self._url)
+        _, format = os.path.splitext(url.path)
+        size = url.query.get('size', 'original')
+        return f'{self._key}-{size}{format}'
+
     def is_animated(self) -> bool:
         """:class:`bool`: Returns whether the asset is animated."""
         return self._animated
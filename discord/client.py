@@ -26,6 +26,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import signal
 import sys
 import traceback
@@ -46,9 +47,11 @@ from .errors import *
 from .enums import Status, VoiceRegion
 from .flags import ApplicationFlags, Intents
 from .gateway import *
+from .gateway import HAS_ZSTD, GatewayRatelimiter, TransportCompression
 from .activity import ActivityTypes, BaseActivity, create_activity
 from .voice_client import VoiceClient
-from .http import HTTPClient
+from .asset import AssetCache
+from .http import HTTPClient, ResponseCache
 from .state import ConnectionState
 from . import utils
 from .utils import MISSING
@@ -61,6 +64,10 @@ from .ui.view import View
 from .stage_instance import StageInstance
 from .threads import Thread
 from .sticker import GuildSticker, StandardSticker, StickerPack, _sticker_factory
+from .session import GatewaySession
+from . import snapshot
+from .monitor import LoopMonitor
+from .dispatcher import EventDispatcher
 
 if TYPE_CHECKING:
     from .abc import SnowflakeTime, PrivateChannel, GuildChannel, Snowflake
@@ -68,12 +75,15 @@ if TYPE_CHECKING:
     from .message import Message
     from .member import Member
     from .voice_client import VoiceProtocol
+    from .ratelimit import RateLimitBackend
+    from .session import SessionStore
 
 __all__ = (
     'Client',
 )
 
 Coro = TypeVar('Coro', bound=Callable[..., Coroutine[Any, Any, Any]])
+RawHandlerT = TypeVar('RawHandlerT', bound=Callable[[Any], Any])
 
 
 _log = logging.getLogger(__name__)
@@ -184,6 +194,90 @@ class Client:
         sync your system clock to Google's NTP server.
 
         .. versionadded:: 1.3
+    max_requests_per_second: Optional[:class:`int`]
+        The maximum number of HTTP requests to send per second across every rate limit
+        bucket. Requests over this budget are held back before being sent rather than
+        waiting for Discord's global rate limit to be hit. Passing ``None`` disables this.
+        Defaults to ``50``.
+
+        .. versionadded:: 2.0
+    enable_http_stats: :class:`bool`
+        Whether to collect per-route statistics about HTTP requests, such as the time spent
+        waiting on rate limits, the response latency and the status codes received. A snapshot
+        of these can be retrieved with :meth:`http_stats`. Defaults to ``True``.
+
+        .. versionadded:: 2.0
+    coalesce_requests: :class:`bool`
+        Whether identical ``GET`` requests that are in flight at the same time should share
+        a single request to Discord, e.g. many concurrent calls to :meth:`fetch_user` with the
+        same ID. Every caller receives the same response payload. Defaults to ``False``.
+
+        .. versionadded:: 2.0
+    cache_http_responses: :class:`bool`
+        Whether to cache the responses of endpoints whose data rarely changes, such as
+        :meth:`application_info`, :meth:`fetch_guild`, :meth:`fetch_template`,
+        :meth:`fetch_invite`, :meth:`fetch_webhook` and :meth:`fetch_sticker`.
+        Cached responses expire after a while and are dropped early when the resource is
+        edited or a gateway event such as :func:`on_guild_update` says it changed.
+        The cache can be configured through ``Client.http.response_cache``.
+        Defaults to ``False``.
+
+        .. versionadded:: 2.0
+    max_concurrent_downloads: Optional[:class:`int`]
+        The maximum number of attachments and assets that can be downloaded at the same
+        time, so that large downloads do not take up every connection. Downloads over
+        this limit wait for another to finish. Passing ``None`` disables this.
+        Defaults to ``16``.
+
+        .. versionadded:: 2.0
+    asset_cache_path: Optional[Union[:class:`str`, :class:`os.PathLike`]]
+        A directory to cache downloaded assets in. If given, :meth:`Asset.read` and
+        :meth:`Asset.save` read an asset from this directory if it was downloaded before
+        instead of downloading it again. Defaults to ``None``, which disables the cache.
+
+        .. versionadded:: 2.0
+    asset_cache_max_size: :class:`int`
+        The maximum number of bytes the asset cache may take up on disk. The least
+        recently used assets are deleted once this is exceeded. Defaults to 256 MiB.
+
+        .. versionadded:: 2.0
+    api_base_url: Optional[:class:`str`]
+        The base URL to send REST API requests to instead of Discord's, such as
+        :attr:`discord.ext.mock.MockServer.api_base_url`. The gateway URL is taken
+        from the ``/gateway`` endpoint of this API. Defaults to ``None``.
+
+        .. versionadded:: 2.0
+    ratelimit_backend: Optional[:class:`RateLimitBackend`]
+        A backend consulted before every request so that rate limits are shared
+        with other processes using the same token, such as a
+        :class:`UnixSocketRateLimitBackend`. The backend is not closed along with
+        the client. Defaults to ``None``.
+
+        .. versionadded:: 2.0
+    circuit_breaker_threshold: Optional[:class:`int`]
+        The number of server errors or connection resets within ``circuit_breaker_window``
+        seconds after which requests to a route fail with :exc:`CircuitOpen` instead of
+        being sent, for ``circuit_breaker_cooldown`` seconds. State changes are dispatched
+        through :func:`on_circuit_breaker_update`. Defaults to ``None``, which disables
+        circuit breaking.
+
+        .. versionadded:: 2.0
+    circuit_breaker_window: :class:`float`
+        The window in seconds in which failures are counted. Defaults to ``30.0``.
+
+        .. versionadded:: 2.0
+    circuit_breaker_cooldown: :class:`float`
+        How long in seconds an open circuit breaker refuses requests before letting
+        one through to test the route again. Defaults to ``30.0``.
+
+        .. versionadded:: 2.0
+    retry_budget_ratio: Optional[:class:`float`]
+        The share of recent requests that may be retried after a server error or
+        connection reset, on top of a small fixed allowance. Once it is used up such
+        requests fail right away instead of being retried. ``None`` disables the
+        budget. Defaults to ``0.2``.
+
+        .. versionadded:: 2.0
     enable_debug_events: :class:`bool`
         Whether to enable events that are useful only for debugging gateway related information.
 
@@ -191,6 +285,99 @@ class Client:
         this is ``False`` then those events will not be dispatched (due to performance considerations).
         To enable these events, this must be set to ``True``. Defaults to ``False``.
 
+        .. versionadded:: 2.0
+    gateway_offload_threshold: Optional[:class:`int`]
+        The size in bytes, as received, above which gateway messages are decompressed
+        and parsed in the event loop's default executor rather than on the event loop
+        itself. This keeps large payloads such as ``READY`` or ``GUILD_CREATE`` from
+        blocking the bot. Messages are still processed in order. ``None`` disables this.
+        Defaults to 64 KiB.
+
+        .. versionadded:: 2.0
+    gateway_encoding: :class:`str`
+        The encoding used for gateway messages, either ``'json'`` or ``'etf'``. ETF
+        (Erlang external term format) messages are smaller and carry snowflakes as
+        integers. They are decoded in pure Python unless the ``erlpack`` module is
+        installed, so ETF only saves CPU time with ``erlpack`` present. With ETF,
+        :func:`on_socket_raw_receive` and :func:`on_socket_raw_send` receive
+        :class:`bytes`. Defaults to ``'json'``.
+
+        .. versionadded:: 2.0
+    gateway_compression: Optional[:class:`str`]
+        The transport compression used by the gateway, either ``'zlib-stream'``,
+        ``'zstd-stream'`` or ``None`` to disable it. ``'zstd-stream'`` decompresses
+        faster and compresses better, but requires the ``zstandard`` module or
+        Python 3.14's :mod:`compression.zstd`. Without either, ``'zlib-stream'`` is
+        used instead. See :meth:`compression_stats`. Defaults to ``'zlib-stream'``.
+
+        .. versionadded:: 2.0
+    loop_monitor_interval: Optional[:class:`float`]
+        How often in seconds to measure how late the event loop runs a timer, which is
+        how long something blocked it. See :meth:`loop_stats` and :func:`on_loop_lag`.
+        The monitor also runs a thread that samples the stack of the event loop while it
+        is blocked. Defaults to ``None``, which disables the monitor.
+
+        .. versionadded:: 2.0
+    loop_lag_threshold: :class:`float`
+        The lag in seconds above which :func:`on_loop_lag` is dispatched when
+        ``loop_monitor_interval`` is set. Defaults to ``0.5``.
+
+        .. versionadded:: 2.0
+    heartbeat_watchdog: :class:`bool`
+        Whether to start a thread that logs what the event loop is doing when it is
+        blocked for so long that heartbeats are late, which gets shards disconnected.
+        Heartbeats themselves are sent by the event loop. Defaults to ``True``.
+
+        .. versionadded:: 2.0
+    session_store: Optional[:class:`SessionStore`]
+        Where to persist the gateway sessions, such as a :class:`FileSessionStore`.
+        The sessions are saved when the client is closed and every ``session_save_interval``
+        seconds, and a restarted client RESUMEs them instead of IDENTIFYing. While this is
+        set, closing the client keeps the sessions resumable.
+
+        A RESUMEd session receives no ``READY`` or ``GUILD_CREATE``, so the sessions are
+        only RESUMEd when a cache snapshot was loaded as well, see ``cache_snapshot_path``.
+        Otherwise the client IDENTIFYs as usual. :func:`on_ready` is dispatched once the
+        sessions are RESUMED, or after the ``READY`` if they cannot be resumed anymore.
+        Defaults to ``None``.
+
+        .. versionadded:: 2.0
+    cache_snapshot_path: Optional[Union[:class:`str`, :class:`os.PathLike`]]
+        A file to keep a snapshot of the cache in. The snapshot is loaded by :meth:`login`
+        and saved when the client is closed, see :meth:`load_cache_snapshot`. Closing
+        the client keeps the sessions resumable while this is set. Defaults to ``None``.
+
+        .. versionadded:: 2.0
+    session_save_interval: :class:`float`
+        How often in seconds the gateway sessions are saved to ``session_store`` while
+        the client is running. Defaults to ``60.0``.
+
+        .. versionadded:: 2.0
+    event_concurrency: Optional[Union[:class:`int`, Dict[:class:`str`, :class:`int`]]]
+        The maximum number of handlers of an event that may run at the same time, either
+        for every event or as a mapping of event names such as ``'message'`` to limits,
+        in which case the other events are not limited. Handlers of raw gateway events
+        are limited by their name, e.g. ``'MESSAGE_CREATE'``. Events over the limit wait
+        in a queue of ``event_queue_size`` events, see :meth:`event_stats`.
+        Defaults to ``None``, which schedules every handler right away.
+
+        .. versionadded:: 2.0
+    event_queue_size: :class:`int`
+        How many events of each limited event may wait for a handler to finish
+        before ``event_overflow_policy`` applies. Defaults to ``1000``.
+
+        .. versionadded:: 2.0
+    event_overflow_policy: :class:`str`
+        What to do with an event when its queue is full, one of:
+
+        - ``'block'``: Stop reading from the gateway until there is room again. No events
+          are lost, but every event is delayed. To keep the connection alive, a message is
+          still read every half of ``heartbeat_timeout``.
+        - ``'drop_oldest'``: Drop the event that waited the longest in favour of the new one.
+        - ``'drop_newest'``: Drop the new event.
+
+        Defaults to ``'block'``.
+
         .. versionadded:: 2.0
 
     Attributes
@@ -217,7 +404,39 @@ class Client:
         proxy: Optional[str] = options.pop('proxy', None)
         proxy_auth: Optional[aiohttp.BasicAuth] = options.pop('proxy_auth', None)
         unsync_clock: bool = options.pop('assume_unsync_clock', True)
-        self.http: HTTPClient = HTTPClient(connector, proxy=proxy, proxy_auth=proxy_auth, unsync_clock=unsync_clock, loop=self.loop)
+        max_requests_per_second: Optional[int] = options.pop('max_requests_per_second', 50)
+        enable_http_stats: bool = options.pop('enable_http_stats', True)
+        coalesce_requests: bool = options.pop('coalesce_requests', False)
+        cache_http_responses: bool = options.pop('cache_http_responses', False)
+        max_concurrent_downloads: Optional[int] = options.pop('max_concurrent_downloads', 16)
+        asset_cache_path: Optional[Union[str, os.PathLike]] = options.pop('asset_cache_path', None)
+        asset_cache_max_size: int = options.pop('asset_cache_max_size', 256 * 1024 * 1024)
+        api_base_url: Optional[str] = options.pop('api_base_url', None)
+        ratelimit_backend: Optional[RateLimitBackend] = options.pop('ratelimit_backend', None)
+        circuit_breaker_threshold: Optional[int] = options.pop('circuit_breaker_threshold', None)
+        circuit_breaker_window: float = options.pop('circuit_breaker_window', 30.0)
+        circuit_breaker_cooldown: float = options.pop('circuit_breaker_cooldown', 30.0)
+        retry_budget_ratio: Optional[float] = options.pop('retry_budget_ratio', 0.2)
+        self.http: HTTPClient = HTTPClient(
+            connector,
+            proxy=proxy,
+            proxy_auth=proxy_auth,
+            unsync_clock=unsync_clock,
+            loop=self.loop,
+            max_requests_per_second=max_requests_per_second,
+            enable_stats=enable_http_stats,
+            coalesce_requests=coalesce_requests,
+            response_cache=ResponseCache() if cache_http_responses else None,
+            max_concurrent_downloads=max_concurrent_downloads,
+            asset_cache=AssetCache(asset_cache_path, max_size=asset_cache_max_size) if asset_cache_path else None,
+            api_base_url=api_base_url,
+            ratelimit_backend=ratelimit_backend,
+            circuit_breaker_threshold=circuit_breaker_threshold,
+            circuit_breaker_window=circuit_breaker_window,
+            circuit_breaker_cooldown=circuit_breaker_cooldown,
+            retry_budget_ratio=retry_budget_ratio,
+            dispatch=self.dispatch,
+        )
 
         self._handlers: Dict[str, Callable] = {
             'ready': self._handle_ready
@@ -228,6 +447,35 @@ class Client:
         }
 
         self._enable_debug_events: bool = options.pop('enable_debug_events', False)
+        self._gateway_offload_threshold: Optional[int] = options.pop('gateway_offload_threshold', 64 * 1024)
+        self._gateway_encoding: str = options.pop('gateway_encoding', 'json')
+        if self._gateway_encoding not in ('json', 'etf'):
+            raise ValueError(f'gateway_encoding must be either \'json\' or \'etf\' not {self._gateway_encoding!r}')
+        self._gateway_compression: Optional[str] = options.pop('gateway_compression', 'zlib-stream')
+        if self._gateway_compression not in ('zlib-stream', 'zstd-stream', None):
+            raise ValueError(f'unknown gateway_compression {self._gateway_compression!r}')
+        if self._gateway_compression == 'zstd-stream' and not HAS_ZSTD:
+            _log.warning('zstd-stream gateway compression requires zstandard, using zlib-stream instead.')
+            self._gateway_compression = 'zlib-stream'
+        self._heartbeat_watchdog: bool = options.pop('heartbeat_watchdog', True)
+        loop_monitor_interval: Optional[float] = options.pop('loop_monitor_interval', None)
+        loop_lag_threshold: float = options.pop('loop_lag_threshold', 0.5)
+        self._loop_monitor: Optional[LoopMonitor] = None
+        if loop_monitor_interval is not None:
+            self._loop_monitor = LoopMonitor(self.dispatch, interval=loop_monitor_interval, threshold=loop_lag_threshold)
+        event_concurrency: Optional[Union[int, Dict[str, int]]] = options.pop('event_concurrency', None)
+        event_queue_size: int = options.pop('event_queue_size', 1000)
+        event_overflow_policy: str = options.pop('event_overflow_policy', 'block')
+        self._event_dispatcher: Optional[EventDispatcher] = None
+        if event_concurrency is not None:
+            self._event_dispatcher = EventDispatcher(
+                event_concurrency, queue_size=event_queue_size, policy=event_overflow_policy
+            )
+        self._session_store: Optional[SessionStore] = options.pop('session_store', None)
+        self._session_save_interval: float = options.pop('session_save_interval', 60.0)
+        self._session_task: Optional[asyncio.Task[None]] = None
+        self._cache_snapshot_path: Optional[Union[str, os.PathLike]] = options.pop('cache_snapshot_path', None)
+        self._snapshot_sessions: Optional[List[GatewaySession]] = None
         self._connection: ConnectionState = self._get_state(**options)
         self._connection.shard_count = self.shard_count
         self._closed: bool = False
@@ -245,12 +493,88 @@ class Client:
         return self.ws
 
     def _get_state(self, **options: Any) -> ConnectionState:
-        return ConnectionState(dispatch=self.dispatch, handlers=self._handlers,
-                               hooks=self._hooks, http=self.http, loop=self.loop, **options)
+        return ConnectionState(dispatch=self.dispatch, handlers=self._handlers, hooks=self._hooks,
+                               http=self.http, loop=self.loop, consumes=self._consumes_event, **options)
+
+    def _consumes_event(self, event: str) -> bool:
+        # events nobody listens to can skip building their models
+        return event in self._listeners or hasattr(self, 'on_' + event)
 
     def _handle_ready(self) -> None:
         self._ready.set()
 
+    def _gateway_sessions(self) -> List[GatewaySession]:
+        ws = self.ws
+        if ws is None or ws.session_id is None:
+            return []
+        return [GatewaySession(self.shard_id, self.shard_count, ws.session_id, ws.sequence, ws.resume_gateway_url)]
+
+    def _resume_gateway(self, session: GatewaySession) -> Optional[str]:
+        if session.resume_url is None:
+            return None
+        return self.http._format_gateway(session.resume_url, self._gateway_encoding, self._gateway_compression)
+
+    async def _load_sessions(self) -> Dict[Optional[int], GatewaySession]:
+        snapshot_sessions = self._snapshot_sessions
+        self._snapshot_sessions = None
+        if snapshot_sessions is None:
+            # a RESUME does not resend the guilds, so without a snapshot the cache would stay empty
+            if self._session_store is not None:
+                _log.info('No cache snapshot was loaded, IDENTIFYing instead of resuming the stored sessions.')
+            return {}
+
+        sessions: List[GatewaySession] = []
+        if self._session_store is not None:
+            try:
+                sessions = await self._session_store.load()
+            except Exception:
+                _log.exception('Failed to load the gateway sessions.')
+
+        # the sessions of a loaded cache snapshot match its contents, so they win
+        sessions += snapshot_sessions
+
+        # sessions of another shard count cannot be resumed
+        return {session.shard_id: session for session in sessions if session.shard_count == self.shard_count}
+
+    async def _save_sessions(self) -> None:
+        if self._session_store is None:
+            return
+
+        sessions = self._gateway_sessions()
+        if not sessions:
+            return
+
+        try:
+            await self._session_store.save(sessions)
+        except Exception:
+            _log.exception('Failed to save the gateway sessions.')
+
+    async def _run_session_saver(self) -> None:
+        while not self.is_closed():
+            await asyncio.sleep(self._session_save_interval)
+            await self._save_sessions()
+
+    def _start_session_saver(self) -> None:
+        if self._session_store is not None and self._session_task is None:
+            self._session_task = asyncio.create_task(self._run_session_saver())
+
+    async def _stop_session_saver(self) -> None:
+        if self._session_task is not None:
+            self._session_task.cancel()
+            self._session_task = None
+        await self._save_sessions()
+
+        if self._cache_snapshot_path is not None and self.is_ready():
+            try:
+                await self.save_cache_snapshot(self._cache_snapshot_path)
+            except Exception:
+                _log.exception('Failed to save the cache snapshot.')
+
+    @property
+    def _keeps_sessions(self) -> bool:
+        # closing with 1000 would invalidate the sessions
+        return self._session_store is not None or self._cache_snapshot_path is not None
+
     @property
     def latency(self) -> float:
         """:class:`float`: Measures latency between a HEARTBEAT and a HEARTBEAT_ACK in seconds.
@@ -260,6 +584,127 @@ class Client:
         ws = self.ws
         return float('nan') if not ws else ws.latency
 
+    def http_stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the statistics collected about HTTP requests.
+
+        The returned :class:`dict` has the following keys:
+
+        - ``routes``: A mapping of route template (e.g. ``GET /channels/{channel_id}``) to
+          its request count, retry count, 429 count and sleep time, status codes and
+          histograms for the time spent waiting on the rate limit bucket, waiting for a
+          global rate limit to be over, held back by ``max_requests_per_second`` and
+          waiting for the response.
+        - ``buckets``: The rate limit buckets currently being tracked and how much of
+          their budget is left.
+        - ``bucket_hashes``: A mapping of route template to rate limit bucket hash.
+        - ``global``: The state of the global rate limit.
+
+        If ``enable_http_stats`` was ``False`` then ``routes`` is always empty.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        Dict[:class:`str`, Any]
+            The statistics snapshot.
+        """
+        return self.http.stats_snapshot()
+
+    def compression_stats(self) -> Dict[str, Any]:
+        """Returns statistics about the gateway transport compression of the
+        current connection.
+
+        The returned :class:`dict` has the following keys:
+
+        - ``method``: The compression in use, e.g. ``'zstd-stream'``, or ``None``.
+        - ``compressed_bytes``: The number of bytes received.
+        - ``decompressed_bytes``: The number of bytes they decompressed to.
+        - ``ratio``: ``decompressed_bytes`` divided by ``compressed_bytes``, or ``None``
+          if nothing was received yet.
+        - ``decompress_time``: The total time spent decompressing, in seconds.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        Dict[:class:`str`, Any]
+            The statistics.
+        """
+        transports = [self.ws._transport] if self.ws and self.ws._transport else []
+        return TransportCompression.stats(transports)
+
+    def loop_stats(self) -> Optional[Dict[str, Any]]:
+        """Returns statistics about the event loop lag measured by the monitor
+        enabled with the ``loop_monitor_interval`` option.
+
+        The returned :class:`dict` has the following keys:
+
+        - ``interval``: The ``loop_monitor_interval``.
+        - ``threshold``: The ``loop_lag_threshold``.
+        - ``samples``: The number of recent measurements the percentiles are based on.
+        - ``p50``, ``p90``, ``p99``: Percentiles of the lag, in seconds, or ``None``
+          if nothing was measured yet.
+        - ``max``: The highest recent lag, in seconds, or ``None``.
+        - ``stalls``: The number of times the lag exceeded the threshold.
+        - ``slowest``: The slowest recent :class:`LoopStall` instances, slowest first.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        Optional[Dict[:class:`str`, Any]]
+            The statistics, or ``None`` if the monitor is disabled.
+        """
+        if self._loop_monitor is None:
+            return None
+        return self._loop_monitor.stats()
+
+    def event_stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns counters for the events limited by the ``event_concurrency`` option.
+
+        The returned :class:`dict` maps the names of the events that were dispatched
+        since the client was created to a :class:`dict` with the following keys:
+
+        - ``limit``: The number of handlers of the event that may run at the same time.
+        - ``running``: The number of handlers of the event that are running.
+        - ``pending``: The number of handlers of the event waiting in its queue.
+        - ``queued``: How many handlers of the event had to wait in total.
+        - ``dropped``: How many handlers of the event were dropped in total because
+          of the ``event_overflow_policy``.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        Dict[:class:`str`, Dict[:class:`str`, :class:`int`]]
+            The counters, or an empty :class:`dict` if the events are not limited.
+        """
+        if self._event_dispatcher is None:
+            return {}
+        return self._event_dispatcher.stats()
+
+    def gateway_queue_depth(self) -> Dict[str, int]:
+        """Returns the number of gateway messages waiting for the gateway rate limit,
+        by the lane they are queued in.
+
+        Gateway messages share a limit of 120 per minute. ``'control'`` messages
+        (heartbeats, IDENTIFY and RESUME) may use 10 of them that the other lanes cannot,
+        and are never queued behind them. The other lanes are sent in order of
+        priority: ``'high'`` for presence and voice state updates, then ``'normal'``
+        for member requests and everything else.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        Dict[:class:`str`, :class:`int`]
+            A mapping of the lanes ``'control'``, ``'high'`` and ``'normal'``
+            to the number of messages waiting in them.
+        """
+        if self.ws is None:
+            return dict.fromkeys(GatewayRatelimiter.LANES, 0)
+        return self.ws.queue_depth()
+
     def is_ws_ratelimited(self) -> bool:
         """:class:`bool`: Whether the websocket is currently rate limited.
 
@@ -357,11 +802,18 @@ class Client:
             except asyncio.CancelledError:
                 pass
 
-    def _schedule_event(self, coro: Callable[..., Coroutine[Any, Any, Any]], event_name: str, *args: Any, **kwargs: Any) -> asyncio.Task:
+    def _schedule_event(self, coro: Callable[..., Coroutine[Any, Any, Any]], event_name: str, *args: Any, **kwargs: Any) -> Optional[asyncio.Task]:
         wrapped = self._run_event(coro, event_name, *args, **kwargs)
+        if self._event_dispatcher is not None:
+            # Schedules the task once the event is below its limit, if it is not dropped
+            return self._event_dispatcher.schedule(wrapped, event_name, f'discord.py: {event_name}')
         # Schedules the task
         return asyncio.create_task(wrapped, name=f'discord.py: {event_name}')
 
+    async def _wait_for_event_room(self) -> None:
+        if self._event_dispatcher is not None:
+            await self._event_dispatcher.wait_for_room(self._connection.heartbeat_timeout / 2)
+
     def dispatch(self, event: str, *args: Any, **kwargs: Any) -> None:
         _log.debug('Dispatching event %s', event)
         method = 'on_' + event
@@ -470,9 +922,15 @@ class Client:
 
         _log.info('logging in using static token')
 
+        if self._loop_monitor is not None:
+            self._loop_monitor.start()
+
         data = await self.http.static_login(token.strip())
         self._connection.user = ClientUser(state=self._connection, data=data)
 
+        if self._cache_snapshot_path is not None:
+            await self.load_cache_snapshot(self._cache_snapshot_path)
+
     async def connect(self, *, reconnect: bool = True) -> None:
         """|coro|
 
@@ -503,12 +961,28 @@ class Client:
             'initial': True,
             'shard_id': self.shard_id,
         }
+        session = (await self._load_sessions()).get(self.shard_id)
+        if session is not None:
+            _log.info('Shard ID %s is resuming the stored session %s.', self.shard_id, session.session_id)
+            ws_params.update(
+                gateway=self._resume_gateway(session),
+                session=session.session_id,
+                sequence=session.sequence,
+                resume=True,
+            )
+            self._connection._pending_resumes = {self.shard_id}
+
+        self._start_session_saver()
         while not self.is_closed():
             try:
                 coro = DiscordWebSocket.from_client(self, **ws_params)
                 self.ws = await asyncio.wait_for(coro, timeout=60.0)
                 ws_params['initial'] = False
+                if session is not None:
+                    session = None
+                    ws_params.pop('gateway')
                 while True:
+                    await self._wait_for_event_room()
                     await self.ws.poll_event()
             except ReconnectWebSocket as e:
                 _log.info('Got a request to %s the websocket.', e.op)
@@ -574,8 +1048,13 @@ class Client:
                 # if an error happens during disconnects, disregard it.
                 pass
 
+        await self._stop_session_saver()
+        if self._loop_monitor is not None:
+            self._loop_monitor.stop()
+        if self._event_dispatcher is not None:
+            self._event_dispatcher.close()
         if self.ws is not None and self.ws.open:
-            await self.ws.close(code=1000)
+            await self.ws.close(code=4000 if self._keeps_sessions else 1000)
 
         await self.http.close()
         self._ready.clear()
@@ -592,6 +1071,71 @@ class Client:
         self._connection.clear()
         self.http.recreate()
 
+    async def save_cache_snapshot(self, path: Union[str, os.PathLike]) -> None:
+        """|coro|
+
+        Saves the cached guilds, members, users, emojis and stickers to a file that
+        a restarted client can load with :meth:`load_cache_snapshot`.
+
+        The snapshot records the gateway sessions as well, so that the client loading
+        it RESUMEs them from the point the snapshot was taken. The file is written
+        atomically.
+
+        .. versionadded:: 2.0
+
+        .. warning::
+
+            Snapshots are pickled. Only load snapshots written by your own bot.
+
+        Parameters
+        -----------
+        path: Union[:class:`str`, :class:`os.PathLike`]
+            The file to save the snapshot to.
+        """
+        data = snapshot.dumps(self._connection, self._gateway_sessions())
+        await self.loop.run_in_executor(None, snapshot.write, path, data)
+
+    async def load_cache_snapshot(self, path: Union[str, os.PathLike]) -> bool:
+        """|coro|
+
+        Loads a snapshot saved by :meth:`save_cache_snapshot` into the cache.
+        This must be done after :meth:`login` and before connecting.
+
+        The gateway sessions recorded in the snapshot are RESUMEd, after which
+        the replayed events bring the cache up to date. If a session cannot be
+        RESUMEd, the guilds of the following ``READY`` are rebuilt from their
+        ``GUILD_CREATE`` as usual, but keep the restored members when that accounts
+        for the whole member count so they don't need to be chunked again.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        path: Union[:class:`str`, :class:`os.PathLike`]
+            The file to load the snapshot from.
+
+        Returns
+        --------
+        :class:`bool`
+            Whether the snapshot was loaded. Missing files and snapshots written
+            by another version of the library are ignored.
+        """
+        try:
+            data = await self.loop.run_in_executor(None, snapshot.read, path)
+        except FileNotFoundError:
+            return False
+
+        try:
+            cache, sessions = snapshot.loads(self._connection, data)
+        except snapshot.SnapshotError as exc:
+            _log.warning('Ignoring the cache snapshot at %s: %s', path, exc)
+            return False
+
+        self._connection._load_cache(cache)
+        self._snapshot_sessions = sessions
+        _log.info('Loaded %d guilds from the cache snapshot at %s.', len(cache['guilds']), path)
+        return True
+
     async def start(self, token: str, *, reconnect: bool = True) -> None:
         """|coro|
 
@@ -1044,6 +1588,97 @@ class Client:
         _log.debug('%s has successfully been registered as an event', coro.__name__)
         return coro
 
+    def add_raw_handler(self, event: str, handler: Callable[[Any], Any]) -> None:
+        """Makes a gateway event skip the library and go straight to ``handler``.
+
+        The handler is called with the payload of the event, the ``d`` key of the
+        gateway message, as decoded from the gateway. Nothing is built or cached for
+        events handled this way and their regular events, e.g. :func:`on_message`
+        for ``MESSAGE_CREATE``, are no longer dispatched. This is meant for bots
+        that only pass events on to somewhere else.
+
+        The handler can either be a regular function, which is called right away and
+        should return quickly, or a :ref:`coroutine <coroutine>` function, which is
+        scheduled like an event. Only one handler can be registered per event.
+
+        .. versionadded:: 2.0
+
+        Example
+        ---------
+
+        .. code-block:: python3
+
+            queue = asyncio.Queue()
+            client.add_raw_handler('MESSAGE_CREATE', queue.put_nowait)
+
+        Parameters
+        -----------
+        event: :class:`str`
+            The name of the gateway event, e.g. ``'MESSAGE_CREATE'``.
+        handler
+            The function that receives the payloads.
+
+        Raises
+        -------
+        ValueError
+            The event is not a known gateway event, or is one the client needs
+            to function such as ``READY``.
+        """
+        event = event.upper()
+        if event in ('READY', 'RESUMED'):
+            raise ValueError(f'{event} cannot be handled raw')
+
+        if asyncio.iscoroutinefunction(handler):
+
+            def parser(data: Any) -> None:
+                self._schedule_event(handler, event, data)
+
+        else:
+
+            def parser(data: Any) -> None:
+                try:
+                    handler(data)
+                except Exception:
+                    _log.exception('Ignoring exception in raw handler for %s', event)
+
+        self._connection.set_raw_handler(event, parser)
+
+    def remove_raw_handler(self, event: str) -> None:
+        """Removes the raw handler of a gateway event registered with
+        :meth:`add_raw_handler`, so the event is processed as usual again.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        event: :class:`str`
+            The name of the gateway event, e.g. ``'MESSAGE_CREATE'``.
+        """
+        self._connection.set_raw_handler(event.upper(), None)
+
+    def raw_handler(self, event: str) -> Callable[[RawHandlerT], RawHandlerT]:
+        """A decorator that registers a raw handler for a gateway event.
+
+        This is equivalent to :meth:`add_raw_handler`.
+
+        .. versionadded:: 2.0
+
+        Example
+        ---------
+
+        .. code-block:: python3
+
+            @client.raw_handler('MESSAGE_CREATE')
+            async def forward(data):
+                await publish(data)
+        """
+
+        def decorator(func: RawHandlerT) -> RawHandlerT:
+            self.add_raw_handler(event, func)
+            return func
+
+        return decorator
+
     async def change_presence(
         self,
         *,
@@ -0,0 +1,180 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+# Bounded scheduling of event handlers. This is for internal use only.
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Coroutine, Deque, Dict, List, Optional, Set, Tuple, Union
+
+__all__ = ()
+
+_log = logging.getLogger(__name__)
+
+POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+
+class _EventLane:
+    __slots__ = ('limit', 'running', 'pending', 'queued', 'dropped')
+
+    def __init__(self, limit: int) -> None:
+        self.limit: int = limit
+        self.running: int = 0
+        self.pending: Deque[Tuple[Coroutine[Any, Any, Any], str]] = deque()
+        # totals of the events that had to wait and that were dropped
+        self.queued: int = 0
+        self.dropped: int = 0
+
+
+class EventDispatcher:
+    def __init__(self, concurrency: Union[int, Dict[str, int]], *, queue_size: int, policy: str) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f'event_overflow_policy must be one of {", ".join(POLICIES)} not {policy!r}')
+        if queue_size < 0:
+            raise ValueError('event_queue_size must not be negative')
+
+        if isinstance(concurrency, int):
+            self.default: Optional[int] = concurrency
+            self.limits: Dict[str, int] = {}
+        else:
+            self.default = None
+            self.limits = {self._key(event): limit for event, limit in concurrency.items()}
+
+        for limit in (self.default, *self.limits.values()):
+            if limit is not None and limit < 1:
+                raise ValueError('event_concurrency must be at least 1')
+
+        self.queue_size: int = queue_size
+        self.policy: str = policy
+        self._lanes: Dict[str, _EventLane] = {}
+        self._full: Set[_EventLane] = set()
+        self._waiters: List[asyncio.Future[None]] = []
+
+    @staticmethod
+    def _key(event: str) -> str:
+        # handlers are scheduled as 'on_message', raw handlers as 'MESSAGE_CREATE'
+        return event[3:] if event.startswith('on_') else event
+
+    def _lane(self, event: str) -> Optional[_EventLane]:
+        key = self._key(event)
+        try:
+            return self._lanes[key]
+        except KeyError:
+            limit = self.limits.get(key, self.default)
+            if limit is None:
+                return None
+            lane = self._lanes[key] = _EventLane(limit)
+            return lane
+
+    def schedule(self, coro: Coroutine[Any, Any, Any], event: str, name: str) -> Optional[asyncio.Task[Any]]:
+        lane = self._lane(event)
+        if lane is None:
+            return asyncio.create_task(coro, name=name)
+
+        if lane.running < lane.limit:
+            return self._start(lane, coro, name)
+
+        if len(lane.pending) >= self.queue_size:
+            if self.policy == 'drop_newest':
+                coro.close()
+                lane.dropped += 1
+                _log.debug('Dropped %s, its handlers are at capacity.', name)
+                return None
+
+            if self.policy == 'drop_oldest':
+                if not lane.pending:
+                    coro.close()
+                    lane.dropped += 1
+                    return None
+                oldest, oldest_name = lane.pending.popleft()
+                oldest.close()
+                lane.dropped += 1
+                _log.debug('Dropped %s, its handlers are at capacity.', oldest_name)
+
+        lane.pending.append((coro, name))
+        lane.queued += 1
+        if self.policy == 'block' and len(lane.pending) >= self.queue_size:
+            self._full.add(lane)
+        return None
+
+    def _start(self, lane: _EventLane, coro: Coroutine[Any, Any, Any], name: str) -> asyncio.Task[Any]:
+        lane.running += 1
+        task = asyncio.create_task(coro, name=name)
+        task.add_done_callback(lambda _: self._done(lane))
+        return task
+
+    def _done(self, lane: _EventLane) -> None:
+        lane.running -= 1
+        if lane.pending:
+            coro, name = lane.pending.popleft()
+            self._start(lane, coro, name)
+
+        if lane in self._full and len(lane.pending) < self.queue_size:
+            self._full.discard(lane)
+            if not self._full:
+                for waiter in self._waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+                self._waiters.clear()
+
+    async def wait_for_room(self, timeout: float) -> None:
+        if not self._full:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            # reading is resumed for a message so the gateway does not time out
+            _log.debug('Event handlers are still at capacity after %.1fs, reading from the gateway anyway.', timeout)
+        finally:
+            if future in self._waiters:
+                self._waiters.remove(future)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            event: {
+                'limit': lane.limit,
+                'running': lane.running,
+                'pending': len(lane.pending),
+                'queued': lane.queued,
+                'dropped': lane.dropped,
+            }
+            for event, lane in self._lanes.items()
+        }
+
+    def close(self) -> None:
+        for lane in self._lanes.values():
+            for coro, _ in lane.pending:
+                coro.close()
+            lane.pending.clear()
+        self._full.clear()
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
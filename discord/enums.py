@@ -55,6 +55,8 @@ __all__ = (
     'InteractionType',
     'InteractionResponseType',
     'NSFWLevel',
+    'RequestPriority',
+    'CircuitState',
 )
 
 
@@ -62,6 +64,8 @@ def _create_value_cls(name, comparable):
     cls = namedtuple('_EnumValue_' + name, 'name value')
     cls.__repr__ = lambda self: f'<{name}.{self.name}: {self.value!r}>'
     cls.__str__ = lambda self: f'{name}.{self.name}'
+    # pickle by value, unknown values included
+    cls.__reduce__ = lambda self: (try_enum, (self._actual_enum_cls_, self.value))
     if comparable:
         cls.__le__ = lambda self, other: isinstance(other, self.__class__) and self.value <= other.value
         cls.__ge__ = lambda self, other: isinstance(other, self.__class__) and self.value >= other.value
@@ -590,6 +594,18 @@ class NSFWLevel(Enum, comparable=True):
     age_restricted = 3
 
 
+class RequestPriority(Enum):
+    interaction = 0
+    normal = 1
+    background = 2
+
+
+class CircuitState(Enum):
+    closed = 0
+    open = 1
+    half_open = 2
+
+
 T = TypeVar('T')
 
 
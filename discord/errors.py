@@ -35,6 +35,8 @@ if TYPE_CHECKING:
     except ModuleNotFoundError:
         _ResponseType = ClientResponse
 
+    import datetime
+
     from .interactions import Interaction
 
 __all__ = (
@@ -52,6 +54,9 @@ __all__ = (
     'ConnectionClosed',
     'PrivilegedIntentsRequired',
     'InteractionResponded',
+    'DeadlineExceeded',
+    'CircuitOpen',
+    'SessionStartLimitReached',
 )
 
 
@@ -275,3 +280,71 @@ class InteractionResponded(ClientException):
     def __init__(self, interaction: Interaction):
         self.interaction: Interaction = interaction
         super().__init__('This interaction has already been responded to before')
+
+
+class DeadlineExceeded(ClientException):
+    """Exception that's raised when a request could not be sent before its deadline.
+
+    A request that fails this way has not been sent to Discord and did not
+    use up any of the rate limit.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    deadline: :class:`datetime.datetime`
+        The deadline that could not be met.
+    """
+
+    def __init__(self, deadline: datetime.datetime):
+        self.deadline: datetime.datetime = deadline
+        super().__init__(f'Request could not be sent before its deadline ({deadline.isoformat()})')
+
+
+class CircuitOpen(ClientException):
+    """Exception that's raised when a request is refused because Discord has
+    been failing on its route and its circuit breaker is open.
+
+    A request that fails this way has not been sent to Discord.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    route: :class:`str`
+        The route template that is failing, e.g. ``'GET /channels/{channel_id}'``.
+    retry_after: :class:`float`
+        The number of seconds until a request will be let through again.
+    """
+
+    def __init__(self, route: str, retry_after: float):
+        self.route: str = route
+        self.retry_after: float = retry_after
+        super().__init__(f'Circuit breaker for {route} is open, retry in {retry_after:.2f}s')
+
+
+class SessionStartLimitReached(ClientException):
+    """Exception that's raised when the :class:`AutoShardedClient` refuses to
+    start because there are not enough IDENTIFYs left in the daily session start limit
+    to launch every shard.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    remaining: :class:`int`
+        The number of IDENTIFYs that are left.
+    required: :class:`int`
+        The number of IDENTIFYs needed to launch every shard.
+    reset_after: :class:`float`
+        The number of seconds until the limit resets.
+    """
+
+    def __init__(self, remaining: int, required: int, reset_after: float):
+        self.remaining: int = remaining
+        self.required: int = required
+        self.reset_after: float = reset_after
+        super().__init__(
+            f'Only {remaining} session starts are left but {required} shards need to IDENTIFY, '
+            f'the limit resets in {reset_after:.0f}s'
+        )
@@ -0,0 +1,248 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+# An encoder and decoder for the subset of the Erlang external term format
+# used by the Discord gateway. This is for internal use only.
+
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    import erlpack  # type: ignore
+except ModuleNotFoundError:
+    HAS_ERLPACK = False
+else:
+    HAS_ERLPACK = True
+
+__all__ = ()
+
+VERSION = 131
+
+NEW_FLOAT_EXT = 70
+COMPRESSED = 80
+SMALL_INTEGER_EXT = 97
+INTEGER_EXT = 98
+FLOAT_EXT = 99
+ATOM_EXT = 100
+SMALL_TUPLE_EXT = 104
+LARGE_TUPLE_EXT = 105
+NIL_EXT = 106
+STRING_EXT = 107
+LIST_EXT = 108
+BINARY_EXT = 109
+SMALL_BIG_EXT = 110
+LARGE_BIG_EXT = 111
+SMALL_ATOM_EXT = 115
+MAP_EXT = 116
+ATOM_UTF8_EXT = 118
+SMALL_ATOM_UTF8_EXT = 119
+
+_unpack_u16 = struct.Struct('>H').unpack_from
+_unpack_u32 = struct.Struct('>I').unpack_from
+_unpack_i32 = struct.Struct('>i').unpack_from
+_unpack_f64 = struct.Struct('>d').unpack_from
+_pack_i32 = struct.Struct('>Bi').pack
+_pack_u32 = struct.Struct('>BI').pack
+_pack_f64 = struct.Struct('>Bd').pack
+
+_ATOMS: Dict[str, Any] = {'nil': None, 'true': True, 'false': False}
+
+
+class ETFDecodeError(ValueError):
+    pass
+
+
+def _atom(name: str) -> Any:
+    return _ATOMS.get(name, name)
+
+
+def _decode_term(data: bytes, pos: int) -> Tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+
+    if tag == BINARY_EXT:
+        (size,) = _unpack_u32(data, pos)
+        pos += 4
+        return data[pos : pos + size].decode('utf-8'), pos + size
+
+    if tag == MAP_EXT:
+        (arity,) = _unpack_u32(data, pos)
+        pos += 4
+        result: Dict[Any, Any] = {}
+        for _ in range(arity):
+            key, pos = _decode_term(data, pos)
+            result[key], pos = _decode_term(data, pos)
+        return result, pos
+
+    if tag == SMALL_INTEGER_EXT:
+        return data[pos], pos + 1
+
+    if tag == INTEGER_EXT:
+        return _unpack_i32(data, pos)[0], pos + 4
+
+    if tag == SMALL_BIG_EXT or tag == LARGE_BIG_EXT:
+        # snowflakes are sent as 64 bit integers
+        if tag == SMALL_BIG_EXT:
+            size = data[pos]
+            pos += 1
+        else:
+            (size,) = _unpack_u32(data, pos)
+            pos += 4
+        sign = data[pos]
+        pos += 1
+        value = int.from_bytes(data[pos : pos + size], 'little')
+        return (-value if sign else value), pos + size
+
+    if tag == SMALL_ATOM_UTF8_EXT or tag == SMALL_ATOM_EXT:
+        size = data[pos]
+        pos += 1
+        encoding = 'utf-8' if tag == SMALL_ATOM_UTF8_EXT else 'latin-1'
+        return _atom(data[pos : pos + size].decode(encoding)), pos + size
+
+    if tag == ATOM_UTF8_EXT or tag == ATOM_EXT:
+        (size,) = _unpack_u16(data, pos)
+        pos += 2
+        encoding = 'utf-8' if tag == ATOM_UTF8_EXT else 'latin-1'
+        return _atom(data[pos : pos + size].decode(encoding)), pos + size
+
+    if tag == LIST_EXT:
+        (length,) = _unpack_u32(data, pos)
+        pos += 4
+        items: List[Any] = []
+        append = items.append
+        for _ in range(length):
+            item, pos = _decode_term(data, pos)
+            append(item)
+        # proper lists end with an empty list as their tail
+        _, pos = _decode_term(data, pos)
+        return items, pos
+
+    if tag == NIL_EXT:
+        return [], pos
+
+    if tag == NEW_FLOAT_EXT:
+        return _unpack_f64(data, pos)[0], pos + 8
+
+    if tag == STRING_EXT:
+        # a list of integers between 0 and 255
+        (size,) = _unpack_u16(data, pos)
+        pos += 2
+        return list(data[pos : pos + size]), pos + size
+
+    if tag == SMALL_TUPLE_EXT or tag == LARGE_TUPLE_EXT:
+        if tag == SMALL_TUPLE_EXT:
+            arity = data[pos]
+            pos += 1
+        else:
+            (arity,) = _unpack_u32(data, pos)
+            pos += 4
+        elements: List[Any] = []
+        for _ in range(arity):
+            item, pos = _decode_term(data, pos)
+            elements.append(item)
+        return tuple(elements), pos
+
+    if tag == FLOAT_EXT:
+        return float(data[pos : pos + 31].split(b'\x00', 1)[0]), pos + 31
+
+    raise ETFDecodeError(f'Unsupported term tag {tag} at offset {pos - 1}')
+
+
+def _loads(data: bytes) -> Any:
+    if len(data) < 2 or data[0] != VERSION:
+        raise ETFDecodeError('Missing external term format version')
+
+    if data[1] == COMPRESSED:
+        data = bytes([VERSION]) + zlib.decompress(data[6:])
+
+    try:
+        value, _ = _decode_term(data, 1)
+    except (IndexError, struct.error, UnicodeDecodeError) as exc:
+        raise ETFDecodeError('Malformed external term format data') from exc
+    return value
+
+
+def _encode_term(obj: Any, append: Callable[[bytes], None]) -> None:
+    if obj is None:
+        append(b'\x77\x03nil')
+    elif obj is True:
+        append(b'\x77\x04true')
+    elif obj is False:
+        append(b'\x77\x05false')
+    elif isinstance(obj, int):
+        if 0 <= obj <= 255:
+            append(bytes((SMALL_INTEGER_EXT, obj)))
+        elif -(2 ** 31) <= obj < 2 ** 31:
+            append(_pack_i32(INTEGER_EXT, obj))
+        else:
+            magnitude = -obj if obj < 0 else obj
+            size = (magnitude.bit_length() + 7) // 8
+            if size > 255:
+                raise ValueError('Integer is too large to encode')
+            append(bytes((SMALL_BIG_EXT, size, 1 if obj < 0 else 0)))
+            append(magnitude.to_bytes(size, 'little'))
+    elif isinstance(obj, float):
+        append(_pack_f64(NEW_FLOAT_EXT, obj))
+    elif isinstance(obj, str):
+        encoded = obj.encode('utf-8')
+        append(_pack_u32(BINARY_EXT, len(encoded)))
+        append(encoded)
+    elif isinstance(obj, (bytes, bytearray)):
+        append(_pack_u32(BINARY_EXT, len(obj)))
+        append(bytes(obj))
+    elif isinstance(obj, dict):
+        append(_pack_u32(MAP_EXT, len(obj)))
+        for key, value in obj.items():
+            _encode_term(key, append)
+            _encode_term(value, append)
+    elif isinstance(obj, (list, tuple)):
+        if obj:
+            append(_pack_u32(LIST_EXT, len(obj)))
+            for item in obj:
+                _encode_term(item, append)
+        append(b'\x6a')
+    else:
+        raise TypeError(f'Object of type {obj.__class__.__name__} is not ETF serializable')
+
+
+def _dumps(obj: Any) -> bytes:
+    parts: List[bytes] = [b'\x83']
+    _encode_term(obj, parts.append)
+    return b''.join(parts)
+
+
+loads: Callable[[bytes], Any] = _loads
+dumps: Callable[[Any], bytes] = _dumps
+
+if HAS_ERLPACK:
+    # only use erlpack if it decodes binaries to str like the decoder above
+    try:
+        if erlpack.unpack(_dumps({'a': ['b', 1 << 40]})) == {'a': ['b', 1 << 40]}:
+            loads = erlpack.unpack
+            dumps = erlpack.pack
+    except Exception:
+        pass
@@ -156,6 +156,9 @@ class BotBase(GroupMixin):
         for event in self.extra_events.get(ev, []):
             self._schedule_event(event, ev, *args, **kwargs)  # type: ignore
 
+    def _consumes_event(self, event: str) -> bool:
+        return super()._consumes_event(event) or bool(self.extra_events.get('on_' + event))  # type: ignore
+
     @discord.utils.copy_doc(discord.Client.close)
     async def close(self) -> None:
         for extension in tuple(self.__extensions):
@@ -0,0 +1,12 @@
+"""
+discord.ext.mock
+~~~~~~~~~~~~~~~~~
+
+A local stand-in for the Discord REST API and gateway,
+meant for load testing bots without a network connection.
+
+:copyright: (c) 2015-present Rapptz
+:license: MIT, see LICENSE for more details.
+"""
+
+from .server import *
@@ -0,0 +1,933 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import time
+import uuid
+import zlib
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from aiohttp import web, WSMsgType
+
+from discord import etf, utils
+from discord.gateway import DiscordWebSocket, zstd
+
+__all__ = (
+    'MockServer',
+)
+
+_log = logging.getLogger(__name__)
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def _json_response(data: Any, *, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    # Discord doesn't send a charset, which the HTTP client relies on
+    return web.Response(
+        body=utils._to_json(data).encode('utf-8'), status=status, headers=headers, content_type='application/json'
+    )
+
+
+def _error(status: int, message: str, code: int = 0) -> web.Response:
+    return _json_response({'message': message, 'code': code}, status=status)
+
+
+class _Bucket:
+    __slots__ = ('limit', 'per', 'remaining', 'reset_at')
+
+    def __init__(self, limit: int, per: float) -> None:
+        self.limit: int = limit
+        self.per: float = per
+        self.remaining: int = limit
+        self.reset_at: float = 0.0
+
+    def consume(self, now: float) -> bool:
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.per
+
+        if self.remaining == 0:
+            return False
+
+        self.remaining -= 1
+        return True
+
+
+class _ScriptedRatelimit:
+    __slots__ = ('count', 'retry_after', 'is_global')
+
+    def __init__(self, count: int, retry_after: float, is_global: bool) -> None:
+        self.count: int = count
+        self.retry_after: float = retry_after
+        self.is_global: bool = is_global
+
+
+class _Session:
+    __slots__ = ('id', 'shard_id', 'shard_count', 'sequence', 'backlog')
+
+    def __init__(self, shard_id: int, shard_count: int) -> None:
+        self.id: str = uuid.uuid4().hex
+        self.shard_id: int = shard_id
+        self.shard_count: int = shard_count
+        self.sequence: int = 0
+        # sent dispatches, replayed on RESUME
+        self.backlog: Deque[Dict[str, Any]] = deque(maxlen=1000)
+
+
+class _GatewayConnection:
+    def __init__(
+        self, server: MockServer, ws: web.WebSocketResponse, *, compress: Optional[str], encoding: str
+    ) -> None:
+        self.server: MockServer = server
+        self.ws: web.WebSocketResponse = ws
+        self.encoding: str = encoding
+        self.session: Optional[_Session] = None
+        self.compress: Optional[str] = compress
+        self._compressor: Optional[Any] = None
+        if compress == 'zlib-stream':
+            self._compressor = zlib.compressobj()
+        elif compress == 'zstd-stream' and zstd is not None:
+            self._compressor = zstd.ZstdCompressor()
+            if hasattr(self._compressor, 'compressobj'):
+                # zstandard
+                self._compressor = self._compressor.compressobj()
+        else:
+            self.compress = None
+
+    def _compress(self, data: bytes) -> bytes:
+        compressor: Any = self._compressor
+        if self.compress == 'zlib-stream':
+            # one shared context, every message ends with a sync flush
+            return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        # one zstd frame for the whole connection, every message ends a block
+        if hasattr(compressor, 'FLUSH_BLOCK'):
+            return compressor.compress(data, compressor.FLUSH_BLOCK)
+        return compressor.compress(data) + compressor.flush(zstd.COMPRESSOBJ_FLUSH_BLOCK)
+
+    async def send(self, payload: Dict[str, Any]) -> None:
+        if self.ws.closed:
+            return
+
+        data = etf.dumps(payload) if self.encoding == 'etf' else utils._to_json(payload).encode('utf-8')
+        if self.compress is not None:
+            await self.ws.send_bytes(self._compress(data))
+        elif self.encoding == 'etf':
+            await self.ws.send_bytes(data)
+        else:
+            await self.ws.send_str(data.decode('utf-8'))
+
+    async def dispatch(self, event: str, data: Any) -> None:
+        session = self.session
+        if session is None:
+            return
+
+        session.sequence += 1
+        payload = {'op': DiscordWebSocket.DISPATCH, 't': event, 's': session.sequence, 'd': data}
+        session.backlog.append(payload)
+        await self.send(payload)
+
+    def handles_guild(self, guild_id: int) -> bool:
+        session = self.session
+        if session is None:
+            return False
+        return (guild_id >> 22) % session.shard_count == session.shard_id
+
+    async def received(self, msg: Dict[str, Any]) -> None:
+        op = msg.get('op')
+        data = msg.get('d')
+        server = self.server
+
+        if op == DiscordWebSocket.HEARTBEAT:
+            await self.send({'op': DiscordWebSocket.HEARTBEAT_ACK})
+        elif op == DiscordWebSocket.IDENTIFY:
+            if not server._check_token(data.get('token')):
+                await self.ws.close(code=4004, message=b'Authentication failed.')
+                return
+
+            shard_id, shard_count = data.get('shard', (0, 1))
+            self.session = session = _Session(shard_id, shard_count)
+            server._sessions[session.id] = session
+            server.identifies += 1
+
+            guilds = [g for g in server.guilds.values() if self.handles_guild(int(g['id']))]
+            await self.dispatch(
+                'READY',
+                {
+                    'v': 9,
+                    'user': server.user,
+                    'guilds': [{'id': g['id'], 'unavailable': True} for g in guilds],
+                    'session_id': session.id,
+                    'resume_gateway_url': server.gateway_url,
+                    'shard': [shard_id, shard_count],
+                    'application': {'id': server.user['id'], 'flags': 0},
+                },
+            )
+            for guild in guilds:
+                await self.dispatch('GUILD_CREATE', server._guild_create_payload(guild))
+        elif op == DiscordWebSocket.RESUME:
+            session = server._sessions.get(data.get('session_id'))
+            if session is None or not server._check_token(data.get('token')):
+                await self.send({'op': DiscordWebSocket.INVALIDATE_SESSION, 'd': False})
+                return
+
+            self.session = session
+            server.resumes += 1
+            seq = data.get('seq') or 0
+            for payload in list(session.backlog):
+                if payload['s'] > seq:
+                    await self.send(payload)
+            await self.dispatch('RESUMED', {})
+        elif op == DiscordWebSocket.REQUEST_MEMBERS:
+            guild = server.guilds.get(str(data.get('guild_id')))
+            if guild is not None:
+                chunk = {
+                    'guild_id': guild['id'],
+                    'members': guild['members'],
+                    'chunk_index': 0,
+                    'chunk_count': 1,
+                }
+                if 'nonce' in data:
+                    chunk['nonce'] = data['nonce']
+                await self.dispatch('GUILD_MEMBERS_CHUNK', chunk)
+
+
+class MockServer:
+    """A local stand-in for the Discord REST API and gateway.
+
+    It implements the REST routes commonly used by bots, with rate limit headers
+    and ``429`` responses that behave like Discord's, and a gateway that speaks the
+    same opcodes, transport compression and JSON or ETF encodings as the real
+    one. This allows benchmarking a bot's throughput and latency without a network
+    connection.
+
+    A :class:`~discord.Client` or :class:`~discord.AutoShardedClient` connects to
+    it by passing :attr:`api_base_url` as the ``api_base_url`` option. The gateway
+    URL is handed out by the server itself.
+
+    Uploaded attachments are kept in memory until their message is deleted and
+    are served from their ``url`` and ``proxy_url``, including ``Range`` requests.
+
+    .. versionadded:: 2.0
+
+    Example:
+
+    .. code-block:: python3
+
+        from discord.ext import mock
+
+        async def main():
+            async with mock.MockServer(guild_count=10) as server:
+                client = discord.Client(api_base_url=server.api_base_url)
+                await client.start('token')
+
+    Parameters
+    -----------
+    host: :class:`str`
+        The host to listen on.
+    port: :class:`int`
+        The port to listen on. Defaults to ``0``, which picks a free port.
+    token: Optional[:class:`str`]
+        The token clients have to use. If ``None``, any token is accepted.
+    guild_count: :class:`int`
+        The number of guilds to create.
+    channels_per_guild: :class:`int`
+        The number of text channels to create in every guild.
+    shard_count: :class:`int`
+        The number of shards recommended by ``GET /gateway/bot``.
+    max_concurrency: :class:`int`
+        The identify concurrency reported by ``GET /gateway/bot``.
+    rate_limit: Tuple[:class:`int`, :class:`float`]
+        The number of requests and the window in seconds of every route's
+        rate limit bucket, unless overridden in ``rate_limits``.
+    rate_limits: Optional[Dict[:class:`str`, Tuple[:class:`int`, :class:`float`]]]
+        Rate limits of specific routes, e.g. ``{'POST /channels/{channel_id}/messages': (5, 5.0)}``.
+    global_rate_limit: Optional[:class:`int`]
+        The number of requests per second over which a global ``429`` is returned.
+        ``None`` disables the global rate limit.
+    latency: :class:`float`
+        The number of seconds every REST response is delayed by.
+    heartbeat_interval: :class:`float`
+        The heartbeat interval sent in HELLO, in seconds.
+
+    Attributes
+    -----------
+    user: :class:`dict`
+        The user payload of the bot.
+    guilds: Dict[:class:`str`, :class:`dict`]
+        The guild payloads by ID.
+    requests: Dict[:class:`str`, :class:`int`]
+        The number of REST requests received per route, e.g. ``GET /users/@me``.
+    ratelimited: :class:`int`
+        The number of ``429`` responses sent.
+    identifies: :class:`int`
+        The number of IDENTIFY payloads received.
+    resumes: :class:`int`
+        The number of successful RESUME payloads received.
+    """
+
+    API_VERSION = 9
+
+    def __init__(
+        self,
+        *,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        token: Optional[str] = None,
+        guild_count: int = 1,
+        channels_per_guild: int = 1,
+        shard_count: int = 1,
+        max_concurrency: int = 1,
+        rate_limit: Tuple[int, float] = (5, 5.0),
+        rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        global_rate_limit: Optional[int] = 50,
+        latency: float = 0.0,
+        heartbeat_interval: float = 41.25,
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.token: Optional[str] = token
+        self.shard_count: int = shard_count
+        self.max_concurrency: int = max_concurrency
+        self.rate_limit: Tuple[int, float] = rate_limit
+        self.rate_limits: Dict[str, Tuple[int, float]] = rate_limits or {}
+        self.global_rate_limit: Optional[int] = global_rate_limit
+        self.latency: float = latency
+        self.heartbeat_interval: float = heartbeat_interval
+
+        self.requests: Dict[str, int] = {}
+        self.ratelimited: int = 0
+        self.identifies: int = 0
+        self.resumes: int = 0
+
+        self._ids = itertools.count()
+        self._runner: Optional[web.AppRunner] = None
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._global: Deque[float] = deque()
+        self._global_reset: float = 0.0
+        self._scripted: Dict[str, Deque[_ScriptedRatelimit]] = {}
+        self._sessions: Dict[str, _Session] = {}
+        self._connections: Set[_GatewayConnection] = set()
+
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._channels: Dict[str, Dict[str, Any]] = {}
+        self._messages: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # attachment ID -> content
+        self._attachments: Dict[str, bytes] = {}
+        self._default_author: Optional[Dict[str, Any]] = None
+        self.user: Dict[str, Any] = self.create_user('Mock Bot', bot=True)
+        self.guilds: Dict[str, Dict[str, Any]] = {}
+        for index in range(guild_count):
+            self.create_guild(f'Guild {index}', channels=channels_per_guild)
+
+    async def __aenter__(self) -> MockServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        """:class:`str`: The base HTTP URL of the server."""
+        return f'http://{self.host}:{self.port}'
+
+    @property
+    def api_base_url(self) -> str:
+        """:class:`str`: The URL to pass as ``api_base_url`` to a client."""
+        return f'{self.url}/api/v{self.API_VERSION}'
+
+    @property
+    def gateway_url(self) -> str:
+        """:class:`str`: The URL of the gateway."""
+        return f'ws://{self.host}:{self.port}/gateway'
+
+    async def start(self) -> None:
+        """|coro|
+
+        Starts listening for connections.
+        """
+        app = web.Application()
+        app.router.add_get('/gateway', self._gateway)
+        app.router.add_get('/attachments/{channel_id}/{attachment_id}/{filename}', self._get_attachment)
+        prefix = '/api/v{version:\\d+}'
+        for method, path, handler in self._routes():
+            app.router.add_route(method, prefix + path, self._wrap(method, path, handler))
+        app.router.add_route('*', prefix + '/{tail:.*}', self._not_found)
+
+        self._runner = runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = site._server.sockets[0].getsockname()[1]  # type: ignore
+
+        _log.info('Mock Discord server listening on %s.', self.url)
+
+    async def close(self) -> None:
+        """|coro|
+
+        Closes every gateway connection and stops the server.
+        """
+        for conn in list(self._connections):
+            await conn.ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # data
+
+    def _snowflake(self) -> str:
+        # every ID gets its own millisecond so guilds spread evenly over the shards
+        return str(utils.time_snowflake(utils.utcnow()) + (next(self._ids) << 22))
+
+    def create_user(self, name: str, *, bot: bool = False) -> Dict[str, Any]:
+        """Creates a user that can be used as a message author.
+
+        Returns
+        --------
+        :class:`dict`
+            The user payload.
+        """
+        user = {
+            'id': self._snowflake(),
+            'username': name,
+            'discriminator': '0000',
+            'avatar': None,
+            'bot': bot,
+        }
+        self._users[user['id']] = user
+        return user
+
+    def create_guild(self, name: str, *, channels: int = 1) -> Dict[str, Any]:
+        """Creates a guild with the bot as its only member.
+
+        Guilds created after a client connected are not announced to it.
+
+        Returns
+        --------
+        :class:`dict`
+            The guild payload.
+        """
+        guild_id = self._snowflake()
+        guild: Dict[str, Any] = {
+            'id': guild_id,
+            'name': name,
+            'icon': None,
+            'owner_id': self.user['id'],
+            'region': 'us-east',
+            'afk_channel_id': None,
+            'afk_timeout': 300,
+            'verification_level': 0,
+            'default_message_notifications': 0,
+            'explicit_content_filter': 0,
+            'features': [],
+            'mfa_level': 0,
+            'system_channel_id': None,
+            'system_channel_flags': 0,
+            'premium_tier': 0,
+            'preferred_locale': 'en-US',
+            'nsfw_level': 0,
+            'emojis': [],
+            'stickers': [],
+            'roles': [
+                {
+                    'id': guild_id,
+                    'name': '@everyone',
+                    'color': 0,
+                    'hoist': False,
+                    'position': 0,
+                    'permissions': '2147483647',
+                    'managed': False,
+                    'mentionable': False,
+                }
+            ],
+            'members': [
+                {
+                    'user': self.user,
+                    'roles': [],
+                    'joined_at': utils.utcnow().isoformat(),
+                    'deaf': False,
+                    'mute': False,
+                }
+            ],
+            'channels': [],
+            'member_count': 1,
+            'large': False,
+        }
+
+        for index in range(channels):
+            channel = {
+                'id': self._snowflake(),
+                'type': 0,
+                'guild_id': guild_id,
+                'name': f'channel-{index}',
+                'position': index,
+                'permission_overwrites': [],
+                'nsfw': False,
+                'topic': None,
+                'parent_id': None,
+                'last_message_id': None,
+                'rate_limit_per_user': 0,
+            }
+            guild['channels'].append(channel)
+            self._channels[channel['id']] = channel
+            self._messages[channel['id']] = {}
+
+        self.guilds[guild_id] = guild
+        return guild
+
+    def _guild_create_payload(self, guild: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **guild,
+            'joined_at': guild['members'][0]['joined_at'],
+            'threads': [],
+            'voice_states': [],
+            'presences': [],
+            'stage_instances': [],
+            'unavailable': False,
+        }
+
+    def _message_payload(
+        self, channel: Dict[str, Any], author: Dict[str, Any], data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {
+            'id': self._snowflake(),
+            'channel_id': channel['id'],
+            'guild_id': channel.get('guild_id'),
+            'author': author,
+            'content': data.get('content') or '',
+            'timestamp': utils.utcnow().isoformat(),
+            'edited_timestamp': None,
+            'tts': data.get('tts', False),
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': data.get('embeds') or [],
+            'components': data.get('components') or [],
+            'pinned': False,
+            'type': 0,
+            'flags': 0,
+        }
+
+    async def create_message(
+        self, channel_id: int, content: str, *, author: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """|coro|
+
+        Creates a message as if a user sent it and dispatches
+        ``MESSAGE_CREATE`` to the shard handling the guild.
+
+        Parameters
+        -----------
+        channel_id: :class:`int`
+            The ID of the channel to send the message in.
+        content: :class:`str`
+            The content of the message.
+        author: Optional[:class:`dict`]
+            The user payload of the author, as returned by :meth:`create_user`.
+            Defaults to a generic user.
+
+        Returns
+        --------
+        :class:`dict`
+            The message payload.
+        """
+        channel = self._channels[str(channel_id)]
+        if author is None:
+            if self._default_author is None:
+                self._default_author = self.create_user('Mock User')
+            author = self._default_author
+
+        message = self._message_payload(channel, author, {'content': content})
+        await self._store_message(channel, message)
+        return message
+
+    async def _store_message(self, channel: Dict[str, Any], message: Dict[str, Any]) -> None:
+        self._messages[channel['id']][message['id']] = message
+        channel['last_message_id'] = message['id']
+        await self.dispatch('MESSAGE_CREATE', message, guild_id=int(channel['guild_id']))
+
+    async def dispatch(self, event: str, data: Any, *, guild_id: Optional[int] = None) -> None:
+        """|coro|
+
+        Sends a DISPATCH payload to the connected shards.
+
+        Parameters
+        -----------
+        event: :class:`str`
+            The event name, e.g. ``MESSAGE_CREATE``.
+        data: Any
+            The event payload.
+        guild_id: Optional[:class:`int`]
+            If given, the event is only sent to the shard handling this guild.
+        """
+        for conn in list(self._connections):
+            if guild_id is None or conn.handles_guild(guild_id):
+                await conn.dispatch(event, data)
+
+    async def request_reconnect(self, shard_id: Optional[int] = None) -> None:
+        """|coro|
+
+        Asks connected shards to reconnect and resume with a RECONNECT payload.
+
+        Parameters
+        -----------
+        shard_id: Optional[:class:`int`]
+            The shard to send it to. If ``None``, it is sent to every shard.
+        """
+        for conn in list(self._connections):
+            if conn.session is not None and (shard_id is None or conn.session.shard_id == shard_id):
+                await conn.send({'op': DiscordWebSocket.RECONNECT})
+
+    def script_ratelimit(self, route: str, *, count: int = 1, retry_after: float = 1.0, is_global: bool = False) -> None:
+        """Makes the next requests to a route fail with a ``429``, regardless of its bucket.
+
+        Parameters
+        -----------
+        route: :class:`str`
+            The route, e.g. ``POST /channels/{channel_id}/messages``.
+        count: :class:`int`
+            The number of requests to rate limit.
+        retry_after: :class:`float`
+            The ``retry_after`` value to send.
+        is_global: :class:`bool`
+            Whether the rate limit is global.
+        """
+        self._scripted.setdefault(route, deque()).append(_ScriptedRatelimit(count, retry_after, is_global))
+
+    # REST
+
+    def _check_token(self, token: Optional[str]) -> bool:
+        if self.token is None:
+            return True
+        if token is not None and token.startswith('Bot '):
+            token = token[4:]
+        return token == self.token
+
+    def _ratelimit_response(self, retry_after: float, *, is_global: bool, bucket: Optional[str] = None) -> web.Response:
+        self.ratelimited += 1
+        headers = {
+            'Via': '1.1 google',
+            'Retry-After': str(max(int(retry_after), 1)),
+            'X-RateLimit-Scope': 'global' if is_global else 'user',
+        }
+        if is_global:
+            headers['X-RateLimit-Global'] = 'true'
+        if bucket is not None:
+            headers['X-RateLimit-Bucket'] = bucket
+
+        body = {'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': is_global}
+        return _json_response(body, status=429, headers=headers)
+
+    def _wrap(self, method: str, path: str, handler: Handler) -> Handler:
+        route = f'{method} {path}'
+        limit, per = self.rate_limits.get(route, self.rate_limit)
+        bucket_hash = hashlib.md5(route.encode('utf-8')).hexdigest()[:16]
+
+        async def wrapped(request: web.Request) -> web.StreamResponse:
+            self.requests[route] = self.requests.get(route, 0) + 1
+            if not self._check_token(request.headers.get('Authorization')):
+                return _error(401, '401: Unauthorized')
+
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            now = time.monotonic()
+            scripted = self._scripted.get(route)
+            if scripted:
+                entry = scripted[0]
+                entry.count -= 1
+                if entry.count <= 0:
+                    scripted.popleft()
+                if entry.is_global:
+                    self._global_reset = now + entry.retry_after
+                return self._ratelimit_response(entry.retry_after, is_global=entry.is_global, bucket=bucket_hash)
+
+            if self.global_rate_limit is not None:
+                if now < self._global_reset:
+                    return self._ratelimit_response(self._global_reset - now, is_global=True)
+
+                window = self._global
+                while window and window[0] <= now - 1.0:
+                    window.popleft()
+                if len(window) >= self.global_rate_limit:
+                    return self._ratelimit_response(window[0] + 1.0 - now, is_global=True)
+                window.append(now)
+
+            info = request.match_info
+            major = info.get('channel_id') or info.get('guild_id') or info.get('webhook_id') or ''
+            try:
+                bucket = self._buckets[(bucket_hash, major)]
+            except KeyError:
+                bucket = self._buckets[(bucket_hash, major)] = _Bucket(limit, per)
+
+            if not bucket.consume(now):
+                return self._ratelimit_response(bucket.reset_at - now, is_global=False, bucket=bucket_hash)
+
+            response = await handler(request)
+            reset_after = bucket.reset_at - now
+            response.headers['X-RateLimit-Bucket'] = bucket_hash
+            response.headers['X-RateLimit-Limit'] = str(bucket.limit)
+            response.headers['X-RateLimit-Remaining'] = str(bucket.remaining)
+            response.headers['X-RateLimit-Reset-After'] = f'{reset_after:.3f}'
+            response.headers['X-RateLimit-Reset'] = f'{time.time() + reset_after:.3f}'
+            return response
+
+        return wrapped
+
+    def _routes(self) -> List[Tuple[str, str, Handler]]:
+        return [
+            ('GET', '/gateway', self._get_gateway),
+            ('GET', '/gateway/bot', self._get_bot_gateway),
+            ('GET', '/users/@me', self._get_me),
+            ('GET', '/users/{user_id}', self._get_user),
+            ('GET', '/oauth2/applications/@me', self._get_application),
+            ('GET', '/guilds/{guild_id}', self._get_guild),
+            ('GET', '/guilds/{guild_id}/channels', self._get_guild_channels),
+            ('GET', '/guilds/{guild_id}/members/{user_id}', self._get_member),
+            ('GET', '/channels/{channel_id}', self._get_channel),
+            ('POST', '/channels/{channel_id}/typing', self._no_content),
+            ('GET', '/channels/{channel_id}/messages', self._get_messages),
+            ('POST', '/channels/{channel_id}/messages', self._send_message),
+            ('GET', '/channels/{channel_id}/messages/{message_id}', self._get_message),
+            ('PATCH', '/channels/{channel_id}/messages/{message_id}', self._edit_message),
+            ('DELETE', '/channels/{channel_id}/messages/{message_id}', self._delete_message),
+            ('PUT', '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me', self._no_content),
+            ('DELETE', '/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me', self._no_content),
+        ]
+
+    async def _not_found(self, request: web.Request) -> web.Response:
+        return _error(404, '404: Not Found')
+
+    async def _no_content(self, request: web.Request) -> web.Response:
+        return web.Response(status=204)
+
+    async def _get_gateway(self, request: web.Request) -> web.Response:
+        return _json_response({'url': self.gateway_url})
+
+    async def _get_bot_gateway(self, request: web.Request) -> web.Response:
+        return _json_response(
+            {
+                'url': self.gateway_url,
+                'shards': self.shard_count,
+                'session_start_limit': {
+                    'total': 1000,
+                    'remaining': 1000 - self.identifies,
+                    'reset_after': 86400000,
+                    'max_concurrency': self.max_concurrency,
+                },
+            }
+        )
+
+    async def _get_me(self, request: web.Request) -> web.Response:
+        return _json_response(self.user)
+
+    async def _get_user(self, request: web.Request) -> web.Response:
+        user = self._users.get(request.match_info['user_id'])
+        if user is None:
+            return _error(404, 'Unknown User', 10013)
+        return _json_response(user)
+
+    async def _get_application(self, request: web.Request) -> web.Response:
+        return _json_response(
+            {
+                'id': self.user['id'],
+                'name': self.user['username'],
+                'description': '',
+                'icon': None,
+                'rpc_origins': [],
+                'bot_public': True,
+                'bot_require_code_grant': False,
+                'owner': self.user,
+                'summary': '',
+                'verify_key': '0' * 64,
+                'flags': 0,
+            }
+        )
+
+    async def _get_guild(self, request: web.Request) -> web.Response:
+        guild = self.guilds.get(request.match_info['guild_id'])
+        if guild is None:
+            return _error(404, 'Unknown Guild', 10004)
+        return _json_response({k: v for k, v in guild.items() if k not in ('channels', 'members')})
+
+    async def _get_guild_channels(self, request: web.Request) -> web.Response:
+        guild = self.guilds.get(request.match_info['guild_id'])
+        if guild is None:
+            return _error(404, 'Unknown Guild', 10004)
+        return _json_response(guild['channels'])
+
+    async def _get_member(self, request: web.Request) -> web.Response:
+        guild = self.guilds.get(request.match_info['guild_id'])
+        if guild is not None:
+            user_id = request.match_info['user_id']
+            for member in guild['members']:
+                if member['user']['id'] == user_id:
+                    return _json_response(member)
+        return _error(404, 'Unknown Member', 10007)
+
+    async def _get_channel(self, request: web.Request) -> web.Response:
+        channel = self._channels.get(request.match_info['channel_id'])
+        if channel is None:
+            return _error(404, 'Unknown Channel', 10003)
+        return _json_response(channel)
+
+    async def _get_messages(self, request: web.Request) -> web.Response:
+        messages = self._messages.get(request.match_info['channel_id'])
+        if messages is None:
+            return _error(404, 'Unknown Channel', 10003)
+        limit = int(request.query.get('limit', 50))
+        return _json_response(list(reversed(list(messages.values())))[:limit])
+
+    async def _send_message(self, request: web.Request) -> web.Response:
+        channel = self._channels.get(request.match_info['channel_id'])
+        if channel is None:
+            return _error(404, 'Unknown Channel', 10003)
+
+        data: Dict[str, Any] = {}
+        attachments = []
+        if request.content_type == 'multipart/form-data':
+            reader = await request.multipart()
+            async for part in reader:
+                if part.name == 'payload_json':
+                    data = json.loads(await part.text())
+                else:
+                    content = bytearray()
+                    while True:
+                        chunk = await part.read_chunk()  # type: ignore
+                        if not chunk:
+                            break
+                        content += chunk
+                    attachment_id = self._snowflake()
+                    self._attachments[attachment_id] = bytes(content)
+                    url = f'{self.url}/attachments/{channel["id"]}/{attachment_id}/{part.filename}'
+                    attachments.append(
+                        {
+                            'id': attachment_id,
+                            'filename': part.filename,
+                            'size': len(content),
+                            'url': url,
+                            'proxy_url': url,
+                        }
+                    )
+        else:
+            data = await request.json()
+
+        message = self._message_payload(channel, self.user, data)
+        message['attachments'] = attachments
+        await self._store_message(channel, message)
+        return _json_response(message)
+
+    def _find_message(self, request: web.Request) -> Optional[Dict[str, Any]]:
+        messages = self._messages.get(request.match_info['channel_id'], {})
+        return messages.get(request.match_info['message_id'])
+
+    async def _get_message(self, request: web.Request) -> web.Response:
+        message = self._find_message(request)
+        if message is None:
+            return _error(404, 'Unknown Message', 10008)
+        return _json_response(message)
+
+    async def _edit_message(self, request: web.Request) -> web.Response:
+        message = self._find_message(request)
+        if message is None:
+            return _error(404, 'Unknown Message', 10008)
+
+        data = await request.json()
+        for key in ('content', 'embeds', 'components', 'flags'):
+            if key in data:
+                message[key] = data[key]
+        message['edited_timestamp'] = utils.utcnow().isoformat()
+        await self.dispatch('MESSAGE_UPDATE', message, guild_id=int(message['guild_id']))
+        return _json_response(message)
+
+    async def _delete_message(self, request: web.Request) -> web.Response:
+        message = self._find_message(request)
+        if message is None:
+            return _error(404, 'Unknown Message', 10008)
+
+        del self._messages[message['channel_id']][message['id']]
+        for attachment in message['attachments']:
+            self._attachments.pop(attachment['id'], None)
+        payload = {'id': message['id'], 'channel_id': message['channel_id'], 'guild_id': message['guild_id']}
+        await self.dispatch('MESSAGE_DELETE', payload, guild_id=int(message['guild_id']))
+        return web.Response(status=204)
+
+    # CDN
+
+    async def _get_attachment(self, request: web.Request) -> web.Response:
+        content = self._attachments.get(request.match_info['attachment_id'])
+        if content is None:
+            return web.Response(status=404)
+
+        try:
+            requested = request.http_range
+        except ValueError:
+            return web.Response(status=416, headers={'Content-Range': f'bytes */{len(content)}'})
+
+        if requested.start is None and requested.stop is None:
+            return web.Response(body=content, headers={'Accept-Ranges': 'bytes'})
+
+        start, stop, _ = requested.indices(len(content))
+        if start >= len(content) or start >= stop:
+            return web.Response(status=416, headers={'Content-Range': f'bytes */{len(content)}'})
+
+        headers = {'Accept-Ranges': 'bytes', 'Content-Range': f'bytes {start}-{stop - 1}/{len(content)}'}
+        return web.Response(status=206, body=content[start:stop], headers=headers)
+
+    # gateway
+
+    async def _gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        conn = _GatewayConnection(
+            self,
+            ws,
+            compress=request.query.get('compress'),
+            encoding=request.query.get('encoding', 'json'),
+        )
+        self._connections.add(conn)
+        try:
+            await conn.send({'op': DiscordWebSocket.HELLO, 'd': {'heartbeat_interval': int(self.heartbeat_interval * 1000)}})
+            async for msg in ws:
+                if msg.type is WSMsgType.TEXT:
+                    await conn.received(json.loads(msg.data))
+                elif msg.type is WSMsgType.BINARY:
+                    await conn.received(etf.loads(msg.data))
+                elif msg.type is WSMsgType.ERROR:
+                    break
+        finally:
+            self._connections.discard(conn)
+
+        return ws
@@ -23,7 +23,7 @@ DEALINGS IN THE SOFTWARE.
 """
 
 from __future__ import annotations
-from typing import Optional, TYPE_CHECKING, Union
+from typing import AsyncIterable, AsyncIterator, Callable, Optional, TYPE_CHECKING, Union
 
 import os
 import io
@@ -33,6 +33,23 @@ __all__ = (
 )
 
 
+class _StreamFactory:
+    # Every iteration starts a new stream so a retried upload sends the
+    # whole body again without it ever being held in memory.
+    def __init__(self, factory: Callable[[], AsyncIterable[bytes]], name: Optional[str]) -> None:
+        self.factory: Callable[[], AsyncIterable[bytes]] = factory
+        self.name: Optional[str] = name
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.factory().__aiter__()
+
+    def seek(self, offset: int) -> int:
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
 class File:
     r"""A parameter object used for :meth:`abc.Messageable.send`
     for sending file objects.
@@ -54,7 +71,10 @@ class File:
             If the file-like object passed is opened via ``open`` then the
             modes 'rb' should be used.
 
-            To pass binary data, consider usage of ``io.BytesIO``.
+            To pass binary data, consider usage of ``io.BytesIO``. Large files
+            should rather be passed by filename or with :meth:`from_stream` so
+            that they are read in chunks while uploading instead of being
+            held in memory.
 
     filename: Optional[:class:`str`]
         The filename to display when uploading to Discord.
@@ -109,6 +129,57 @@ class File:
 
         self.spoiler = spoiler or (self.filename is not None and self.filename.startswith('SPOILER_'))
 
+    @classmethod
+    def from_stream(
+        cls,
+        factory: Callable[[], AsyncIterable[bytes]],
+        filename: str,
+        *,
+        spoiler: bool = False,
+    ) -> File:
+        """Creates a file whose contents are produced by an asynchronous iterable.
+
+        The contents are sent in chunks as they are produced, so the file is never
+        held in memory as a whole. Since the upload might have to be retried,
+        ``factory`` is called to start a new stream every time the file is sent.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        factory: Callable[[], AsyncIterable[:class:`bytes`]]
+            A callable returning an asynchronous iterable of chunks, for example
+            an asynchronous generator function.
+        filename: :class:`str`
+            The filename to display when uploading to Discord.
+        spoiler: :class:`bool`
+            Whether the attachment is a spoiler.
+
+        Returns
+        --------
+        :class:`File`
+            The streamed file.
+        """
+        self = cls.__new__(cls)
+        self.fp = _StreamFactory(factory, filename)  # type: ignore
+        self._original_pos = 0
+        self._owner = False
+        self._closer = self.fp.close
+
+        if spoiler and not filename.startswith('SPOILER_'):
+            filename = 'SPOILER_' + filename
+
+        self.filename = filename
+        self.spoiler = spoiler or filename.startswith('SPOILER_')
+        return self
+
+    def is_stream(self) -> bool:
+        """:class:`bool`: Whether the file was created with :meth:`from_stream`.
+
+        .. versionadded:: 2.0
+        """
+        return isinstance(self.fp, _StreamFactory)
+
     def reset(self, *, seek: Union[int, bool] = True) -> None:
         # The `seek` parameter is needed because
         # the retry-loop is iterated over multiple times
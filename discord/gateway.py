@@ -24,18 +24,30 @@ DEALINGS IN THE SOFTWARE.
 
 import asyncio
 from collections import namedtuple, deque
-import concurrent.futures
+import heapq
+import itertools
 import logging
 import struct
 import sys
 import time
 import threading
 import traceback
+import weakref
 import zlib
 
 import aiohttp
 
-from . import utils
+try:
+    from compression import zstd  # type: ignore
+except ModuleNotFoundError:
+    try:
+        import zstandard as zstd  # type: ignore
+    except ModuleNotFoundError:
+        zstd = None
+
+HAS_ZSTD = zstd is not None
+
+from . import etf, utils
 from .activity import BaseActivity
 from .enums import SpeakingState
 from .errors import ConnectionClosed, InvalidArgument
@@ -63,110 +75,324 @@ class WebSocketClosure(Exception):
 
 EventListener = namedtuple('EventListener', 'predicate event result future')
 
+class TransportCompression:
+    """Decompresses the messages of a gateway connection and keeps
+    track of how well that is going.
+
+    This is for internal use only.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.compressed_bytes = 0
+        self.decompressed_bytes = 0
+        self.decompress_time = 0.0
+
+    @staticmethod
+    def create(name):
+        if name == 'zstd-stream':
+            return ZstdStreamCompression()
+        if name == 'zlib-stream':
+            return ZlibStreamCompression()
+        return None
+
+    def feed(self, data):
+        """Returns a complete compressed message or ``None`` if more frames are needed."""
+        return data
+
+    def _decompress(self, data):
+        raise NotImplementedError
+
+    def decompress(self, data):
+        start = time.perf_counter()
+        result = self._decompress(data)
+        self.decompress_time += time.perf_counter() - start
+        self.compressed_bytes += len(data)
+        self.decompressed_bytes += len(result)
+        return result
+
+    @staticmethod
+    def stats(transports):
+        compressed = decompressed = 0
+        elapsed = 0.0
+        names = set()
+        for transport in transports:
+            names.add(transport.name)
+            compressed += transport.compressed_bytes
+            decompressed += transport.decompressed_bytes
+            elapsed += transport.decompress_time
+
+        return {
+            'method': names.pop() if len(names) == 1 else None,
+            'compressed_bytes': compressed,
+            'decompressed_bytes': decompressed,
+            'ratio': decompressed / compressed if compressed else None,
+            'decompress_time': elapsed,
+        }
+
+class ZlibStreamCompression(TransportCompression):
+    name = 'zlib-stream'
+
+    def __init__(self):
+        super().__init__()
+        self._zlib = zlib.decompressobj()
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        self._buffer.extend(data)
+        if len(data) < 4 or data[-4:] != b'\x00\x00\xff\xff':
+            return None
+
+        data, self._buffer = self._buffer, bytearray()
+        return data
+
+    def _decompress(self, data):
+        return self._zlib.decompress(data)
+
+class ZstdStreamCompression(TransportCompression):
+    name = 'zstd-stream'
+
+    def __init__(self):
+        super().__init__()
+        self._zstd = zstd.ZstdDecompressor()
+        if hasattr(self._zstd, 'decompressobj'):
+            # zstandard, compression.zstd decompressors are streaming already
+            self._zstd = self._zstd.decompressobj()
+
+    def _decompress(self, data):
+        # every message is flushed, so it can be decompressed on its own
+        return self._zstd.decompress(data)
+
 class GatewayRatelimiter:
-    def __init__(self, count=110, per=60.0):
-        # The default is 110 to give room for at least 10 heartbeats per minute
+    # lanes, in order of priority
+    CONTROL = 0  # heartbeats, IDENTIFY and RESUME
+    HIGH = 1  # presence and voice state updates
+    NORMAL = 2  # member requests and everything else
+    LANES = ('control', 'high', 'normal')
+
+    def __init__(self, count=120, per=60.0, reserved=10):
+        # Discord allows 120 sends per minute, the last `reserved` of them
+        # can only be used by the control lane so heartbeats always get through
         self.max = count
-        self.remaining = count
+        self.reserved = reserved
+        self.used = 0
         self.window = 0.0
         self.per = per
-        self.lock = asyncio.Lock()
         self.shard_id = None
+        self._counter = itertools.count()
+        self._queue = []
+        self._depth = [0] * len(self.LANES)
+        self._drain_task = None
 
     def is_ratelimited(self):
-        current = time.time()
+        if self._queue:
+            return True
+        current = time.monotonic()
         if current > self.window + self.per:
             return False
-        return self.remaining == 0
+        return self.used >= self.max - self.reserved
 
-    def get_delay(self):
-        current = time.time()
+    def queue_depth(self):
+        return dict(zip(self.LANES, self._depth))
 
+    def _acquire(self, limit):
+        current = time.monotonic()
         if current > self.window + self.per:
-            self.remaining = self.max
-
-        if self.remaining == self.max:
             self.window = current
+            self.used = 0
 
-        if self.remaining == 0:
+        if self.used >= limit:
             return self.per - (current - self.window)
 
-        self.remaining -= 1
-        if self.remaining == 0:
-            self.window = current
-
+        self.used += 1
         return 0.0
 
-    async def block(self):
-        async with self.lock:
-            delta = self.get_delay()
-            if delta:
-                _log.warning('WebSocket in shard ID %s is ratelimited, waiting %.2f seconds', self.shard_id, delta)
-                await asyncio.sleep(delta)
+    async def block(self, priority=NORMAL):
+        if priority == self.CONTROL:
+            self._depth[priority] += 1
+            try:
+                while True:
+                    delta = self._acquire(self.max)
+                    if not delta:
+                        return
+                    _log.warning('WebSocket in shard ID %s is ratelimited, waiting %.2f seconds', self.shard_id, delta)
+                    await asyncio.sleep(delta)
+            finally:
+                self._depth[priority] -= 1
+
+        if not self._queue and not self._acquire(self.max - self.reserved):
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._counter), future))
+        self._depth[priority] += 1
+        if self._drain_task is None:
+            self._drain_task = asyncio.create_task(self._drain())
 
+        try:
+            await future
+        finally:
+            self._depth[priority] -= 1
 
-class KeepAliveHandler(threading.Thread):
-    def __init__(self, *args, **kwargs):
-        ws = kwargs.pop('ws', None)
-        interval = kwargs.pop('interval', None)
-        shard_id = kwargs.pop('shard_id', None)
-        threading.Thread.__init__(self, *args, **kwargs)
+    async def _drain(self):
+        try:
+            while self._queue:
+                future = self._queue[0][2]
+                if future.done():
+                    # the sender was cancelled
+                    heapq.heappop(self._queue)
+                    continue
+
+                delta = self._acquire(self.max - self.reserved)
+                if delta:
+                    _log.warning('WebSocket in shard ID %s is ratelimited, waiting %.2f seconds', self.shard_id, delta)
+                    await asyncio.sleep(delta)
+                    continue
+
+                heapq.heappop(self._queue)
+                future.set_result(None)
+        finally:
+            self._drain_task = None
+
+
+class HeartbeatScheduler:
+    """Sends the heartbeats of every websocket running on an event loop.
+
+    The heartbeats are timers on the event loop itself. An optional watchdog
+    thread logs where the event loop is stuck when it is blocked for long
+    enough that heartbeats cannot be sent.
+    """
+
+    WATCHDOG_INTERVAL = 10.0
+
+    _schedulers = weakref.WeakKeyDictionary()
+
+    def __init__(self, loop):
+        # the scheduler is stored in a weak mapping keyed by its loop,
+        # so it must not keep the loop alive itself
+        self._loop = weakref.ref(loop)
+        self.handlers = set()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._tick_handle = None
+        self._watchdog = None
+        self._watchdog_stop = None
+
+    @property
+    def loop(self):
+        return self._loop()
+
+    @classmethod
+    def current(cls):
+        loop = asyncio.get_running_loop()
+        try:
+            return cls._schedulers[loop]
+        except KeyError:
+            scheduler = cls._schedulers[loop] = cls(loop)
+            return scheduler
+
+    def add(self, handler, *, watchdog=False):
+        self.handlers.add(handler)
+        handler._handle = self.loop.call_later(handler.interval, self._beat, handler)
+        if watchdog and self._watchdog is None:
+            self._start_watchdog()
+
+    def remove(self, handler):
+        self.handlers.discard(handler)
+        if handler._handle is not None:
+            handler._handle.cancel()
+            handler._handle = None
+
+        if not self.handlers and self._watchdog is not None:
+            self._stop_watchdog()
+
+    def _beat(self, handler):
+        if handler not in self.handlers:
+            return
+
+        handler._handle = self.loop.call_later(handler.interval, self._beat, handler)
+        if handler._task is not None and not handler._task.done():
+            # the previous heartbeat is still waiting to be sent, don't queue another one
+            _log.warning(handler.behind_msg, handler.shard_id, time.perf_counter() - handler._last_send)
+            return
+
+        # keep a reference so the task isn't garbage collected while sending
+        handler._task = self.loop.create_task(handler.beat())
+
+    def _tick(self):
+        self._last_tick = time.perf_counter()
+        self._tick_handle = self.loop.call_later(1.0, self._tick)
+
+    def _start_watchdog(self):
+        self._tick()
+        self._watchdog_stop = stop = threading.Event()
+        self._watchdog = threading.Thread(target=self._run_watchdog, args=(stop,), name='heartbeat-watchdog', daemon=True)
+        self._watchdog.start()
+
+    def _stop_watchdog(self):
+        self._watchdog_stop.set()
+        self._watchdog = self._watchdog_stop = None
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+
+    def _run_watchdog(self, stop):
+        while not stop.wait(self.WATCHDOG_INTERVAL):
+            blocked = time.perf_counter() - self._last_tick
+            if blocked < self.WATCHDOG_INTERVAL:
+                continue
+
+            msg = 'Heartbeats of %s websockets blocked for more than %.0f seconds.'
+            try:
+                frame = sys._current_frames()[self._loop_thread_id]
+            except KeyError:
+                pass
+            else:
+                stack = ''.join(traceback.format_stack(frame))
+                msg = f'{msg}\nLoop thread traceback (most recent call last):\n{stack}'
+            _log.warning(msg, len(self.handlers), blocked)
+
+
+class KeepAliveHandler:
+    def __init__(self, *, ws, interval, shard_id=None, watchdog=False):
         self.ws = ws
-        self._main_thread_id = ws.thread_id
         self.interval = interval
-        self.daemon = True
         self.shard_id = shard_id
         self.msg = 'Keeping shard ID %s websocket alive with sequence %s.'
-        self.block_msg = 'Shard ID %s heartbeat blocked for more than %s seconds.'
         self.behind_msg = 'Can\'t keep up, shard ID %s websocket is %.1fs behind.'
-        self._stop_ev = threading.Event()
+        self._watchdog = watchdog
+        self._scheduler = None
+        self._handle = None
+        self._task = None
         self._last_ack = time.perf_counter()
         self._last_send = time.perf_counter()
         self._last_recv = time.perf_counter()
         self.latency = float('inf')
         self.heartbeat_timeout = ws._max_heartbeat_timeout
 
-    def run(self):
-        while not self._stop_ev.wait(self.interval):
-            if self._last_recv + self.heartbeat_timeout < time.perf_counter():
-                _log.warning("Shard ID %s has stopped responding to the gateway. Closing and restarting.", self.shard_id)
-                coro = self.ws.close(4000)
-                f = asyncio.run_coroutine_threadsafe(coro, loop=self.ws.loop)
-
-                try:
-                    f.result()
-                except Exception:
-                    _log.exception('An error occurred while stopping the gateway. Ignoring.')
-                finally:
-                    self.stop()
-                    return
-
-            data = self.get_payload()
-            _log.debug(self.msg, self.shard_id, data['d'])
-            coro = self.ws.send_heartbeat(data)
-            f = asyncio.run_coroutine_threadsafe(coro, loop=self.ws.loop)
-            try:
-                # block until sending is complete
-                total = 0
-                while True:
-                    try:
-                        f.result(10)
-                        break
-                    except concurrent.futures.TimeoutError:
-                        total += 10
-                        try:
-                            frame = sys._current_frames()[self._main_thread_id]
-                        except KeyError:
-                            msg = self.block_msg
-                        else:
-                            stack = ''.join(traceback.format_stack(frame))
-                            msg = f'{self.block_msg}\nLoop thread traceback (most recent call last):\n{stack}'
-                        _log.warning(msg, self.shard_id, total)
+    def start(self):
+        self._scheduler = HeartbeatScheduler.current()
+        self._scheduler.add(self, watchdog=self._watchdog)
 
+    async def beat(self):
+        if self._last_recv + self.heartbeat_timeout < time.perf_counter():
+            _log.warning("Shard ID %s has stopped responding to the gateway. Closing and restarting.", self.shard_id)
+            self.stop()
+            try:
+                await self.ws.close(4000)
             except Exception:
-                self.stop()
-            else:
-                self._last_send = time.perf_counter()
+                _log.exception('An error occurred while stopping the gateway. Ignoring.')
+            return
+
+        data = self.get_payload()
+        _log.debug(self.msg, self.shard_id, data['d'])
+        try:
+            await self.ws.send_heartbeat(data)
+        except Exception:
+            self.stop()
+        else:
+            self._last_send = time.perf_counter()
 
     def get_payload(self):
         return {
@@ -175,7 +401,9 @@ class KeepAliveHandler(threading.Thread):
         }
 
     def stop(self):
-        self._stop_ev.set()
+        if self._scheduler is not None:
+            self._scheduler.remove(self)
+            self._scheduler = None
 
     def tick(self):
         self._last_recv = time.perf_counter()
@@ -192,7 +420,6 @@ class VoiceKeepAliveHandler(KeepAliveHandler):
         super().__init__(*args, **kwargs)
         self.recent_ack_latencies = deque(maxlen=20)
         self.msg = 'Keeping shard ID %s voice websocket alive with timestamp %s.'
-        self.block_msg = 'Shard ID %s voice heartbeat blocked for more than %s seconds'
         self.behind_msg = 'High socket latency, shard ID %s heartbeat is %.1fs behind'
 
     def get_payload(self):
@@ -276,15 +503,19 @@ class DiscordWebSocket:
         self._dispatch_listeners = []
         # the keep alive
         self._keep_alive = None
-        self.thread_id = threading.get_ident()
 
         # ws related stuff
         self.session_id = None
         self.sequence = None
-        self._zlib = zlib.decompressobj()
-        self._buffer = bytearray()
+        self.resume_gateway_url = None
+        self._transport = ZlibStreamCompression()
+        # frames of at least this many bytes are decoded in the executor
+        self._offload_threshold = None
+        # either 'json' or 'etf'
+        self.encoding = 'json'
         self._close_code = None
         self._rate_limiter = GatewayRatelimiter()
+        self._heartbeat_watchdog = False
 
     @property
     def open(self):
@@ -305,7 +536,9 @@ class DiscordWebSocket:
 
         This is for internal use only.
         """
-        gateway = gateway or await client.http.get_gateway()
+        gateway = gateway or await client.http.get_gateway(
+            encoding=client._gateway_encoding, compress=client._gateway_compression
+        )
         socket = await client.http.ws_connect(gateway)
         ws = cls(socket, loop=client.loop)
 
@@ -323,6 +556,10 @@ class DiscordWebSocket:
         ws.session_id = session
         ws.sequence = sequence
         ws._max_heartbeat_timeout = client._connection.heartbeat_timeout
+        ws._heartbeat_watchdog = client._heartbeat_watchdog
+        ws._offload_threshold = client._gateway_offload_threshold
+        ws.encoding = client._gateway_encoding
+        ws._transport = TransportCompression.create(client._gateway_compression)
 
         if client._enable_debug_events:
             ws.send = ws.debug_send
@@ -402,7 +639,7 @@ class DiscordWebSocket:
             payload['d']['intents'] = state._intents.value
 
         await self.call_hooks('before_identify', self.shard_id, initial=self._initial_identify)
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=GatewayRatelimiter.CONTROL)
         _log.info('Shard ID %s has sent the IDENTIFY payload.', self.shard_id)
 
     async def resume(self):
@@ -416,21 +653,38 @@ class DiscordWebSocket:
             }
         }
 
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=GatewayRatelimiter.CONTROL)
         _log.info('Shard ID %s has sent the RESUME payload.', self.shard_id)
 
-    async def received_message(self, msg, /):
-        if type(msg) is bytes:
-            self._buffer.extend(msg)
+    def _decode(self, msg, compressed):
+        if compressed:
+            msg = self._transport.decompress(msg)
 
-            if len(msg) < 4 or msg[-4:] != b'\x00\x00\xff\xff':
-                return
-            msg = self._zlib.decompress(self._buffer)
+        if self.encoding == 'etf':
+            return msg, etf.loads(msg)
+
+        if compressed:
             msg = msg.decode('utf-8')
-            self._buffer = bytearray()
+        return msg, utils._from_json(msg)
+
+    async def received_message(self, msg, /):
+        compressed = type(msg) is bytes and self._transport is not None
+        if compressed:
+            msg = self._transport.feed(msg)
+            if msg is None:
+                return
 
-        self.log_receive(msg)
-        msg = utils._from_json(msg)
+        threshold = self._offload_threshold
+        if threshold is not None and len(msg) >= threshold:
+            # Large frames such as READY or GUILD_CREATE of big guilds take a while to
+            # decode, so this is done in a thread to keep the event loop responsive.
+            # The next frame is not read until this one is done, so the shared
+            # decompression context is still fed in order.
+            raw, msg = await self.loop.run_in_executor(None, self._decode, msg, compressed)
+        else:
+            raw, msg = self._decode(msg, compressed)
+
+        self.log_receive(raw)
 
         _log.debug('For Shard ID %s: WebSocket Event: %s', self.shard_id, msg)
         event = msg.get('t')
@@ -463,14 +717,16 @@ class DiscordWebSocket:
             if op == self.HEARTBEAT:
                 if self._keep_alive:
                     beat = self._keep_alive.get_payload()
-                    await self.send_as_json(beat)
+                    await self.send_heartbeat(beat)
                 return
 
             if op == self.HELLO:
                 interval = data['heartbeat_interval'] / 1000.0
-                self._keep_alive = KeepAliveHandler(ws=self, interval=interval, shard_id=self.shard_id)
+                self._keep_alive = KeepAliveHandler(
+                    ws=self, interval=interval, shard_id=self.shard_id, watchdog=self._heartbeat_watchdog
+                )
                 # send a heartbeat immediately
-                await self.send_as_json(self._keep_alive.get_payload())
+                await self.send_heartbeat(self._keep_alive.get_payload())
                 self._keep_alive.start()
                 return
 
@@ -492,6 +748,7 @@ class DiscordWebSocket:
             self._trace = trace = data.get('_trace', [])
             self.sequence = msg['s']
             self.session_id = data['session_id']
+            self.resume_gateway_url = data.get('resume_gateway_url')
             # pass back shard ID to ready handler
             data['__shard_id__'] = self.shard_id
             _log.info('Shard ID %s has connected to Gateway: %s (Session ID: %s).',
@@ -584,29 +841,39 @@ class DiscordWebSocket:
                 _log.info('Websocket closed with %s, cannot reconnect.', code)
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id, code=code) from None
 
-    async def debug_send(self, data, /):
-        await self._rate_limiter.block()
+    def _send_frame(self, data):
+        if type(data) is bytes:
+            return self.socket.send_bytes(data)
+        return self.socket.send_str(data)
+
+    async def debug_send(self, data, /, *, priority=GatewayRatelimiter.NORMAL):
+        await self._rate_limiter.block(priority)
         self._dispatch('socket_raw_send', data)
-        await self.socket.send_str(data)
+        await self._send_frame(data)
 
-    async def send(self, data, /):
-        await self._rate_limiter.block()
-        await self.socket.send_str(data)
+    async def send(self, data, /, *, priority=GatewayRatelimiter.NORMAL):
+        await self._rate_limiter.block(priority)
+        await self._send_frame(data)
+
+    async def send_as_json(self, data, *, priority=GatewayRatelimiter.NORMAL):
+        # payloads are sent in the encoding of the connection, which may be ETF
+        if self.encoding == 'etf':
+            data = etf.dumps(data)
+        else:
+            data = utils._to_json(data)
 
-    async def send_as_json(self, data):
         try:
-            await self.send(utils._to_json(data))
+            await self.send(data, priority=priority)
         except RuntimeError as exc:
             if not self._can_handle_close():
                 raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
 
     async def send_heartbeat(self, data):
-        # This bypasses the rate limit handling code since it has a higher priority
-        try:
-            await self.socket.send_str(utils._to_json(data))
-        except RuntimeError as exc:
-            if not self._can_handle_close():
-                raise ConnectionClosed(self.socket, shard_id=self.shard_id) from exc
+        # heartbeats have capacity reserved for them
+        await self.send_as_json(data, priority=GatewayRatelimiter.CONTROL)
+
+    def queue_depth(self):
+        return self._rate_limiter.queue_depth()
 
     async def change_presence(self, *, activity=None, status=None, since=0.0):
         if activity is not None:
@@ -629,9 +896,8 @@ class DiscordWebSocket:
             }
         }
 
-        sent = utils._to_json(payload)
-        _log.debug('Sending "%s" to change status', sent)
-        await self.send(sent)
+        _log.debug('Sending "%s" to change status', payload)
+        await self.send_as_json(payload, priority=GatewayRatelimiter.HIGH)
 
     async def request_chunks(self, guild_id, query=None, *, limit, user_ids=None, presences=False, nonce=None):
         payload = {
@@ -667,7 +933,7 @@ class DiscordWebSocket:
         }
 
         _log.debug('Updating our voice state to %s.', payload)
-        await self.send_as_json(payload)
+        await self.send_as_json(payload, priority=GatewayRatelimiter.HIGH)
 
     async def close(self, code=4000):
         if self._keep_alive:
@@ -774,7 +1040,6 @@ class DiscordVoiceWebSocket:
         ws.gateway = gateway
         ws._connection = client
         ws._max_heartbeat_timeout = 60.0
-        ws.thread_id = threading.get_ident()
 
         if resume:
             await ws.resume()
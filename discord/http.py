@@ -25,30 +25,51 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+import datetime
+from bisect import bisect_left
+from collections import deque, OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+import hashlib
 import json
 import logging
 import sys
+import time
 from typing import (
     Any,
+    AsyncIterator,
+    Callable,
     ClassVar,
     Coroutine,
+    Deque,
     Dict,
+    Generator,
     Iterable,
     List,
     Optional,
     Sequence,
+    Set,
     TYPE_CHECKING,
     Tuple,
-    Type,
     TypeVar,
     Union,
 )
 from urllib.parse import quote as _uriquote
-import weakref
 
 import aiohttp
 
-from .errors import HTTPException, Forbidden, NotFound, LoginFailure, DiscordServerError, GatewayNotFound, InvalidArgument
+from .enums import CircuitState, RequestPriority
+from .errors import (
+    HTTPException,
+    Forbidden,
+    NotFound,
+    LoginFailure,
+    DiscordServerError,
+    GatewayNotFound,
+    InvalidArgument,
+    DeadlineExceeded,
+    CircuitOpen,
+)
 from .gateway import DiscordClientWebSocketResponse
 from . import __version__, utils
 from .utils import MISSING
@@ -56,7 +77,9 @@ from .utils import MISSING
 _log = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    from .asset import AssetCache
     from .file import File
+    from .ratelimit import RateLimitBackend
     from .enums import (
         AuditLogAction,
         InteractionResponseType,
@@ -68,6 +91,7 @@ if TYPE_CHECKING:
         channel,
         components,
         emoji,
+        gateway,
         embed,
         guild,
         integration,
@@ -87,11 +111,7 @@ if TYPE_CHECKING:
     )
     from .types.snowflake import Snowflake, SnowflakeList
 
-    from types import TracebackType
-
     T = TypeVar('T')
-    BE = TypeVar('BE', bound=BaseException)
-    MU = TypeVar('MU', bound='MaybeUnlock')
     Response = Coroutine[Any, Any, T]
 
 
@@ -124,31 +144,783 @@ class Route:
         self.webhook_id: Optional[Snowflake] = parameters.get('webhook_id')
         self.webhook_token: Optional[str] = parameters.get('webhook_token')
 
+        # interaction responses have a hard deadline
+        self.priority: RequestPriority = (
+            RequestPriority.interaction if 'interaction_token' in parameters else RequestPriority.normal
+        )
+
+    @property
+    def key(self) -> str:
+        """The bucket key is used to represent the route in various mappings."""
+        return f'{self.method} {self.path}'
+
+    @property
+    def major_parameters(self) -> str:
+        """Returns the major parameters formatted as a string.
+
+        This needs to be appended to a bucket hash to constitute as a full rate limit key.
+        """
+        return f'{self.channel_id}:{self.guild_id}:{self.webhook_id}:{self.webhook_token}'
+
     @property
     def bucket(self) -> str:
         # the bucket is just method + path w/ major parameters
-        return f'{self.channel_id}:{self.guild_id}:{self.path}'
+        return f'{self.key}:{self.major_parameters}'
+
+    @property
+    def shared_bucket(self) -> str:
+        """The bucket key used with a :class:`RateLimitBackend`.
+
+        Unlike the bucket hashes a client learns from the responses it gets, this
+        is the same in every process from the start. Tokens are hashed so that
+        they are not shared with the backend.
+        """
+        token = self.webhook_token
+        if token is not None:
+            token = hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+        return f'{self.key}:{self.channel_id}:{self.guild_id}:{self.webhook_id}:{token}'
+
+
+_request_priority: ContextVar[Optional[RequestPriority]] = ContextVar('_request_priority', default=None)
+
+
+class _PriorityWaiters:
+    """Futures waiting for a rate limit, grouped into one FIFO lane per priority.
+
+    Higher priority lanes are served first. However, a waiter that has been queued
+    for longer than ``max_wait`` seconds is served before anything else so that
+    a steady stream of high priority requests cannot starve the others.
+    """
+
+    __slots__ = ('max_wait', '_lanes', '_loop')
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, *, max_wait: float = 5.0) -> None:
+        self.max_wait: float = max_wait
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._lanes: Tuple[Deque[Tuple[float, asyncio.Future[None]]], ...] = tuple(deque() for _ in RequestPriority)
+
+    def __len__(self) -> int:
+        return sum(len(lane) for lane in self._lanes)
+
+    def __bool__(self) -> bool:
+        return any(self._lanes)
+
+    def depths(self) -> Dict[str, int]:
+        return {priority.name: len(self._lanes[priority.value]) for priority in RequestPriority}
+
+    def ahead_of(self, priority: RequestPriority) -> int:
+        """Returns how many waiters would be served before a new waiter with this priority."""
+        return sum(len(lane) for lane in self._lanes[: priority.value + 1])
+
+    def push(self, priority: RequestPriority) -> asyncio.Future[None]:
+        future = self._loop.create_future()
+        self._lanes[priority.value].append((self._loop.time(), future))
+        return future
+
+    def pop(self) -> Optional[asyncio.Future[None]]:
+        """Returns the next waiter to serve, or ``None`` if nobody is waiting."""
+        lanes = self._lanes
+        for lane in lanes:
+            # drop the waiters that were cancelled
+            while lane and lane[0][1].done():
+                lane.popleft()
+
+        starved = None
+        deadline = self._loop.time() - self.max_wait
+        for lane in lanes:
+            if lane and lane[0][0] <= deadline and (starved is None or lane[0][0] < starved[0][0]):
+                starved = lane
+
+        if starved is not None:
+            return starved.popleft()[1]
+
+        for lane in lanes:
+            if lane:
+                return lane.popleft()[1]
+        return None
+
+
+class Ratelimit:
+    """Represents a single rate limit bucket as reported by Discord.
+
+    Requests acquire a slot from the bucket before being sent. The bucket
+    starts out allowing a single request in flight until the server reports
+    its real ``limit``, after which up to ``remaining`` requests may be sent
+    concurrently before waiting for the bucket to reset.
+
+    This is an internal class.
+    """
+
+    __slots__ = (
+        'limit',
+        'remaining',
+        'outgoing',
+        'reset_after',
+        'expires',
+        'dirty',
+        '_loop',
+        '_pending',
+        '_reset_handle',
+        '_last_request',
+    )
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.limit: int = 1
+        self.remaining: int = self.limit
+        self.outgoing: int = 0
+        self.reset_after: float = 0.0
+        self.expires: Optional[float] = None
+        self.dirty: bool = False
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._pending: _PriorityWaiters = _PriorityWaiters(loop)
+        self._reset_handle: Optional[asyncio.TimerHandle] = None
+        self._last_request: float = loop.time()
+
+    def __repr__(self) -> str:
+        return (
+            f'<Ratelimit limit={self.limit} remaining={self.remaining} outgoing={self.outgoing} '
+            f'pending={len(self._pending)} reset_after={self.reset_after}>'
+        )
+
+    def is_expired(self) -> bool:
+        return self.expires is not None and self._loop.time() > self.expires
+
+    def is_inactive(self) -> bool:
+        delta = self._loop.time() - self._last_request
+        return delta >= 300 and self.outgoing == 0 and not self._pending
+
+    def reset(self) -> None:
+        if self._reset_handle is not None:
+            self._reset_handle.cancel()
+            self._reset_handle = None
+
+        self.remaining = max(self.limit - self.outgoing, 0)
+        self.expires = None
+        self.reset_after = 0.0
+        self.dirty = False
+
+    def _schedule_reset(self) -> None:
+        if self._reset_handle is not None:
+            self._reset_handle.cancel()
+        self._reset_handle = self._loop.call_later(self.reset_after, self._on_reset)
+
+    def _on_reset(self) -> None:
+        self._reset_handle = None
+        self.reset()
+        self._wake()
+
+    def _wake(self) -> None:
+        # Hand the available slots over to the waiters by priority.
+        # The slot is accounted for here so a woken waiter does not have to
+        # compete with requests that arrive before it gets to run.
+        while self.remaining > 0:
+            future = self._pending.pop()
+            if future is None:
+                break
+
+            self.remaining -= 1
+            self.outgoing += 1
+            future.set_result(None)
+
+    def update(self, response: aiohttp.ClientResponse, *, use_clock: bool = False) -> None:
+        headers = response.headers
+        self.limit = int(headers.get('X-Ratelimit-Limit', 1))
+
+        # The server's count does not include requests that are still in flight
+        remaining = int(headers.get('X-Ratelimit-Remaining', 0)) - (self.outgoing - 1)
+        if self.dirty:
+            self.remaining = min(self.remaining, remaining)
+        else:
+            self.remaining = remaining
+            self.dirty = True
+
+        self.remaining = max(self.remaining, 0)
+        self.reset_after = utils._parse_ratelimit_header(response, use_clock=use_clock)
+        self.expires = self._loop.time() + self.reset_after
+        self._schedule_reset()
+
+    def exhaust(self, retry_after: float) -> None:
+        self.remaining = 0
+        self.dirty = True
+        self.reset_after = retry_after
+        self.expires = self._loop.time() + retry_after
+        self._schedule_reset()
+
+    async def acquire(self, priority: RequestPriority = RequestPriority.normal, deadline: Optional[float] = None) -> None:
+        """Waits for a slot in this bucket.
+
+        If a ``deadline`` (in event loop time) is given and no slot can be handed
+        out before it, :exc:`asyncio.TimeoutError` is raised without using a slot.
+        """
+        self._last_request = self._loop.time()
+        if self.is_expired():
+            self.reset()
+
+        if self.remaining > 0 and not self._pending:
+            self.remaining -= 1
+            self.outgoing += 1
+            return
+
+        if deadline is not None and self.remaining == 0 and self.expires is not None and self.expires > deadline:
+            # the bucket does not refill in time, so don't bother queueing
+            raise asyncio.TimeoutError()
+
+        future = self._pending.push(priority)
+        try:
+            if deadline is None:
+                await future
+            else:
+                await asyncio.wait_for(future, deadline - self._loop.time())
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # We were handed a slot but got cancelled before using it
+                self.release(sent=False)
+            raise
+
+    def release(self, sent: bool = True) -> None:
+        """Gives back a slot taken by :meth:`acquire`.
+
+        If the request was never sent then the slot is returned to the bucket.
+        """
+        self.outgoing -= 1
+        if not self.dirty:
+            # No rate limit information is known, so this behaves like a lock
+            self.remaining = max(self.limit - self.outgoing, 0)
+        elif not sent:
+            self.remaining = min(self.remaining + 1, self.limit)
+        self._wake()
+
+
+class GlobalRatelimit:
+    """A token bucket that limits how many requests are sent per second across every bucket.
+
+    Discord's global rate limit is 50 requests per second. Rather than waiting
+    for a global 429 to happen, requests are held back before being sent once
+    the bucket runs dry.
+
+    This is an internal class.
+    """
+
+    __slots__ = ('rate', 'per', '_tokens', '_last', '_loop', '_pending', '_wake_handle')
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, rate: int = 50, per: float = 1.0) -> None:
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+
+        self.rate: int = rate
+        self.per: float = per
+        self._tokens: float = float(rate)
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._last: float = loop.time()
+        self._pending: _PriorityWaiters = _PriorityWaiters(loop)
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+
+    def __repr__(self) -> str:
+        return f'<GlobalRatelimit rate={self.rate} per={self.per} tokens={self.tokens:.2f} pending={len(self._pending)}>'
+
+    def _refill(self) -> None:
+        now = self._loop.time()
+        self._tokens = min(float(self.rate), self._tokens + (now - self._last) * self.rate / self.per)
+        self._last = now
+
+    @property
+    def tokens(self) -> float:
+        """:class:`float`: The number of requests that can currently be sent without waiting."""
+        self._refill()
+        return self._tokens
+
+    def is_ratelimited(self) -> bool:
+        return self.tokens < 1.0
+
+    def get_delay(self) -> float:
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+
+        return (1.0 - self._tokens) * self.per / self.rate
+
+    def drain(self) -> None:
+        self._refill()
+        self._tokens = 0.0
+
+    def _schedule_wake(self) -> None:
+        if self._wake_handle is None:
+            delay = (1.0 - self._tokens) * self.per / self.rate
+            self._wake_handle = self._loop.call_later(max(delay, 0.0), self._wake)
+
+    def _wake(self) -> None:
+        self._wake_handle = None
+        self._refill()
+        while self._tokens >= 1.0:
+            future = self._pending.pop()
+            if future is None:
+                return
+
+            self._tokens -= 1.0
+            future.set_result(None)
+
+        if self._pending:
+            self._schedule_wake()
+
+    async def block(self, priority: RequestPriority = RequestPriority.normal, deadline: Optional[float] = None) -> None:
+        """Waits for a token.
+
+        If a ``deadline`` (in event loop time) is given and no token becomes
+        available before it, :exc:`asyncio.TimeoutError` is raised without using a token.
+        """
+        if not self._pending and not self.get_delay():
+            return
+
+        if deadline is not None:
+            needed = self._pending.ahead_of(priority) + 1 - self._tokens
+            if self._loop.time() + needed * self.per / self.rate > deadline:
+                raise asyncio.TimeoutError()
+
+        future = self._pending.push(priority)
+        self._schedule_wake()
+        try:
+            if deadline is None:
+                await future
+            else:
+                await asyncio.wait_for(future, deadline - self._loop.time())
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # give the token back to the next waiter
+                self._tokens += 1.0
+            raise
+
+
+class RetryBudget:
+    """Caps the share of requests that may be retried after a server error.
+
+    Every request deposits into the budget and every retry withdraws from it,
+    so that during an outage requests fail instead of piling up in the retry loop.
+    Up to ``min_retries`` plus ``ratio`` of the requests made in the last ``window``
+    seconds may be retried.
 
+    This is an internal class.
+    """
 
-class MaybeUnlock:
-    def __init__(self, lock: asyncio.Lock) -> None:
-        self.lock: asyncio.Lock = lock
-        self._unlock: bool = True
+    __slots__ = ('ratio', 'min_retries', 'window', '_loop', '_slots')
 
-    def __enter__(self: MU) -> MU:
-        return self
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, ratio: float = 0.2, min_retries: int = 10, window: int = 10
+    ) -> None:
+        self.ratio: float = ratio
+        self.min_retries: int = min_retries
+        self.window: int = window
+        self._loop: asyncio.AbstractEventLoop = loop
+        # [second, requests, retries], oldest first
+        self._slots: Deque[List[int]] = deque()
+
+    def _current(self) -> List[int]:
+        second = int(self._loop.time())
+        slots = self._slots
+        while slots and slots[0][0] <= second - self.window:
+            slots.popleft()
+        if not slots or slots[-1][0] != second:
+            slots.append([second, 0, 0])
+        return slots[-1]
 
-    def defer(self) -> None:
-        self._unlock = False
+    @property
+    def requests(self) -> int:
+        self._current()
+        return sum(slot[1] for slot in self._slots)
+
+    @property
+    def retries(self) -> int:
+        self._current()
+        return sum(slot[2] for slot in self._slots)
+
+    def deposit(self) -> None:
+        self._current()[1] += 1
+
+    def withdraw(self) -> bool:
+        """Returns whether a retry is allowed, accounting for it if so."""
+        slot = self._current()
+        if self.retries >= self.min_retries + self.ratio * self.requests:
+            return False
+        slot[2] += 1
+        return True
+
+
+class CircuitBreaker:
+    """Fails requests to a route fast once Discord keeps failing on it.
+
+    After ``threshold`` server errors or connection resets within ``window``
+    seconds the breaker opens and refuses requests for ``cooldown`` seconds.
+    Afterwards it is half-open and lets a single request through: if that one
+    succeeds the breaker closes again, otherwise it reopens.
+
+    This is an internal class.
+    """
+
+    __slots__ = (
+        'route',
+        'threshold',
+        'window',
+        'cooldown',
+        'state',
+        '_loop',
+        '_failures',
+        '_opened_at',
+        '_probe_at',
+        '_on_change',
+    )
 
-    def __exit__(
+    def __init__(
         self,
-        exc_type: Optional[Type[BE]],
-        exc: Optional[BE],
-        traceback: Optional[TracebackType],
+        route: str,
+        loop: asyncio.AbstractEventLoop,
+        on_change: Callable[[str, CircuitState, CircuitState], None],
+        threshold: int = 10,
+        window: float = 30.0,
+        cooldown: float = 30.0,
     ) -> None:
-        if self._unlock:
-            self.lock.release()
+        self.route: str = route
+        self.threshold: int = threshold
+        self.window: float = window
+        self.cooldown: float = cooldown
+        self.state: CircuitState = CircuitState.closed
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._failures: Deque[float] = deque()
+        self._opened_at: float = 0.0
+        self._probe_at: Optional[float] = None
+        self._on_change: Callable[[str, CircuitState, CircuitState], None] = on_change
+
+    def __repr__(self) -> str:
+        return f'<CircuitBreaker route={self.route!r} state={self.state} failures={len(self._failures)}>'
+
+    def _set_state(self, state: CircuitState) -> None:
+        before, self.state = self.state, state
+        self._on_change(self.route, before, state)
+
+    def retry_after(self) -> float:
+        return max(self._opened_at + self.cooldown - self._loop.time(), 0.0)
+
+    def allow(self) -> bool:
+        """Returns whether a request may be sent right now."""
+        if self.state is CircuitState.closed:
+            return True
+
+        now = self._loop.time()
+        if self.state is CircuitState.open:
+            if now < self._opened_at + self.cooldown:
+                return False
+            self._probe_at = None
+            self._set_state(CircuitState.half_open)
+
+        # only one probe at a time, unless the previous one never reported back
+        if self._probe_at is not None and now < self._probe_at + self.cooldown:
+            return False
+        self._probe_at = now
+        return True
+
+    def record_success(self) -> None:
+        self._failures.clear()
+        if self.state is not CircuitState.closed:
+            self._set_state(CircuitState.closed)
+
+    def record_failure(self) -> None:
+        now = self._loop.time()
+        if self.state is CircuitState.half_open:
+            self._opened_at = now
+            self._set_state(CircuitState.open)
+            return
+
+        if self.state is CircuitState.open:
+            return
+
+        failures = self._failures
+        failures.append(now)
+        while failures[0] <= now - self.window:
+            failures.popleft()
+
+        if len(failures) >= self.threshold:
+            failures.clear()
+            self._opened_at = now
+            self._set_state(CircuitState.open)
+
+
+class _Histogram:
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    # seconds, roughly log scaled
+    BOUNDS: ClassVar[Tuple[float, ...]] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(self.BOUNDS) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {str(bound): count for bound, count in zip(self.BOUNDS, self.counts)}
+        buckets['inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'max': self.max,
+            'buckets': buckets,
+        }
+
+
+class RouteStats:
+    """Statistics gathered for a single route template.
+
+    All durations are measured in seconds.
+
+    Attributes
+    -----------
+    requests: :class:`int`
+        The number of calls to :meth:`HTTPClient.request` for this route.
+    retries: :class:`int`
+        The number of times a request had to be sent again.
+    ratelimited: :class:`int`
+        The number of 429 responses received.
+    ratelimit_sleep: :class:`float`
+        The total time spent sleeping due to 429 responses.
+    coalesced: :class:`int`
+        The number of requests that shared the response of an identical request
+        that was already in flight.
+    cache_hits: :class:`int`
+        The number of requests that were served from the response cache.
+    deadline_exceeded: :class:`int`
+        The number of requests that were dropped because they could not be sent
+        before their deadline.
+    short_circuited: :class:`int`
+        The number of requests that were refused because the circuit breaker
+        of this route was open.
+    statuses: Dict[:class:`int`, :class:`int`]
+        A mapping of HTTP status code to the number of responses with that code.
+    bucket_wait
+        A histogram of the time spent waiting for a slot in the rate limit bucket.
+    global_wait
+        A histogram of the time spent waiting for a global rate limit ``429`` to be over.
+    pacing_wait
+        A histogram of the time spent held back by the ``max_requests_per_second`` budget.
+    latency
+        A histogram of the time between sending a request and reading its response.
+    """
+
+    __slots__ = (
+        'requests',
+        'retries',
+        'ratelimited',
+        'ratelimit_sleep',
+        'coalesced',
+        'cache_hits',
+        'deadline_exceeded',
+        'short_circuited',
+        'statuses',
+        'bucket_wait',
+        'global_wait',
+        'pacing_wait',
+        'latency',
+    )
+
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.retries: int = 0
+        self.ratelimited: int = 0
+        self.ratelimit_sleep: float = 0.0
+        self.coalesced: int = 0
+        self.cache_hits: int = 0
+        self.deadline_exceeded: int = 0
+        self.short_circuited: int = 0
+        self.statuses: Dict[int, int] = {}
+        self.bucket_wait: _Histogram = _Histogram()
+        self.global_wait: _Histogram = _Histogram()
+        self.pacing_wait: _Histogram = _Histogram()
+        self.latency: _Histogram = _Histogram()
+
+    def record_status(self, status: int) -> None:
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'ratelimited': self.ratelimited,
+            'ratelimit_sleep': self.ratelimit_sleep,
+            'coalesced': self.coalesced,
+            'cache_hits': self.cache_hits,
+            'deadline_exceeded': self.deadline_exceeded,
+            'short_circuited': self.short_circuited,
+            'statuses': dict(self.statuses),
+            'bucket_wait': self.bucket_wait.to_dict(),
+            'global_wait': self.global_wait.to_dict(),
+            'pacing_wait': self.pacing_wait.to_dict(),
+            'latency': self.latency.to_dict(),
+        }
+
+
+class HTTPStats:
+    """Collects statistics about the requests sent by :class:`HTTPClient`.
+
+    Statistics are grouped by route template, e.g. ``GET /channels/{channel_id}``,
+    rather than by the formatted URL. Recording only updates a few counters so
+    this is cheap enough to keep enabled.
+
+    This can be subclassed and assigned to :attr:`HTTPClient.stats` to forward
+    the data elsewhere.
+    """
+
+    def __init__(self) -> None:
+        self.routes: Dict[str, RouteStats] = {}
+
+    def get(self, key: str) -> RouteStats:
+        try:
+            return self.routes[key]
+        except KeyError:
+            self.routes[key] = stats = RouteStats()
+            return stats
+
+    def clear(self) -> None:
+        self.routes.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {key: stats.to_dict() for key, stats in self.routes.items()}
+
+
+class ResponseCache:
+    """An LRU cache with a time to live for the responses of read-mostly routes.
+
+    Only ``GET`` routes that were given a time to live are cached. Routes are
+    identified by their template, e.g. ``GET /guilds/{guild_id}``. Cached
+    payloads are shared between callers and must not be modified.
+
+    Entries are invalidated when they expire, when a non-``GET`` request is
+    made to the same URL, or when a gateway event in :attr:`INVALIDATED_BY`
+    is received.
+
+    Parameters
+    -----------
+    max_size: :class:`int`
+        The maximum number of responses to keep. The least recently used
+        response is evicted once this is exceeded.
+    ttls: Optional[Dict[:class:`str`, :class:`float`]]
+        A mapping of route template to the number of seconds its responses
+        are kept for. Defaults to :attr:`DEFAULT_TTLS`.
+    """
+
+    DEFAULT_TTLS: ClassVar[Dict[str, float]] = {
+        'GET /oauth2/applications/@me': 300.0,
+        'GET /guilds/{guild_id}': 60.0,
+        'GET /guilds/templates/{code}': 300.0,
+        'GET /invites/{invite_id}': 60.0,
+        'GET /webhooks/{webhook_id}': 300.0,
+        'GET /stickers/{sticker_id}': 3600.0,
+    }
+
+    # gateway event -> [(route template, route parameter, payload key)]
+    # if the route parameter is None then every response of the route is invalidated
+    INVALIDATED_BY: ClassVar[Dict[str, List[Tuple[str, Optional[str], Optional[str]]]]] = {
+        'GUILD_UPDATE': [('GET /guilds/{guild_id}', 'guild_id', 'id')],
+        'GUILD_DELETE': [('GET /guilds/{guild_id}', 'guild_id', 'id')],
+        'INVITE_DELETE': [('GET /invites/{invite_id}', 'invite_id', 'code')],
+        'WEBHOOKS_UPDATE': [('GET /webhooks/{webhook_id}', None, None)],
+        'GUILD_STICKERS_UPDATE': [('GET /stickers/{sticker_id}', None, None)],
+    }
+
+    def __init__(self, *, max_size: int = 1024, ttls: Optional[Dict[str, float]] = None) -> None:
+        self.max_size: int = max_size
+        self.ttls: Dict[str, float] = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        # (url, params) -> (route template, expiry, payload)
+        self._entries: OrderedDict[Tuple[str, Any], Tuple[str, float, Any]] = OrderedDict()
+        self._by_url: Dict[str, Set[Tuple[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set_ttl(self, route_key: str, ttl: Optional[float]) -> None:
+        """Sets how long responses of a route template are cached for.
+
+        Passing ``None`` stops caching the route and drops its cached responses.
+        """
+        if ttl is None:
+            self.ttls.pop(route_key, None)
+            self.invalidate(route_key)
+        else:
+            self.ttls[route_key] = ttl
+
+    def _remove(self, key: Tuple[str, Any]) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_url.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_url[key[0]]
+
+    def get(self, key: Tuple[str, Any]) -> Any:
+        try:
+            route_key, expires, value = self._entries[key]
+        except KeyError:
+            return MISSING
+
+        if expires < time.monotonic():
+            self._remove(key)
+            return MISSING
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, route_key: str, key: Tuple[str, Any], value: Any) -> None:
+        try:
+            ttl = self.ttls[route_key]
+        except KeyError:
+            return
+
+        self._entries[key] = (route_key, time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        self._by_url.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def invalidate_url(self, url: str) -> None:
+        """Drops every cached response for a URL regardless of its query parameters."""
+        keys = self._by_url.pop(url, None)
+        if keys:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def invalidate(self, route_key: str, **parameters: Any) -> None:
+        """Drops cached responses of a route template.
+
+        If parameters are given then only the response of the route
+        formatted with them is dropped.
+        """
+        if parameters:
+            method, _, path = route_key.partition(' ')
+            self.invalidate_url(Route(method, path, **parameters).url)
+            return
+
+        keys = [key for key, (template, _, _) in self._entries.items() if template == route_key]
+        for key in keys:
+            self._remove(key)
+
+    def invalidate_from_event(self, event: str, data: Any) -> None:
+        for route_key, parameter, payload_key in self.INVALIDATED_BY.get(event, ()):
+            if parameter is None:
+                self.invalidate(route_key)
+            else:
+                try:
+                    self.invalidate(route_key, **{parameter: data[payload_key]})
+                except (KeyError, TypeError):
+                    pass
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_url.clear()
 
 
 # For some reason, the Discord voice websocket expects this header to be
@@ -167,13 +939,54 @@ class HTTPClient:
         proxy_auth: Optional[aiohttp.BasicAuth] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         unsync_clock: bool = True,
+        max_requests_per_second: Optional[int] = 50,
+        enable_stats: bool = True,
+        coalesce_requests: bool = False,
+        response_cache: Optional[ResponseCache] = None,
+        max_concurrent_downloads: Optional[int] = 16,
+        asset_cache: Optional[AssetCache] = None,
+        api_base_url: Optional[str] = None,
+        ratelimit_backend: Optional[RateLimitBackend] = None,
+        circuit_breaker_threshold: Optional[int] = None,
+        circuit_breaker_window: float = 30.0,
+        circuit_breaker_cooldown: float = 30.0,
+        retry_budget_ratio: Optional[float] = 0.2,
+        dispatch: Optional[Callable[..., Any]] = None,
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = asyncio.get_event_loop() if loop is None else loop
         self.connector = connector
         self.__session: aiohttp.ClientSession = MISSING  # filled in static_login
-        self._locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        # Route key -> bucket hash as reported by Discord
+        self._bucket_hashes: Dict[str, str] = {}
+        # Bucket hash (or route key) + major parameters -> Ratelimit
+        self._buckets: Dict[str, Ratelimit] = {}
         self._global_over: asyncio.Event = asyncio.Event()
         self._global_over.set()
+        self.global_ratelimit: Optional[GlobalRatelimit] = None
+        if max_requests_per_second is not None:
+            self.global_ratelimit = GlobalRatelimit(self.loop, max_requests_per_second)
+        self.stats: Optional[HTTPStats] = HTTPStats() if enable_stats else None
+        # (url, params) -> in-flight GET request, only used if coalescing is enabled
+        self._inflight: Optional[Dict[Tuple[str, Any], asyncio.Task[Any]]] = {} if coalesce_requests else None
+        self.response_cache: Optional[ResponseCache] = response_cache
+        # bounds the number of CDN downloads so they don't take over the connection pool
+        self._download_semaphore: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(max_concurrent_downloads) if max_concurrent_downloads is not None else None
+        )
+        self.asset_cache: Optional[AssetCache] = asset_cache
+        # sends requests somewhere other than Route.BASE, e.g. a local mock server
+        self.api_base_url: Optional[str] = api_base_url
+        # shares rate limits with other processes using the same token
+        self.ratelimit_backend: Optional[RateLimitBackend] = ratelimit_backend
+        # Route key -> CircuitBreaker, only used if a threshold is given
+        self._circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.circuit_breaker_threshold: Optional[int] = circuit_breaker_threshold
+        self.circuit_breaker_window: float = circuit_breaker_window
+        self.circuit_breaker_cooldown: float = circuit_breaker_cooldown
+        self.retry_budget: Optional[RetryBudget] = (
+            RetryBudget(self.loop, retry_budget_ratio) if retry_budget_ratio is not None else None
+        )
+        self._dispatch: Optional[Callable[..., Any]] = dispatch
         self.token: Optional[str] = None
         self.bot_token: bool = False
         self.proxy: Optional[str] = proxy
@@ -204,23 +1017,220 @@ class HTTPClient:
 
         return await self.__session.ws_connect(url, **kwargs)
 
+    def _get_circuit_breaker(self, route_key: str) -> Optional[CircuitBreaker]:
+        if self.circuit_breaker_threshold is None:
+            return None
+
+        try:
+            return self._circuit_breakers[route_key]
+        except KeyError:
+            breaker = CircuitBreaker(
+                route_key,
+                self.loop,
+                self._circuit_state_changed,
+                threshold=self.circuit_breaker_threshold,
+                window=self.circuit_breaker_window,
+                cooldown=self.circuit_breaker_cooldown,
+            )
+            self._circuit_breakers[route_key] = breaker
+            return breaker
+
+    def _circuit_state_changed(self, route_key: str, before: CircuitState, after: CircuitState) -> None:
+        if after is CircuitState.open:
+            _log.warning(
+                'Circuit breaker for %s has opened, failing requests for %.2f seconds.',
+                route_key,
+                self.circuit_breaker_cooldown,
+            )
+        else:
+            _log.info('Circuit breaker for %s is now %s.', route_key, after.name)
+
+        if self._dispatch is not None:
+            self._dispatch('circuit_breaker_update', route_key, before, after)
+
+    def circuit_state(self, route: Route) -> CircuitState:
+        """Returns the state of the circuit breaker of a route."""
+        breaker = self._circuit_breakers.get(route.key)
+        return breaker.state if breaker is not None else CircuitState.closed
+
+    def _can_retry(self, breaker: Optional[CircuitBreaker]) -> bool:
+        if breaker is not None and breaker.state is not CircuitState.closed:
+            return False
+        if self.retry_budget is not None and not self.retry_budget.withdraw():
+            _log.warning('Retry budget has been exhausted, not retrying the request.')
+            return False
+        return True
+
+    def _try_clear_expired_ratelimits(self) -> None:
+        if len(self._buckets) < 256:
+            return
+
+        keys = [key for key, bucket in self._buckets.items() if bucket.is_inactive()]
+        for key in keys:
+            del self._buckets[key]
+
+    def get_ratelimit(self, key: str) -> Ratelimit:
+        try:
+            value = self._buckets[key]
+        except KeyError:
+            self._buckets[key] = value = Ratelimit(self.loop)
+            self._try_clear_expired_ratelimits()
+        return value
+
+    def _get_ratelimit_key(self, route: Route) -> str:
+        try:
+            bucket_hash = self._bucket_hashes[route.key]
+        except KeyError:
+            return f'{route.key}:{route.major_parameters}'
+        else:
+            return f'{bucket_hash}:{route.major_parameters}'
+
+    async def _acquire_ratelimit(self, route: Route, priority: RequestPriority, deadline: Optional[float]) -> Ratelimit:
+        while True:
+            ratelimit = self.get_ratelimit(self._get_ratelimit_key(route))
+            await ratelimit.acquire(priority, deadline)
+
+            # While waiting, the route might have discovered that it shares its
+            # bucket with another route. In that case the budget of that bucket
+            # has to be used instead of the one this request was queued on.
+            if self._buckets.get(self._get_ratelimit_key(route)) is ratelimit:
+                return ratelimit
+
+            ratelimit.release(sent=False)
+
+    def _update_bucket_hash(self, route: Route, ratelimit: Ratelimit, bucket_hash: str) -> None:
+        route_key = route.key
+        old_hash = self._bucket_hashes.get(route_key)
+        if old_hash == bucket_hash:
+            return
+
+        self._bucket_hashes[route_key] = bucket_hash
+        if old_hash is not None:
+            _log.debug('A route (%s) has changed hashes: %s -> %s.', route_key, old_hash, bucket_hash)
+            return
+
+        _log.debug('%s has found its initial rate limit bucket hash (%s).', route_key, bucket_hash)
+        key = f'{route_key}:{route.major_parameters}'
+        if self._buckets.get(key) is ratelimit:
+            del self._buckets[key]
+
+        # Routes that share a bucket hash share a single budget, so if another
+        # route already discovered this bucket then future requests will use that one.
+        self._buckets.setdefault(f'{bucket_hash}:{route.major_parameters}', ratelimit)
+
+    def _get_request_key(self, route: Route, kwargs: Dict[str, Any]) -> Optional[Tuple[str, Any]]:
+        # Only idempotent requests without a body are safe to share
+        if kwargs.keys() - {'params'}:
+            return None
+
+        params = kwargs.get('params')
+        if not params:
+            return (route.url, None)
+
+        try:
+            key = (route.url, frozenset(params.items()))
+            hash(key)
+        except (AttributeError, TypeError):
+            return None
+        return key
+
+    def _inflight_done(self, key: Tuple[str, Any], task: asyncio.Task[Any]) -> None:
+        if self._inflight is not None:
+            self._inflight.pop(key, None)
+
+        # Every waiter might have been cancelled, in which case nobody retrieves the
+        # exception and asyncio would complain about it
+        if not task.cancelled():
+            task.exception()
+
+    @contextmanager
+    def priority(self, priority: RequestPriority) -> Generator[None, None, None]:
+        """Sets the priority of every request made inside the ``with`` block.
+
+        This only applies to the current task and the tasks it creates.
+        """
+        token = _request_priority.set(priority)
+        try:
+            yield
+        finally:
+            _request_priority.reset(token)
+
     async def request(
         self,
         route: Route,
         *,
         files: Optional[Sequence[File]] = None,
         form: Optional[Iterable[Dict[str, Any]]] = None,
+        priority: Optional[RequestPriority] = None,
+        deadline: Optional[datetime.datetime] = None,
+        **kwargs: Any,
+    ) -> Any:
+        if priority is None:
+            priority = _request_priority.get() or route.priority
+
+        cache = self.response_cache
+        if route.method != 'GET' or files or form:
+            try:
+                return await self._request(route, priority, deadline, files=files, form=form, **kwargs)
+            finally:
+                # a write to a resource makes cached reads of it stale
+                if cache is not None:
+                    cache.invalidate_url(route.url)
+
+        inflight = self._inflight
+        if cache is None and inflight is None:
+            return await self._request(route, priority, deadline, **kwargs)
+
+        key = self._get_request_key(route, kwargs)
+        if key is None:
+            return await self._request(route, priority, deadline, **kwargs)
+
+        if cache is not None:
+            data = cache.get(key)
+            if data is not MISSING:
+                _log.debug('%s %s has been served from the response cache.', route.method, route.url)
+                if self.stats is not None:
+                    self.stats.get(route.key).cache_hits += 1
+                return data
+
+        if inflight is None or deadline is not None:
+            # a request with a deadline can't wait on one that doesn't have it
+            data = await self._request(route, priority, deadline, **kwargs)
+        else:
+            try:
+                task = inflight[key]
+            except KeyError:
+                # The request runs in its own task so that a cancelled caller
+                # does not cancel it for everyone else waiting on the result
+                task = asyncio.create_task(self._request(route, priority, None, **kwargs))
+                inflight[key] = task
+                task.add_done_callback(lambda t: self._inflight_done(key, t))
+            else:
+                _log.debug('Coalescing %s %s with an identical request in flight.', route.method, route.url)
+                if self.stats is not None:
+                    self.stats.get(route.key).coalesced += 1
+
+            data = await asyncio.shield(task)
+
+        if cache is not None:
+            cache.set(route.key, key, data)
+        return data
+
+    async def _request(
+        self,
+        route: Route,
+        priority: RequestPriority,
+        deadline: Optional[datetime.datetime],
+        *,
+        files: Optional[Sequence[File]] = None,
+        form: Optional[Iterable[Dict[str, Any]]] = None,
         **kwargs: Any,
     ) -> Any:
-        bucket = route.bucket
         method = route.method
         url = route.url
-
-        lock = self._locks.get(bucket)
-        if lock is None:
-            lock = asyncio.Lock()
-            if bucket is not None:
-                self._locks[bucket] = lock
+        route_key = route.key
+        if self.api_base_url is not None:
+            url = self.api_base_url + url[len(Route.BASE) :]
 
         # header creation
         headers: Dict[str, str] = {
@@ -250,14 +1260,65 @@ class HTTPClient:
         if self.proxy_auth is not None:
             kwargs['proxy_auth'] = self.proxy_auth
 
+        stats = self.stats.get(route_key) if self.stats is not None else None
+        if stats is not None:
+            stats.requests += 1
+
+        # the deadline in terms of the event loop's clock
+        expires: Optional[float] = None
+        if deadline is not None:
+            expires = self.loop.time() + (deadline.astimezone() - utils.utcnow()).total_seconds()
+
+        def deadline_exceeded() -> DeadlineExceeded:
+            _log.debug('%s %s has been dropped as it could not be sent before its deadline.', method, url)
+            if stats is not None:
+                stats.deadline_exceeded += 1
+            return DeadlineExceeded(deadline)  # type: ignore
+
+        if expires is not None and expires <= self.loop.time():
+            raise deadline_exceeded()
+
+        breaker = self._get_circuit_breaker(route_key)
+        probe = False
+        if breaker is not None:
+            if not breaker.allow():
+                if stats is not None:
+                    stats.short_circuited += 1
+                raise CircuitOpen(route_key, breaker.retry_after())
+            probe = breaker.state is CircuitState.half_open
+
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
+
         if not self._global_over.is_set():
             # wait until the global lock is complete
-            await self._global_over.wait()
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._global_over.wait(), None if expires is None else expires - self.loop.time())
+            except asyncio.TimeoutError:
+                raise deadline_exceeded() from None
+            if stats is not None:
+                stats.global_wait.observe(time.perf_counter() - start)
 
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
-        await lock.acquire()
-        with MaybeUnlock(lock) as maybe_lock:
+        start = time.perf_counter()
+        try:
+            ratelimit = await self._acquire_ratelimit(route, priority, expires)
+        except asyncio.TimeoutError:
+            raise deadline_exceeded() from None
+        if stats is not None:
+            stats.bucket_wait.observe(time.perf_counter() - start)
+
+        # whether the bucket slot has been used by a request reaching Discord
+        sent = False
+        try:
+            # the breaker might have opened while this request was queued
+            if breaker is not None and breaker.state is not CircuitState.closed and not probe:
+                if stats is not None:
+                    stats.short_circuited += 1
+                raise CircuitOpen(route_key, breaker.retry_after())
+
             for tries in range(5):
                 if files:
                     for f in files:
@@ -269,21 +1330,71 @@ class HTTPClient:
                         form_data.add_field(**params)
                     kwargs['data'] = form_data
 
+                if self.global_ratelimit is not None:
+                    start = time.perf_counter()
+                    try:
+                        await self.global_ratelimit.block(priority, expires)
+                    except asyncio.TimeoutError:
+                        raise deadline_exceeded() from None
+                    if stats is not None:
+                        stats.pacing_wait.observe(time.perf_counter() - start)
+
+                backend = self.ratelimit_backend
+                if backend is not None:
+                    start = time.perf_counter()
+                    try:
+                        await asyncio.wait_for(
+                            backend.acquire(route.shared_bucket),
+                            None if expires is None else expires - self.loop.time(),
+                        )
+                    except asyncio.TimeoutError:
+                        raise deadline_exceeded() from None
+                    if stats is not None:
+                        stats.bucket_wait.observe(time.perf_counter() - start)
+
+                if stats is not None and tries:
+                    stats.retries += 1
+
                 try:
+                    start = time.perf_counter()
+                    sent = True
                     async with self.__session.request(method, url, **kwargs) as response:
                         _log.debug('%s %s with %s has returned %s', method, url, kwargs.get('data'), response.status)
 
                         # even errors have text involved in them so this is safe to call
                         data = await json_or_text(response)
+                        if stats is not None:
+                            stats.latency.observe(time.perf_counter() - start)
+                            stats.record_status(response.status)
+
+                        if breaker is not None:
+                            if response.status >= 500:
+                                breaker.record_failure()
+                            else:
+                                breaker.record_success()
+
+                        # map the route to the bucket Discord says it belongs to
+                        discord_hash = response.headers.get('X-Ratelimit-Bucket')
+                        if discord_hash is not None:
+                            self._update_bucket_hash(route, ratelimit, discord_hash)
 
                         # check if we have rate limit header information
-                        remaining = response.headers.get('X-Ratelimit-Remaining')
-                        if remaining == '0' and response.status != 429:
-                            # we've depleted our current bucket
-                            delta = utils._parse_ratelimit_header(response, use_clock=self.use_clock)
-                            _log.debug('A rate limit bucket has been exhausted (bucket: %s, retry: %s).', bucket, delta)
-                            maybe_lock.defer()
-                            self.loop.call_later(delta, lock.release)
+                        if 'X-Ratelimit-Remaining' in response.headers and response.status != 429:
+                            ratelimit.update(response, use_clock=self.use_clock)
+                            if backend is not None:
+                                await backend.update(
+                                    route.shared_bucket,
+                                    int(response.headers.get('X-Ratelimit-Limit', 1)),
+                                    int(response.headers['X-Ratelimit-Remaining']),
+                                    ratelimit.reset_after,
+                                )
+                            if ratelimit.remaining == 0:
+                                # we've depleted our current bucket
+                                _log.debug(
+                                    'A rate limit bucket has been exhausted (bucket: %s, retry: %s).',
+                                    discord_hash or route_key,
+                                    ratelimit.reset_after,
+                                )
 
                         # the request was successful so just return the text/json
                         if 300 > response.status >= 200:
@@ -300,13 +1411,30 @@ class HTTPClient:
 
                             # sleep a bit
                             retry_after: float = data['retry_after']
-                            _log.warning(fmt, retry_after, bucket)
+                            _log.warning(fmt, retry_after, discord_hash or route_key)
 
                             # check if it's a global rate limit
                             is_global = data.get('global', False)
                             if is_global:
                                 _log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
                                 self._global_over.clear()
+                                if self.global_ratelimit is not None:
+                                    self.global_ratelimit.drain()
+                            else:
+                                # hold back everyone else queued on this bucket as well
+                                ratelimit.exhaust(retry_after)
+
+                            if backend is not None:
+                                await backend.exhaust(route.shared_bucket, retry_after, is_global=is_global)
+
+                            if stats is not None:
+                                stats.ratelimited += 1
+                                stats.ratelimit_sleep += retry_after
+
+                            if expires is not None and self.loop.time() + retry_after > expires:
+                                if is_global:
+                                    self.loop.call_later(retry_after, self._global_over.set)
+                                raise deadline_exceeded()
 
                             await asyncio.sleep(retry_after)
                             _log.debug('Done sleeping for the rate limit. Retrying...')
@@ -321,6 +1449,10 @@ class HTTPClient:
 
                         # we've received a 500, 502, or 504, unconditional retry
                         if response.status in {500, 502, 504}:
+                            if expires is not None and self.loop.time() + 1 + tries * 2 > expires:
+                                raise DiscordServerError(response, data)
+                            if not self._can_retry(breaker):
+                                raise DiscordServerError(response, data)
                             await asyncio.sleep(1 + tries * 2)
                             continue
 
@@ -338,6 +1470,10 @@ class HTTPClient:
                 except OSError as e:
                     # Connection reset by peer
                     if tries < 4 and e.errno in (54, 10054):
+                        if breaker is not None:
+                            breaker.record_failure()
+                        if not self._can_retry(breaker):
+                            raise
                         await asyncio.sleep(1 + tries * 2)
                         continue
                     raise
@@ -350,17 +1486,116 @@ class HTTPClient:
                 raise HTTPException(response, data)
 
             raise RuntimeError('Unreachable code in HTTP handling')
+        finally:
+            ratelimit.release(sent)
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        """Returns a snapshot of the HTTP statistics as a plain :class:`dict`.
+
+        This contains the per-route statistics, the state of every rate limit
+        bucket currently being tracked and the fill level of the global rate limit.
+        """
+        buckets = {}
+        for key, bucket in self._buckets.items():
+            # the last major parameter is the webhook token, which should not be exported
+            name = key.rsplit(':', 1)[0]
+            buckets[name] = {
+                'limit': bucket.limit,
+                'remaining': bucket.remaining,
+                'outgoing': bucket.outgoing,
+                'pending': bucket._pending.depths(),
+                'reset_after': bucket.reset_after,
+            }
+
+        retry_budget = None
+        if self.retry_budget is not None:
+            retry_budget = {'requests': self.retry_budget.requests, 'retries': self.retry_budget.retries}
+
+        return {
+            'routes': self.stats.snapshot() if self.stats is not None else {},
+            'buckets': buckets,
+            'bucket_hashes': dict(self._bucket_hashes),
+            'circuits': {key: breaker.state.name for key, breaker in self._circuit_breakers.items()},
+            'retry_budget': retry_budget,
+            'global': {
+                'tokens': self.global_ratelimit.tokens if self.global_ratelimit is not None else None,
+                'ratelimited': not self._global_over.is_set(),
+            },
+        }
 
     async def get_from_cdn(self, url: str) -> bytes:
-        async with self.__session.get(url) as resp:
-            if resp.status == 200:
-                return await resp.read()
-            elif resp.status == 404:
-                raise NotFound(resp, 'asset not found')
-            elif resp.status == 403:
-                raise Forbidden(resp, 'cannot retrieve asset')
-            else:
-                raise HTTPException(resp, 'failed to get asset')
+        async with self._download_slot():
+            async with self.__session.get(url) as resp:
+                if resp.status == 200:
+                    return await resp.read()
+                elif resp.status == 404:
+                    raise NotFound(resp, 'asset not found')
+                elif resp.status == 403:
+                    raise Forbidden(resp, 'cannot retrieve asset')
+                else:
+                    raise HTTPException(resp, 'failed to get asset')
+
+    @asynccontextmanager
+    async def _download_slot(self) -> AsyncIterator[None]:
+        if self._download_semaphore is None:
+            yield
+        else:
+            async with self._download_semaphore:
+                yield
+
+    async def stream_from_cdn(
+        self,
+        url: str,
+        *,
+        offset: int = 0,
+        size: Optional[int] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncIterator[bytes]:
+        if size == 0:
+            return
+
+        headers = {}
+        if offset or size is not None:
+            end = '' if size is None else offset + size - 1
+            headers['Range'] = f'bytes={offset}-{end}'
+
+        async with self._download_slot():
+            async with self.__session.get(url, headers=headers) as resp:
+                if resp.status == 416:
+                    # the offset is past the end, so there is nothing left to read
+                    return
+                elif resp.status == 404:
+                    raise NotFound(resp, 'asset not found')
+                elif resp.status == 403:
+                    raise Forbidden(resp, 'cannot retrieve asset')
+                elif resp.status not in (200, 206):
+                    raise HTTPException(resp, 'failed to get asset')
+
+                if resp.status == 206:
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        yield chunk
+                    return
+
+                # The range was ignored and the whole body is being sent
+                skip = offset
+                remaining = size
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    if skip:
+                        if len(chunk) <= skip:
+                            skip -= len(chunk)
+                            continue
+                        chunk = chunk[skip:]
+                        skip = 0
+
+                    if remaining is not None:
+                        chunk = chunk[:remaining]
+                        remaining -= len(chunk)
+
+                    if chunk:
+                        yield chunk
+
+                    if remaining == 0:
+                        return
 
     # state management
 
@@ -423,6 +1658,7 @@ class HTTPClient:
         message_reference: Optional[message.MessageReference] = None,
         stickers: Optional[List[sticker.StickerItem]] = None,
         components: Optional[List[components.Component]] = None,
+        deadline: Optional[datetime.datetime] = None,
     ) -> Response[message.Message]:
         r = Route('POST', '/channels/{channel_id}/messages', channel_id=channel_id)
         payload = {}
@@ -454,7 +1690,7 @@ class HTTPClient:
         if stickers:
             payload['sticker_ids'] = stickers
 
-        return self.request(r, json=payload)
+        return self.request(r, json=payload, deadline=deadline)
 
     def send_typing(self, channel_id: Snowflake) -> Response[None]:
         return self.request(Route('POST', '/channels/{channel_id}/typing', channel_id=channel_id))
@@ -473,6 +1709,7 @@ class HTTPClient:
         message_reference: Optional[message.MessageReference] = None,
         stickers: Optional[List[sticker.StickerItem]] = None,
         components: Optional[List[components.Component]] = None,
+        deadline: Optional[datetime.datetime] = None,
     ) -> Response[message.Message]:
         form = []
 
@@ -516,7 +1753,7 @@ class HTTPClient:
                     }
                 )
 
-        return self.request(route, form=form, files=files)
+        return self.request(route, form=form, files=files, deadline=deadline)
 
     def send_files(
         self,
@@ -532,6 +1769,7 @@ class HTTPClient:
         message_reference: Optional[message.MessageReference] = None,
         stickers: Optional[List[sticker.StickerItem]] = None,
         components: Optional[List[components.Component]] = None,
+        deadline: Optional[datetime.datetime] = None,
     ) -> Response[message.Message]:
         r = Route('POST', '/channels/{channel_id}/messages', channel_id=channel_id)
         return self.send_multipart_helper(
@@ -546,6 +1784,7 @@ class HTTPClient:
             message_reference=message_reference,
             stickers=stickers,
             components=components,
+            deadline=deadline,
         )
 
     def delete_message(
@@ -564,9 +1803,16 @@ class HTTPClient:
 
         return self.request(r, json=payload, reason=reason)
 
-    def edit_message(self, channel_id: Snowflake, message_id: Snowflake, **fields: Any) -> Response[message.Message]:
+    def edit_message(
+        self,
+        channel_id: Snowflake,
+        message_id: Snowflake,
+        *,
+        deadline: Optional[datetime.datetime] = None,
+        **fields: Any,
+    ) -> Response[message.Message]:
         r = Route('PATCH', '/channels/{channel_id}/messages/{message_id}', channel_id=channel_id, message_id=message_id)
-        return self.request(r, json=fields)
+        return self.request(r, json=fields, deadline=deadline)
 
     def add_reaction(self, channel_id: Snowflake, message_id: Snowflake, emoji: str) -> Response[None]:
         r = Route(
@@ -1897,28 +3143,29 @@ class HTTPClient:
     def application_info(self) -> Response[appinfo.AppInfo]:
         return self.request(Route('GET', '/oauth2/applications/@me'))
 
-    async def get_gateway(self, *, encoding: str = 'json', zlib: bool = True) -> str:
+    @staticmethod
+    def _format_gateway(url: str, encoding: str, compress: Optional[str]) -> str:
+        value = f'{url}?encoding={encoding}&v=9'
+        if compress is not None:
+            value += f'&compress={compress}'
+        return value
+
+    async def get_gateway(self, *, encoding: str = 'json', compress: Optional[str] = 'zlib-stream') -> str:
         try:
             data = await self.request(Route('GET', '/gateway'))
         except HTTPException as exc:
             raise GatewayNotFound() from exc
-        if zlib:
-            value = '{0}?encoding={1}&v=9&compress=zlib-stream'
-        else:
-            value = '{0}?encoding={1}&v=9'
-        return value.format(data['url'], encoding)
+        return self._format_gateway(data['url'], encoding, compress)
 
-    async def get_bot_gateway(self, *, encoding: str = 'json', zlib: bool = True) -> Tuple[int, str]:
+    async def get_bot_gateway(
+        self, *, encoding: str = 'json', compress: Optional[str] = 'zlib-stream'
+    ) -> Tuple[int, str, gateway.SessionStartLimit]:
         try:
             data = await self.request(Route('GET', '/gateway/bot'))
         except HTTPException as exc:
             raise GatewayNotFound() from exc
 
-        if zlib:
-            value = '{0}?encoding={1}&v=9&compress=zlib-stream'
-        else:
-            value = '{0}?encoding={1}&v=9'
-        return data['shards'], value.format(data['url'], encoding)
+        return data['shards'], self._format_gateway(data['url'], encoding, compress), data['session_start_limit']
 
     def get_user(self, user_id: Snowflake) -> Response[user.User]:
         return self.request(Route('GET', '/users/{user_id}', user_id=user_id))
@@ -38,7 +38,7 @@ from .member import Member
 from .message import Message, Attachment
 from .object import Object
 from .permissions import Permissions
-from .webhook.async_ import async_context, Webhook, handle_message_parameters
+from .webhook.async_ import InteractionWebhookAdapter, Webhook, handle_message_parameters
 
 __all__ = (
     'Interaction',
@@ -113,6 +113,7 @@ class Interaction:
         '_permissions',
         '_state',
         '_session',
+        '_adapter',
         '_original_message',
         '_cs_response',
         '_cs_followup',
@@ -122,6 +123,7 @@ class Interaction:
     def __init__(self, *, data: InteractionPayload, state: ConnectionState):
         self._state: ConnectionState = state
         self._session: ClientSession = state.http._HTTPClient__session
+        self._adapter: InteractionWebhookAdapter = InteractionWebhookAdapter(state.http)
         self._original_message: Optional[InteractionMessage] = None
         self._from_data(data)
 
@@ -206,7 +208,9 @@ class Interaction:
             'type': 3,
             'token': self.token,
         }
-        return Webhook.from_state(data=payload, state=self._state)
+        webhook = Webhook.from_state(data=payload, state=self._state)
+        webhook._adapter = self._adapter
+        return webhook
 
     async def original_message(self) -> InteractionMessage:
         """|coro|
@@ -240,7 +244,7 @@ class Interaction:
         if channel is None:
             raise ClientException('Channel for message could not be resolved')
 
-        adapter = async_context.get()
+        adapter = self._adapter
         data = await adapter.get_original_interaction_response(
             application_id=self.application_id,
             token=self.token,
@@ -321,7 +325,7 @@ class Interaction:
             allowed_mentions=allowed_mentions,
             previous_allowed_mentions=previous_mentions,
         )
-        adapter = async_context.get()
+        adapter = self._adapter
         data = await adapter.edit_original_interaction_response(
             self.application_id,
             self.token,
@@ -352,7 +356,7 @@ class Interaction:
         Forbidden
             Deleted a message that is not yours.
         """
-        adapter = async_context.get()
+        adapter = self._adapter
         await adapter.delete_original_interaction_response(
             self.application_id,
             self.token,
@@ -419,7 +423,7 @@ class InteractionResponse:
                 data = {'flags': 64}
 
         if defer_type:
-            adapter = async_context.get()
+            adapter = parent._adapter
             await adapter.create_interaction_response(
                 parent.id, parent.token, session=parent._session, type=defer_type, data=data
             )
@@ -444,7 +448,7 @@ class InteractionResponse:
 
         parent = self._parent
         if parent.type is InteractionType.ping:
-            adapter = async_context.get()
+            adapter = parent._adapter
             await adapter.create_interaction_response(
                 parent.id, parent.token, session=parent._session, type=InteractionResponseType.pong.value
             )
@@ -522,7 +526,7 @@ class InteractionResponse:
             payload['components'] = view.to_components()
 
         parent = self._parent
-        adapter = async_context.get()
+        adapter = parent._adapter
         await adapter.create_interaction_response(
             parent.id,
             parent.token,
@@ -617,7 +621,7 @@ class InteractionResponse:
             else:
                 payload['components'] = view.to_components()
 
-        adapter = async_context.get()
+        adapter = parent._adapter
         await adapter.create_interaction_response(
             parent.id,
             parent.token,
@@ -28,8 +28,9 @@ import asyncio
 import datetime
 import re
 import io
+import os
 from os import PathLike
-from typing import Dict, TYPE_CHECKING, Union, List, Optional, Any, Callable, Tuple, ClassVar, Optional, overload, TypeVar, Type
+from typing import Dict, TYPE_CHECKING, Union, List, Optional, Any, AsyncIterator, Callable, Tuple, ClassVar, Optional, overload, TypeVar, Type
 
 from . import utils
 from .reaction import Reaction
@@ -182,11 +183,14 @@ class Attachment(Hashable):
         *,
         seek_begin: bool = True,
         use_cached: bool = False,
+        resume: bool = False,
     ) -> int:
         """|coro|
 
         Saves this attachment into a file-like object.
 
+        The attachment is written in chunks as it is downloaded.
+
         Parameters
         -----------
         fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
@@ -203,6 +207,12 @@ class Attachment(Hashable):
             after the message is deleted. Note that this can still fail to download
             deleted attachments if too much time has passed and it does not work
             on some types of attachments.
+        resume: :class:`bool`
+            Whether to continue a previous download if a filename is passed and
+            the file already exists. Only the missing part of the attachment is
+            downloaded and appended to the file.
+
+            .. versionadded:: 2.0
 
         Raises
         --------
@@ -216,15 +226,77 @@ class Attachment(Hashable):
         :class:`int`
             The number of bytes written.
         """
-        data = await self.read(use_cached=use_cached)
+        written = 0
         if isinstance(fp, io.BufferedIOBase):
-            written = fp.write(data)
+            async for chunk in self.stream(use_cached=use_cached):
+                written += fp.write(chunk)
             if seek_begin:
                 fp.seek(0)
             return written
         else:
-            with open(fp, 'wb') as f:
-                return f.write(data)
+            offset = os.path.getsize(fp) if resume and os.path.exists(fp) else 0
+            if offset and offset >= self.size:
+                # the previous download was complete
+                return 0
+
+            with open(fp, 'ab' if offset else 'wb') as f:
+                async for chunk in self.stream(use_cached=use_cached, offset=offset):
+                    written += f.write(chunk)
+            return written
+
+    async def stream(
+        self,
+        *,
+        use_cached: bool = False,
+        offset: int = 0,
+        size: Optional[int] = None,
+        chunk_size: int = 65536,
+    ) -> AsyncIterator[bytes]:
+        """Retrieves the content of this attachment in chunks as they are downloaded.
+
+        This is useful for large attachments that should not be held in memory as a whole.
+
+        .. versionadded:: 2.0
+
+        Examples
+        ---------
+
+        Usage ::
+
+            with open(attachment.filename, 'wb') as f:
+                async for chunk in attachment.stream():
+                    f.write(chunk)
+
+        Parameters
+        -----------
+        use_cached: :class:`bool`
+            Whether to use :attr:`proxy_url` rather than :attr:`url` when downloading
+            the attachment.
+        offset: :class:`int`
+            The position in the attachment to start reading from.
+        size: Optional[:class:`int`]
+            The maximum number of bytes to read. If ``None``, then
+            the attachment is read until the end.
+        chunk_size: :class:`int`
+            The maximum size of a single chunk.
+
+        Raises
+        ------
+        HTTPException
+            Downloading the attachment failed.
+        Forbidden
+            You do not have permissions to access this attachment
+        NotFound
+            The attachment was deleted.
+
+        Yields
+        -------
+        :class:`bytes`
+            The next chunk of the attachment.
+        """
+        url = self.proxy_url if use_cached else self.url
+        async for chunk in self._http.stream_from_cdn(url, offset=offset, size=size, chunk_size=chunk_size):
+            yield chunk
 
     async def read(self, *, use_cached: bool = False) -> bytes:
         """|coro|
@@ -1157,6 +1229,7 @@ class Message(Hashable):
         delete_after: Optional[float] = ...,
         allowed_mentions: Optional[AllowedMentions] = ...,
         view: Optional[View] = ...,
+        deadline: Optional[datetime.datetime] = ...,
     ) -> Message:
         ...
 
@@ -1171,6 +1244,7 @@ class Message(Hashable):
         delete_after: Optional[float] = ...,
         allowed_mentions: Optional[AllowedMentions] = ...,
         view: Optional[View] = ...,
+        deadline: Optional[datetime.datetime] = ...,
     ) -> Message:
         ...
 
@@ -1184,6 +1258,7 @@ class Message(Hashable):
         delete_after: Optional[float] = None,
         allowed_mentions: Optional[AllowedMentions] = MISSING,
         view: Optional[View] = MISSING,
+        deadline: Optional[datetime.datetime] = None,
     ) -> Message:
         """|coro|
 
@@ -1231,6 +1306,11 @@ class Message(Hashable):
         view: Optional[:class:`~discord.ui.View`]
             The updated view to update this message with. If ``None`` is passed then
             the view is removed.
+        deadline: Optional[:class:`datetime.datetime`]
+            If provided, the message is not edited if the edit cannot be sent before
+            this time. Naive datetimes are assumed to be local time.
+
+            .. versionadded:: 2.0
 
         Raises
         -------
@@ -1241,6 +1321,8 @@ class Message(Hashable):
             edited a message's content or embed that isn't yours.
         ~discord.InvalidArgument
             You specified both ``embed`` and ``embeds``
+        ~discord.DeadlineExceeded
+            The edit could not be sent before the ``deadline``.
         """
 
         payload: Dict[str, Any] = {}
@@ -1286,7 +1368,7 @@ class Message(Hashable):
             else:
                 payload['components'] = []
 
-        data = await self._state.http.edit_message(self.channel.id, self.id, **payload)
+        data = await self._state.http.edit_message(self.channel.id, self.id, deadline=deadline, **payload)
         message = Message(state=self._state, channel=self.channel, data=data)
 
         if view and not view.is_finished():
@@ -1746,6 +1828,11 @@ class PartialMessage(Hashable):
             The updated view to update this message with. If ``None`` is passed then
             the view is removed.
 
+            .. versionadded:: 2.0
+        deadline: Optional[:class:`datetime.datetime`]
+            If provided, the message is not edited if the edit cannot be sent before
+            this time. Naive datetimes are assumed to be local time.
+
             .. versionadded:: 2.0
 
         Raises
@@ -1757,6 +1844,8 @@ class PartialMessage(Hashable):
         Forbidden
             Tried to suppress a message without permissions or
             edited a message's content or embed that isn't yours.
+        ~discord.DeadlineExceeded
+            The edit could not be sent before the ``deadline``.
 
         Returns
         ---------
@@ -1790,6 +1879,7 @@ class PartialMessage(Hashable):
             fields['flags'] = flags.value
 
         delete_after = fields.pop('delete_after', None)
+        deadline = fields.pop('deadline', None)
 
         try:
             allowed_mentions = fields.pop('allowed_mentions')
@@ -1816,7 +1906,7 @@ class PartialMessage(Hashable):
                 fields['components'] = []
 
         if fields:
-            data = await self._state.http.edit_message(self.channel.id, self.id, **fields)
+            data = await self._state.http.edit_message(self.channel.id, self.id, deadline=deadline, **fields)
 
         if delete_after is not None:
             await self.delete(delay=delete_after)
@@ -0,0 +1,191 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from . import utils
+
+__all__ = ('LoopStall',)
+
+
+class LoopStall:
+    """Represents a time the event loop was blocked for longer than the
+    ``loop_lag_threshold`` of the :class:`Client`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    duration: :class:`float`
+        How long the event loop was blocked, in seconds.
+    task: Optional[:class:`str`]
+        The name of the task that was running while the loop was blocked,
+        e.g. ``'discord.py: on_message'``, or ``None`` if it was not a task or
+        the stall was too short to be sampled.
+    stack: Optional[:class:`str`]
+        The stack of the event loop thread sampled while it was blocked, or
+        ``None`` if the stall was too short to be sampled.
+    timestamp: :class:`datetime.datetime`
+        When the stall ended, in UTC.
+    """
+
+    __slots__ = ('duration', 'task', 'stack', 'timestamp')
+
+    def __init__(self, duration: float, task: Optional[str], stack: Optional[str]) -> None:
+        self.duration: float = duration
+        self.task: Optional[str] = task
+        self.stack: Optional[str] = stack
+        self.timestamp: datetime.datetime = utils.utcnow()
+
+    def __repr__(self) -> str:
+        return f'<LoopStall duration={self.duration:.3f} task={self.task!r}>'
+
+
+class LoopMonitor:
+    # samples kept for the percentiles and stalls kept for the slowest ones
+    HISTORY = 1000
+    STALLS = 50
+
+    def __init__(self, dispatch: Callable[..., None], *, interval: float, threshold: float) -> None:
+        self.dispatch: Callable[..., None] = dispatch
+        self.interval: float = interval
+        self.threshold: float = threshold
+        self._lags: Deque[float] = deque(maxlen=self.HISTORY)
+        self._stalls: Deque[LoopStall] = deque(maxlen=self.STALLS)
+        self._stall_count: int = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._expected: float = 0.0
+        # written by the loop, read by the sampler thread
+        self._tick: int = 0
+        self._last_tick: float = 0.0
+        self._sample: Optional[Tuple[int, Optional[str], str]] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop: Optional[threading.Event] = None
+
+    def start(self) -> None:
+        if self._loop is not None:
+            return
+
+        self._loop = loop = asyncio.get_running_loop()
+        self._last_tick = time.perf_counter()
+        self._expected = loop.time() + self.interval
+        self._handle = loop.call_at(self._expected, self._measure)
+
+        self._stop = stop = threading.Event()
+        self._sampler = threading.Thread(
+            target=self._run_sampler,
+            args=(threading.get_ident(), stop),
+            name='discord.py: loop monitor',
+            daemon=True,
+        )
+        self._sampler.start()
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._stop is not None:
+            self._stop.set()
+        self._loop = self._sampler = self._stop = None
+
+    def _measure(self) -> None:
+        loop: Any = self._loop
+        now = loop.time()
+        lag = max(now - self._expected, 0.0)
+        self._lags.append(lag)
+
+        if lag >= self.threshold:
+            sample = self._sample
+            if sample is not None and sample[0] == self._tick:
+                stall = LoopStall(lag, sample[1], sample[2])
+            else:
+                stall = LoopStall(lag, None, None)
+            self._stalls.append(stall)
+            self._stall_count += 1
+            self.dispatch('loop_lag', stall)
+
+        self._tick += 1
+        self._last_tick = time.perf_counter()
+        self._expected = now + self.interval
+        self._handle = loop.call_at(self._expected, self._measure)
+
+    def _run_sampler(self, thread_id: int, stop: threading.Event) -> None:
+        # the loop is considered blocked once a measurement is later than the threshold
+        period = max(min(self.threshold, self.interval) / 2, 0.01)
+        while not stop.wait(period):
+            tick = self._tick
+            sample = self._sample
+            if sample is not None and sample[0] == tick:
+                continue
+            if time.perf_counter() - self._last_tick < self.interval + self.threshold:
+                continue
+
+            try:
+                frame = sys._current_frames()[thread_id]
+            except KeyError:
+                continue
+
+            task = None
+            try:
+                current = asyncio.current_task(self._loop)
+            except RuntimeError:
+                current = None
+            if current is not None:
+                task = current.get_name()
+
+            stack = ''.join(traceback.format_stack(frame))
+            self._sample = (tick, task, stack)
+
+    def stats(self) -> Dict[str, Any]:
+        lags = sorted(self._lags)
+
+        def percentile(q: float) -> Optional[float]:
+            if not lags:
+                return None
+            return lags[min(len(lags) - 1, int(q * len(lags)))]
+
+        return {
+            'interval': self.interval,
+            'threshold': self.threshold,
+            'samples': len(lags),
+            'p50': percentile(0.5),
+            'p90': percentile(0.9),
+            'p99': percentile(0.99),
+            'max': lags[-1] if lags else None,
+            'stalls': self._stall_count,
+            'slowest': self.slowest(),
+        }
+
+    def slowest(self, limit: int = 10) -> List[LoopStall]:
+        return sorted(self._stalls, key=lambda stall: stall.duration, reverse=True)[:limit]
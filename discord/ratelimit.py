@@ -0,0 +1,391 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+__all__ = (
+    'RateLimitBackend',
+    'RateLimitBroker',
+    'UnixSocketRateLimitBackend',
+)
+
+_log = logging.getLogger(__name__)
+
+
+class RateLimitBackend:
+    """The interface for sharing rate limits between :class:`Client` instances,
+    for example several processes running the same bot token.
+
+    Every request asks the backend for permission right before it is sent and
+    reports the rate limit information it got back. This is done on top of the
+    rate limit handling of the client itself, so a backend only has to account
+    for the requests made by other clients.
+
+    Buckets are identified by an opaque string made of the route and its major
+    parameters, which is the same for every client using the same token. Webhook
+    and interaction tokens are hashed. A bucket of ``None`` means the request only
+    counts towards the global rate limit.
+
+    .. versionadded:: 2.0
+    """
+
+    async def acquire(self, bucket: Optional[str]) -> None:
+        """|coro|
+
+        Waits until a request in ``bucket`` may be sent and accounts for it.
+        """
+        raise NotImplementedError
+
+    async def update(self, bucket: str, limit: int, remaining: int, reset_after: float) -> None:
+        """|coro|
+
+        Reports the rate limit headers of a response.
+        """
+        raise NotImplementedError
+
+    async def exhaust(self, bucket: Optional[str], retry_after: float, *, is_global: bool = False) -> None:
+        """|coro|
+
+        Reports a ``429`` response. No request in ``bucket``, or no request at all
+        if ``is_global`` is ``True``, should be sent for ``retry_after`` seconds.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """|coro|
+
+        Releases the resources held by the backend.
+        """
+        pass
+
+
+class _BrokerBucket:
+    __slots__ = ('limit', 'remaining', 'reset_at', 'window', 'last_used')
+
+    def __init__(self, now: float) -> None:
+        # until Discord tells us the limit, only let one request through
+        self.limit: int = 1
+        self.remaining: int = 1
+        self.reset_at: float = 0.0
+        self.window: float = 1.0
+        self.last_used: float = now
+
+
+class RateLimitBroker:
+    """A server that keeps track of the rate limits of several processes on one host.
+
+    The processes connect to it over a UNIX socket using :class:`UnixSocketRateLimitBackend`.
+    It can run in one of the bot's processes or in a process of its own, and keeps
+    per-bucket budgets as reported by Discord as well as a global requests per second budget.
+
+    This is not available on Windows.
+
+    .. versionadded:: 2.0
+
+    Example:
+
+    .. code-block:: python3
+
+        broker = discord.RateLimitBroker('/tmp/my-bot-ratelimits.sock')
+        await broker.start()
+        await broker.wait_closed()
+
+    Parameters
+    -----------
+    path: :class:`str`
+        The path of the UNIX socket to listen on.
+    rate: :class:`int`
+        The number of requests allowed per ``per`` seconds across every process.
+    per: :class:`float`
+        The period of the global rate limit, in seconds.
+    """
+
+    def __init__(self, path: str, *, rate: int = 50, per: float = 1.0) -> None:
+        self.path: str = path
+        self.rate: int = rate
+        self.per: float = per
+        self._buckets: Dict[str, _BrokerBucket] = {}
+        self._tokens: float = float(rate)
+        self._last: float = time.monotonic()
+        self._global_until: float = 0.0
+        self._last_prune: float = self._last
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """|coro|
+
+        Starts listening on the socket, replacing a stale socket file if needed.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        _log.info('Rate limit broker listening on %s.', self.path)
+
+    async def close(self) -> None:
+        """|coro|
+
+        Stops the broker.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    async def wait_closed(self) -> None:
+        """|coro|
+
+        Waits until the broker is closed.
+        """
+        if self._server is not None:
+            await self._server.serve_forever()
+
+    def _prune(self, now: float) -> None:
+        self._last_prune = now
+        stale = [key for key, bucket in self._buckets.items() if now - bucket.last_used > 300 and bucket.reset_at < now]
+        for key in stale:
+            del self._buckets[key]
+
+    def acquire(self, bucket_key: Optional[str]) -> float:
+        """Returns ``0`` and takes a slot if a request can be sent now,
+        otherwise the number of seconds to wait before asking again.
+        """
+        now = time.monotonic()
+        if now - self._last_prune > 60:
+            self._prune(now)
+
+        if now < self._global_until:
+            return self._global_until - now
+
+        bucket = None
+        if bucket_key is not None:
+            try:
+                bucket = self._buckets[bucket_key]
+            except KeyError:
+                bucket = self._buckets[bucket_key] = _BrokerBucket(now)
+
+            bucket.last_used = now
+            if now >= bucket.reset_at:
+                bucket.remaining = bucket.limit
+                bucket.reset_at = now + bucket.window
+            if bucket.remaining <= 0:
+                return bucket.reset_at - now
+
+        self._tokens = min(float(self.rate), self._tokens + (now - self._last) * self.rate / self.per)
+        self._last = now
+        if self._tokens < 1.0:
+            return (1.0 - self._tokens) * self.per / self.rate
+
+        self._tokens -= 1.0
+        if bucket is not None:
+            bucket.remaining -= 1
+        return 0.0
+
+    def update(self, bucket_key: str, limit: int, remaining: int, reset_after: float) -> None:
+        now = time.monotonic()
+        try:
+            bucket = self._buckets[bucket_key]
+        except KeyError:
+            bucket = self._buckets[bucket_key] = _BrokerBucket(now)
+
+        reset_at = now + reset_after
+        if now >= bucket.reset_at or reset_at > bucket.reset_at + 1.0:
+            # a new window started
+            bucket.remaining = remaining
+        else:
+            # other requests of this window might still be in flight
+            bucket.remaining = min(bucket.remaining, remaining)
+
+        bucket.limit = limit
+        bucket.reset_at = reset_at
+        bucket.window = max(bucket.window, reset_after)
+        bucket.last_used = now
+
+    def exhaust(self, bucket_key: Optional[str], retry_after: float, *, is_global: bool = False) -> None:
+        now = time.monotonic()
+        if is_global or bucket_key is None:
+            self._global_until = max(self._global_until, now + retry_after)
+            self._tokens = 0.0
+            return
+
+        try:
+            bucket = self._buckets[bucket_key]
+        except KeyError:
+            bucket = self._buckets[bucket_key] = _BrokerBucket(now)
+
+        bucket.remaining = 0
+        bucket.reset_at = max(bucket.reset_at, now + retry_after)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    msg = json.loads(line)
+                    op = msg['op']
+                    if op == 'acquire':
+                        wait = self.acquire(msg['bucket'])
+                        writer.write(json.dumps({'id': msg['id'], 'wait': wait}).encode('utf-8') + b'\n')
+                    elif op == 'update':
+                        self.update(msg['bucket'], msg['limit'], msg['remaining'], msg['reset_after'])
+                    elif op == 'exhaust':
+                        self.exhaust(msg['bucket'], msg['retry_after'], is_global=msg['global'])
+                except (ValueError, KeyError, TypeError):
+                    _log.warning('Rate limit broker received an invalid message: %r', line)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class UnixSocketRateLimitBackend(RateLimitBackend):
+    """A :class:`RateLimitBackend` that consults a :class:`RateLimitBroker` over a UNIX socket.
+
+    If the broker cannot be reached, requests are let through so the client keeps
+    working with only its own rate limit handling, and connecting is retried a
+    few seconds later.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    path: :class:`str`
+        The path of the broker's UNIX socket.
+    """
+
+    RETRY_DELAY = 5.0
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task[None]] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._retry_at: float = 0.0
+        self._next_id: int = 0
+        self._waiters: Dict[int, asyncio.Future[float]] = {}
+
+    async def _connect(self) -> bool:
+        if self._writer is not None:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            if self._writer is not None:
+                return True
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+            except OSError as exc:
+                _log.warning('Could not connect to the rate limit broker at %s: %s', self.path, exc)
+                self._retry_at = time.monotonic() + self.RETRY_DELAY
+                return False
+
+            self._read_task = asyncio.create_task(self._read_loop(self._reader))
+            return True
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                msg = json.loads(line)
+                future = self._waiters.pop(msg['id'], None)
+                if future is not None and not future.done():
+                    future.set_result(msg['wait'])
+        except (ConnectionError, ValueError, KeyError) as exc:
+            _log.warning('Lost the connection to the rate limit broker: %s', exc)
+        finally:
+            self._disconnect()
+
+    def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+        self._retry_at = time.monotonic() + self.RETRY_DELAY
+
+        # let the waiting requests through rather than stalling them
+        waiters, self._waiters = self._waiters, {}
+        for future in waiters.values():
+            if not future.done():
+                future.set_result(0.0)
+
+    async def _send(self, payload: Dict[str, Any]) -> bool:
+        if not await self._connect():
+            return False
+
+        try:
+            self._writer.write(json.dumps(payload).encode('utf-8') + b'\n')  # type: ignore
+        except (ConnectionError, AttributeError):
+            self._disconnect()
+            return False
+        return True
+
+    async def acquire(self, bucket: Optional[str]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._next_id += 1
+            request_id = self._next_id
+            future = self._waiters[request_id] = loop.create_future()
+            if not await self._send({'op': 'acquire', 'id': request_id, 'bucket': bucket}):
+                self._waiters.pop(request_id, None)
+                return
+
+            try:
+                wait = await future
+            finally:
+                self._waiters.pop(request_id, None)
+
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def update(self, bucket: str, limit: int, remaining: int, reset_after: float) -> None:
+        await self._send({'op': 'update', 'bucket': bucket, 'limit': limit, 'remaining': remaining, 'reset_after': reset_after})
+
+    async def exhaust(self, bucket: Optional[str], retry_after: float, *, is_global: bool = False) -> None:
+        await self._send({'op': 'exhaust', 'bucket': bucket, 'retry_after': retry_after, 'global': is_global})
+
+    async def close(self) -> None:
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        self._disconnect()
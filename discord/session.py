@@ -0,0 +1,136 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, NamedTuple, Optional
+
+__all__ = (
+    'GatewaySession',
+    'SessionStore',
+    'FileSessionStore',
+)
+
+_log = logging.getLogger(__name__)
+
+
+class GatewaySession(NamedTuple):
+    """Represents the state needed to RESUME a gateway session.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    shard_id: Optional[:class:`int`]
+        The shard ID of the session.
+    shard_count: Optional[:class:`int`]
+        The shard count the session was started with.
+    session_id: :class:`str`
+        The session ID.
+    sequence: Optional[:class:`int`]
+        The sequence number of the last event received.
+    resume_url: Optional[:class:`str`]
+        The URL to RESUME the session on, if Discord sent one.
+    """
+
+    shard_id: Optional[int]
+    shard_count: Optional[int]
+    session_id: str
+    sequence: Optional[int]
+    resume_url: Optional[str]
+
+
+class SessionStore:
+    """The interface for persisting gateway sessions so that a restarted
+    :class:`Client` can RESUME them instead of IDENTIFYing again.
+
+    The client saves every session when it is closed and periodically while
+    it is running, and loads them before connecting.
+
+    .. versionadded:: 2.0
+    """
+
+    async def load(self) -> List[GatewaySession]:
+        """|coro|
+
+        Returns the saved sessions.
+        """
+        raise NotImplementedError
+
+    async def save(self, sessions: List[GatewaySession]) -> None:
+        """|coro|
+
+        Saves the current sessions, replacing the ones saved before.
+        """
+        raise NotImplementedError
+
+
+class FileSessionStore(SessionStore):
+    """A :class:`SessionStore` that keeps the sessions in a JSON file.
+
+    The file is replaced atomically so a crash while saving does not lose
+    the previous sessions.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    path: :class:`str`
+        The path of the file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+
+    def _read(self) -> List[GatewaySession]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return []
+
+        return [GatewaySession(**entry) for entry in data['sessions']]
+
+    def _write(self, payload: Dict[str, Any]) -> None:
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fp:
+            json.dump(payload, fp)
+        os.replace(tmp, self.path)
+
+    async def load(self) -> List[GatewaySession]:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self._read)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            _log.warning('Could not load the gateway sessions from %s: %s', self.path, exc)
+            return []
+
+    async def save(self, sessions: List[GatewaySession]) -> None:
+        payload = {'sessions': [session._asdict() for session in sessions]}
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write, payload)
@@ -33,12 +33,15 @@ from .state import AutoShardedConnectionState
 from .client import Client
 from .backoff import ExponentialBackoff
 from .gateway import *
+from .gateway import GatewayRatelimiter, TransportCompression
+from .session import GatewaySession
 from .errors import (
     ClientException,
     HTTPException,
     GatewayNotFound,
     ConnectionClosed,
     PrivilegedIntentsRequired,
+    SessionStartLimitReached,
 )
 
 from .enums import Status
@@ -123,9 +126,9 @@ class Shard:
         if self._task is not None and not self._task.done():
             self._task.cancel()
 
-    async def close(self) -> None:
+    async def close(self, code: int = 1000) -> None:
         self._cancel_task()
-        await self.ws.close(code=1000)
+        await self.ws.close(code=code)
 
     async def disconnect(self) -> None:
         await self.close()
@@ -163,6 +166,7 @@ class Shard:
     async def worker(self) -> None:
         while not self._client.is_closed():
             try:
+                await self._client._wait_for_event_room()
                 await self.ws.poll_event()
             except ReconnectWebSocket as e:
                 etype = EventType.resume if e.resume else EventType.identify
@@ -289,6 +293,26 @@ class ShardInfo:
         """
         return self._parent.ws.is_ratelimited()
 
+    def compression_stats(self) -> Dict[str, Any]:
+        """Returns statistics about the gateway transport compression of this shard.
+
+        See :meth:`Client.compression_stats` for the keys.
+
+        .. versionadded:: 2.0
+        """
+        transport = self._parent.ws._transport
+        return TransportCompression.stats([transport] if transport else [])
+
+    def gateway_queue_depth(self) -> Dict[str, int]:
+        """Returns the number of gateway messages of this shard waiting for the
+        gateway rate limit, by lane.
+
+        See :meth:`Client.gateway_queue_depth` for the lanes.
+
+        .. versionadded:: 2.0
+        """
+        return self._parent.ws.queue_depth()
+
 
 class AutoShardedClient(Client):
     """A client similar to :class:`Client` except it handles the complications
@@ -311,6 +335,14 @@ class AutoShardedClient(Client):
     if this is used. By default, when omitted, the client will launch shards from
     0 to ``shard_count - 1``.
 
+    Shards are launched in batches of the ``max_concurrency`` reported by the
+    Bot Gateway endpoint, with :meth:`before_identify_hook` spacing out the batches.
+    If fewer IDENTIFYs than shards are left in the daily session start limit,
+    connecting raises :exc:`SessionStartLimitReached` instead.
+
+    .. versionchanged:: 2.0
+        Shards are launched in batches of ``max_concurrency``.
+
     Attributes
     ------------
     shard_ids: Optional[List[:class:`int`]]
@@ -351,6 +383,7 @@ class AutoShardedClient(Client):
             hooks=self._hooks,
             http=self.http,
             loop=self.loop,
+            consumes=self._consumes_event,
             **options,
         )
 
@@ -388,9 +421,29 @@ class AutoShardedClient(Client):
         """Mapping[int, :class:`ShardInfo`]: Returns a mapping of shard IDs to their respective info object."""
         return {shard_id: ShardInfo(parent, self.shard_count) for shard_id, parent in self.__shards.items()}
 
-    async def launch_shard(self, gateway: str, shard_id: int, *, initial: bool = False) -> None:
+    def _gateway_sessions(self) -> List[GatewaySession]:
+        return [
+            GatewaySession(shard_id, self.shard_count, parent.ws.session_id, parent.ws.sequence, parent.ws.resume_gateway_url)
+            for shard_id, parent in self.__shards.items()
+            if parent.ws.session_id is not None
+        ]
+
+    async def launch_shard(
+        self, gateway: str, shard_id: int, *, initial: bool = False, session: Optional[GatewaySession] = None
+    ) -> None:
         try:
-            coro = DiscordWebSocket.from_client(self, initial=initial, gateway=gateway, shard_id=shard_id)
+            if session is not None:
+                _log.info('Shard ID %s is resuming the stored session %s.', shard_id, session.session_id)
+                coro = DiscordWebSocket.from_client(
+                    self,
+                    gateway=self._resume_gateway(session) or gateway,
+                    shard_id=shard_id,
+                    session=session.session_id,
+                    sequence=session.sequence,
+                    resume=True,
+                )
+            else:
+                coro = DiscordWebSocket.from_client(self, initial=initial, gateway=gateway, shard_id=shard_id)
             ws = await asyncio.wait_for(coro, timeout=180.0)
         except Exception:
             _log.exception('Failed to connect for shard_id: %s. Retrying...', shard_id)
@@ -402,19 +455,49 @@ class AutoShardedClient(Client):
         ret.launch()
 
     async def launch_shards(self) -> None:
+        shard_count, gateway, session_start_limit = await self.http.get_bot_gateway(
+            encoding=self._gateway_encoding, compress=self._gateway_compression
+        )
         if self.shard_count is None:
-            self.shard_count, gateway = await self.http.get_bot_gateway()
-        else:
-            gateway = await self.http.get_gateway()
+            self.shard_count = shard_count
 
         self._connection.shard_count = self.shard_count
 
         shard_ids = self.shard_ids or range(self.shard_count)
         self._connection.shard_ids = shard_ids
 
-        for shard_id in shard_ids:
-            initial = shard_id == shard_ids[0]
-            await self.launch_shard(gateway, shard_id, initial=initial)
+        # stored sessions are RESUME'd and don't count towards the session start limit
+        sessions = await self._load_sessions()
+        to_identify = [shard_id for shard_id in shard_ids if shard_id not in sessions]
+
+        remaining = session_start_limit['remaining']
+        if remaining < len(to_identify):
+            raise SessionStartLimitReached(remaining, len(to_identify), session_start_limit['reset_after'] / 1000)
+
+        self._start_session_saver()
+        if sessions and not to_identify:
+            # without any READY, ready is dispatched once every shard is RESUMED
+            self._connection._pending_resumes = set(shard_ids)
+        resumed = [
+            self.launch_shard(gateway, shard_id, session=session)
+            for shard_id, session in sessions.items()
+            if shard_id in shard_ids
+        ]
+        if resumed:
+            await asyncio.gather(*resumed)
+
+        # shards with the same rate limit key (shard_id % max_concurrency) have to
+        # IDENTIFY one after another, shards with different keys may IDENTIFY together
+        max_concurrency = max(session_start_limit.get('max_concurrency', 1), 1)
+        buckets: Dict[int, List[int]] = {}
+        for shard_id in to_identify:
+            buckets.setdefault(shard_id % max_concurrency, []).append(shard_id)
+
+        for index in range(max(map(len, buckets.values()), default=0)):
+            batch = [bucket[index] for bucket in buckets.values() if index < len(bucket)]
+            _log.debug('Launching shards %s.', batch)
+            # the first batch is IDENTIFY'd right away, before_identify_hook spaces out the rest
+            await asyncio.gather(*(self.launch_shard(gateway, shard_id, initial=index == 0) for shard_id in batch))
 
         self._connection.shards_launched.set()
 
@@ -458,7 +541,13 @@ class AutoShardedClient(Client):
             except Exception:
                 pass
 
-        to_close = [asyncio.ensure_future(shard.close(), loop=self.loop) for shard in self.__shards.values()]
+        await self._stop_session_saver()
+        if self._loop_monitor is not None:
+            self._loop_monitor.stop()
+        if self._event_dispatcher is not None:
+            self._event_dispatcher.close()
+        code = 4000 if self._keeps_sessions else 1000
+        to_close = [asyncio.ensure_future(shard.close(code), loop=self.loop) for shard in self.__shards.values()]
         if to_close:
             await asyncio.wait(to_close)
 
@@ -544,3 +633,31 @@ class AutoShardedClient(Client):
         .. versionadded:: 1.6
         """
         return any(shard.ws.is_ratelimited() for shard in self.__shards.values())
+
+    def compression_stats(self) -> Dict[str, Any]:
+        """Returns statistics about the gateway transport compression.
+
+        This works like :meth:`Client.compression_stats` except the numbers are
+        summed up over every shard. For a single shard, consider
+        :meth:`ShardInfo.compression_stats`.
+
+        .. versionadded:: 2.0
+        """
+        transports = [shard.ws._transport for shard in self.__shards.values() if shard.ws._transport]
+        return TransportCompression.stats(transports)
+
+    def gateway_queue_depth(self) -> Dict[str, int]:
+        """Returns the number of gateway messages waiting for the gateway rate limit,
+        by lane.
+
+        This works like :meth:`Client.gateway_queue_depth` except the numbers are
+        summed up over every shard. For a single shard, consider
+        :meth:`ShardInfo.gateway_queue_depth`.
+
+        .. versionadded:: 2.0
+        """
+        depth = dict.fromkeys(GatewayRatelimiter.LANES, 0)
+        for shard in self.__shards.values():
+            for lane, count in shard.ws.queue_depth().items():
+                depth[lane] += count
+        return depth
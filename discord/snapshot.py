@@ -0,0 +1,122 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+# Snapshots of the ConnectionState cache for warm restarts. This is for internal use only.
+
+from __future__ import annotations
+
+import io
+import os
+import pickle
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
+
+from . import __version__
+from .session import GatewaySession
+
+if TYPE_CHECKING:
+    from .state import ConnectionState
+
+__all__ = ()
+
+# bumped whenever the layout of the snapshot changes, the library version
+# is part of the tag too since the cached models are pickled as they are
+SNAPSHOT_VERSION = 1
+MAGIC = b'DPYCACHE'
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _version_tag() -> bytes:
+    return f'{SNAPSHOT_VERSION}:{__version__}'.encode('ascii')
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO, state: ConnectionState) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._state = state
+
+    def persistent_id(self, obj: Any) -> Any:
+        # every model references the state, it is swapped for the new one on load
+        if obj is self._state:
+            return 'state'
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, state: ConnectionState) -> None:
+        super().__init__(file)
+        self._state = state
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == 'state':
+            return self._state
+        raise pickle.UnpicklingError(f'unknown persistent id {pid!r}')
+
+
+def dumps(state: ConnectionState, sessions: List[GatewaySession]) -> bytes:
+    cache = {
+        'guilds': state._guilds,
+        'users': state._users,
+        'emojis': state._emojis,
+        'stickers': state._stickers,
+        'sessions': [tuple(session) for session in sessions],
+    }
+    buffer = io.BytesIO()
+    _Pickler(buffer, state).dump(cache)
+    tag = _version_tag()
+    return MAGIC + bytes((len(tag),)) + tag + zlib.compress(buffer.getvalue())
+
+
+def loads(state: ConnectionState, data: bytes) -> Tuple[Dict[str, Any], List[GatewaySession]]:
+    if not data.startswith(MAGIC):
+        raise SnapshotError('not a cache snapshot')
+
+    offset = len(MAGIC)
+    size = data[offset]
+    tag = data[offset + 1 : offset + 1 + size]
+    if tag != _version_tag():
+        raise SnapshotError(f'snapshot version {tag.decode("ascii", "replace")} does not match {_version_tag().decode()}')
+
+    try:
+        cache = _Unpickler(io.BytesIO(zlib.decompress(data[offset + 1 + size :])), state).load()
+    except Exception as exc:
+        raise SnapshotError('corrupted cache snapshot') from exc
+
+    sessions = [GatewaySession(*session) for session in cache.pop('sessions')]
+    return cache, sessions
+
+
+def read(path: Union[str, os.PathLike]) -> bytes:
+    with open(path, 'rb') as fp:
+        return fp.read()
+
+
+def write(path: Union[str, os.PathLike], data: bytes) -> None:
+    tmp = f'{os.fspath(path)}.tmp'
+    with open(tmp, 'wb') as fp:
+        fp.write(data)
+    os.replace(tmp, path)
@@ -30,7 +30,7 @@ import copy
 import datetime
 import itertools
 import logging
-from typing import Dict, Optional, TYPE_CHECKING, Union, Callable, Any, List, TypeVar, Coroutine, Sequence, Tuple, Deque
+from typing import ClassVar, Dict, Optional, TYPE_CHECKING, Union, Callable, Any, List, TypeVar, Coroutine, Sequence, Set, Tuple, Deque
 import inspect
 
 import os
@@ -145,6 +145,19 @@ class ConnectionState:
         _get_client: Callable[..., Client]
         _parsers: Dict[str, Callable[[Dict[str, Any]], None]]
 
+    # gateway event -> events dispatched by its parser, for parsers that
+    # don't touch the cache and can be skipped if nothing listens to these
+    DISPATCH_ONLY: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        'TYPING_START': ('typing',),
+        'INVITE_CREATE': ('invite_create',),
+        'INVITE_DELETE': ('invite_delete',),
+        'GUILD_INTEGRATIONS_UPDATE': ('guild_integrations_update',),
+        'INTEGRATION_CREATE': ('integration_create',),
+        'INTEGRATION_UPDATE': ('integration_update',),
+        'INTEGRATION_DELETE': ('raw_integration_delete',),
+        'WEBHOOKS_UPDATE': ('webhooks_update',),
+    }
+
     def __init__(
         self,
         *,
@@ -153,6 +166,7 @@ class ConnectionState:
         hooks: Dict[str, Callable],
         http: HTTPClient,
         loop: asyncio.AbstractEventLoop,
+        consumes: Optional[Callable[[str], bool]] = None,
         **options: Any,
     ) -> None:
         self.loop: asyncio.AbstractEventLoop = loop
@@ -162,10 +176,17 @@ class ConnectionState:
             self.max_messages = 1000
 
         self.dispatch: Callable = dispatch
+        # whether anything listens to an event, checked on every event so that
+        # listeners can come and go
+        self.consumes: Callable[[str], bool] = consumes or (lambda event: True)
         self.handlers: Dict[str, Callable] = handlers
         self.hooks: Dict[str, Callable] = hooks
         self.shard_count: Optional[int] = None
         self._ready_task: Optional[asyncio.Task] = None
+        # guilds loaded from a cache snapshot that a READY hasn't reconciled yet
+        self._restored_guilds: Dict[int, Guild] = {}
+        # shards RESUMEing a restored session, ready is dispatched once all of them are RESUMED
+        self._pending_resumes: Set[Optional[int]] = set()
         self.application_id: Optional[int] = utils._get_as_snowflake(options, 'application_id')
         self.heartbeat_timeout: float = options.get('heartbeat_timeout', 60.0)
         self.guild_ready_timeout: float = options.get('guild_ready_timeout', 2.0)
@@ -233,8 +254,57 @@ class ConnectionState:
             if attr.startswith('parse_'):
                 parsers[attr[6:].upper()] = func
 
+        for event, dispatched in self.DISPATCH_ONLY.items():
+            parsers[event] = self._skip_unconsumed(dispatched, parsers[event])
+
+        cache = http.response_cache
+        if cache is not None:
+            for event in cache.INVALIDATED_BY:
+                parsers[event] = self._invalidate_response_cache(event, parsers[event])
+
+        # restored when a raw handler is removed
+        self._default_parsers: Dict[str, Callable[[Any], None]] = parsers.copy()
+
         self.clear()
 
+    def _skip_unconsumed(self, events: Tuple[str, ...], parser: Callable[[Any], None]) -> Callable[[Any], None]:
+        def wrapped(data: Any) -> None:
+            if self._wants(*events):
+                parser(data)
+
+        return wrapped
+
+    def _wants(self, *events: str) -> bool:
+        consumes = self.consumes
+        for event in events:
+            if consumes(event):
+                return True
+        return False
+
+    def set_raw_handler(self, event: str, handler: Optional[Callable[[Any], None]]) -> None:
+        try:
+            parser = self._default_parsers[event]
+        except KeyError:
+            raise ValueError(f'unknown gateway event {event!r}') from None
+
+        if handler is not None:
+            parser = handler
+            cache = self.http.response_cache
+            if cache is not None and event in cache.INVALIDATED_BY:
+                parser = self._invalidate_response_cache(event, parser)
+
+        self.parsers[event] = parser
+
+    def _invalidate_response_cache(self, event: str, parser: Callable[[Any], None]) -> Callable[[Any], None]:
+        # the HTTP response cache won't be None if this is called
+        cache = self.http.response_cache
+
+        def wrapped(data: Any) -> None:
+            cache.invalidate_from_event(event, data)  # type: ignore
+            parser(data)
+
+        return wrapped
+
     def clear(self, *, views: bool = True) -> None:
         self.user: Optional[ClientUser] = None
         # Originally, this code used WeakValueDictionary to maintain references to the
@@ -567,11 +637,19 @@ class ConnectionState:
         for guild_data in data['guilds']:
             self._add_guild_from_data(guild_data)
 
+        if self._restored_guilds:
+            self._reconcile_ready(data)
+
+        # a restored session could not be RESUMEd, ready is dispatched after this READY instead
+        self._pending_resumes.clear()
         self.dispatch('connect')
         self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data) -> None:
+        if self._restored_guilds:
+            self._reconcile_resumed(data.get('__shard_id__'))
         self.dispatch('resumed')
+        self._resumed_restored(data.get('__shard_id__'))
 
     def parse_message_create(self, data) -> None:
         channel, _ = self._get_guild_channel(data)
@@ -630,25 +708,26 @@ class ConnectionState:
         emoji_id = utils._get_as_snowflake(emoji, 'id')
         emoji = PartialEmoji.with_state(self, id=emoji_id, animated=emoji.get('animated', False), name=emoji['name'])
         raw = RawReactionActionEvent(data, emoji, 'REACTION_ADD')
+        raw.member = None
 
         member_data = data.get('member')
-        if member_data:
+        if member_data and self._wants('raw_reaction_add', 'reaction_add'):
             guild = self._get_guild(raw.guild_id)
             if guild is not None:
                 raw.member = Member(data=member_data, guild=guild, state=self)
-            else:
-                raw.member = None
-        else:
-            raw.member = None
-        self.dispatch('raw_reaction_add', raw)
+
+        if self._wants('raw_reaction_add'):
+            self.dispatch('raw_reaction_add', raw)
 
         # rich interface here
         message = self._get_message(raw.message_id)
         if message is not None:
             emoji = self._upgrade_partial_emoji(emoji)
             reaction = message._add_reaction(data, emoji, raw.user_id)
-            user = raw.member or self._get_reaction_user(message.channel, raw.user_id)
+            if not self._wants('reaction_add'):
+                return
 
+            user = raw.member or self._get_reaction_user(message.channel, raw.user_id)
             if user:
                 self.dispatch('reaction_add', reaction, user)
 
@@ -667,7 +746,8 @@ class ConnectionState:
         emoji_id = utils._get_as_snowflake(emoji, 'id')
         emoji = PartialEmoji.with_state(self, id=emoji_id, name=emoji['name'])
         raw = RawReactionActionEvent(data, emoji, 'REACTION_REMOVE')
-        self.dispatch('raw_reaction_remove', raw)
+        if self._wants('raw_reaction_remove'):
+            self.dispatch('raw_reaction_remove', raw)
 
         message = self._get_message(raw.message_id)
         if message is not None:
@@ -677,6 +757,9 @@ class ConnectionState:
             except (AttributeError, ValueError):  # eventual consistency lol
                 pass
             else:
+                if not self._wants('reaction_remove'):
+                    return
+
                 user = self._get_reaction_user(message.channel, raw.user_id)
                 if user:
                     self.dispatch('reaction_remove', reaction, user)
@@ -722,12 +805,14 @@ class ConnectionState:
             _log.debug('PRESENCE_UPDATE referencing an unknown member ID: %s. Discarding', member_id)
             return
 
-        old_member = Member._copy(member)
+        # the cache is always updated, but the copy is only needed for the event
+        old_member = Member._copy(member) if self._wants('presence_update') else None
         user_update = member._presence_update(data=data, user=user)
         if user_update:
             self.dispatch('user_update', user_update[0], user_update[1])
 
-        self.dispatch('presence_update', old_member, member)
+        if old_member is not None:
+            self.dispatch('presence_update', old_member, member)
 
     def parse_user_update(self, data) -> None:
         # self.user is *always* cached when this is called
@@ -1041,9 +1126,64 @@ class ConnectionState:
             if guild is not None:
                 guild.unavailable = False
                 guild._from_data(data)
+                if self._restored_guilds:
+                    self._reconcile_guild(guild)
                 return guild
 
-        return self._add_guild_from_data(data)
+        guild = self._add_guild_from_data(data)
+        if self._restored_guilds:
+            self._reconcile_guild(guild)
+        return guild
+
+    def _load_cache(self, cache: Dict[str, Any]) -> None:
+        self._guilds = cache['guilds']
+        self._users = cache['users']
+        self._emojis = cache['emojis']
+        self._stickers = cache['stickers']
+        if self.user is not None:
+            self._users[self.user.id] = self.user  # type: ignore
+        self._restored_guilds = self._guilds.copy()
+
+    def _reconcile_ready(self, data) -> None:
+        # guilds missing from READY were left while we were away
+        shard_id = data.get('__shard_id__')
+        listed = {int(g['id']) for g in data['guilds']}
+        for guild_id, guild in list(self._restored_guilds.items()):
+            if guild_id not in listed and (shard_id is None or guild.shard_id == shard_id):
+                del self._restored_guilds[guild_id]
+
+    def _reconcile_resumed(self, shard_id: Optional[int]) -> None:
+        # the restored guilds of a RESUME'd shard are up to date with the replayed events
+        for guild_id, guild in list(self._restored_guilds.items()):
+            if shard_id is None or guild.shard_id == shard_id:
+                del self._restored_guilds[guild_id]
+
+    def _resumed_restored(self, shard_id: Optional[int]) -> None:
+        # a restored start gets no READY, the cache is the one loaded from the snapshot
+        if shard_id not in self._pending_resumes:
+            return
+
+        self._pending_resumes.discard(shard_id)
+        if not self._pending_resumes:
+            self.call_handlers('ready')
+            self.dispatch('ready')
+
+    def _reconcile_guild(self, guild: Guild) -> None:
+        restored = self._restored_guilds.pop(guild.id, None)
+        if restored is None or restored is guild or guild.chunked:
+            return
+
+        # keep the restored members if that makes the member list complete,
+        # otherwise the guild is chunked from scratch as usual
+        missing = [member for member_id, member in restored._members.items() if member_id not in guild._members]
+        count = getattr(guild, '_member_count', None)
+        if count is None or len(guild._members) + len(missing) != count:
+            return
+
+        for member in missing:
+            member.guild = guild
+            self._users.setdefault(member._user.id, member._user)
+            guild._add_member(member)
 
     def is_guild_evicted(self, guild) -> bool:
         return guild.id not in self._guilds
@@ -1516,6 +1656,11 @@ class AutoShardedConnectionState(ConnectionState):
         for guild_data in data['guilds']:
             self._add_guild_from_data(guild_data)
 
+        if self._restored_guilds:
+            self._reconcile_ready(data)
+
+        # a restored session could not be RESUMEd, ready is dispatched after the READYs instead
+        self._pending_resumes.clear()
         if self._messages:
             self._update_message_references()
 
@@ -1526,5 +1671,8 @@ class AutoShardedConnectionState(ConnectionState):
             self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data) -> None:
+        if self._restored_guilds:
+            self._reconcile_resumed(data['__shard_id__'])
         self.dispatch('resumed')
         self.dispatch('shard_resumed', data['__shard_id__'])
+        self._resumed_restored(data['__shard_id__'])
@@ -38,7 +38,7 @@ import aiohttp
 from .. import utils
 from ..errors import InvalidArgument, HTTPException, Forbidden, NotFound, DiscordServerError
 from ..message import Message
-from ..enums import try_enum, WebhookType
+from ..enums import try_enum, RequestPriority, WebhookType
 from ..user import BaseUser, User
 from ..asset import Asset
 from ..http import Route
@@ -59,7 +59,7 @@ if TYPE_CHECKING:
     from ..embeds import Embed
     from ..mentions import AllowedMentions
     from ..state import ConnectionState
-    from ..http import Response
+    from ..http import HTTPClient, Response
     from ..types.webhook import (
         Webhook as WebhookPayload,
     )
@@ -408,13 +408,43 @@ class AsyncWebhookAdapter:
     ) -> Response[None]:
         r = Route(
             'DELETE',
-            '/webhooks/{webhook_id}/{wehook_token}/messages/@original',
+            '/webhooks/{webhook_id}/{webhook_token}/messages/@original',
             webhook_id=application_id,
-            wehook_token=token,
+            webhook_token=token,
         )
         return self.request(r, session=session)
 
 
+class InteractionWebhookAdapter(AsyncWebhookAdapter):
+    # Interaction responses and follow-ups have a hard deadline, so they are sent
+    # through the client's HTTPClient where they are queued ahead of other requests.
+    def __init__(self, http: HTTPClient):
+        super().__init__()
+        self.http: HTTPClient = http
+
+    async def request(
+        self,
+        route: Route,
+        session: aiohttp.ClientSession,
+        *,
+        payload: Optional[Dict[str, Any]] = None,
+        multipart: Optional[List[Dict[str, Any]]] = None,
+        files: Optional[List[File]] = None,
+        reason: Optional[str] = None,
+        auth_token: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        kwargs: Dict[str, Any] = {}
+        if payload is not None:
+            kwargs['json'] = payload
+        if params is not None:
+            kwargs['params'] = params
+
+        return await self.http.request(
+            route, priority=RequestPriority.interaction, form=multipart, files=files, reason=reason, **kwargs
+        )
+
+
 class ExecuteWebhookParameters(NamedTuple):
     payload: Optional[Dict[str, Any]]
     multipart: Optional[List[Dict[str, Any]]]
@@ -923,11 +953,13 @@ class Webhook(BaseWebhook):
         .. versionadded:: 2.0
     """
 
-    __slots__: Tuple[str, ...] = ('session',)
+    __slots__: Tuple[str, ...] = ('session', '_adapter')
 
     def __init__(self, data: WebhookPayload, session: aiohttp.ClientSession, token: Optional[str] = None, state=None):
         super().__init__(data, token, state)
         self.session = session
+        # set for follow-up webhooks to send them with the interaction priority
+        self._adapter: Optional[AsyncWebhookAdapter] = None
 
     def __repr__(self):
         return f'<Webhook id={self.id!r}>'
@@ -1068,7 +1100,7 @@ class Webhook(BaseWebhook):
         :class:`Webhook`
             The fetched webhook.
         """
-        adapter = async_context.get()
+        adapter = self._adapter or async_context.get()
 
         if prefer_auth and self.auth_token:
             data = await adapter.fetch_webhook(self.id, self.auth_token, session=self.session)
@@ -1110,7 +1142,7 @@ class Webhook(BaseWebhook):
         if self.token is None and self.auth_token is None:
             raise InvalidArgument('This webhook does not have a token associated with it')
 
-        adapter = async_context.get()
+        adapter = self._adapter or async_context.get()
 
         if prefer_auth and self.auth_token:
             await adapter.delete_webhook(self.id, token=self.auth_token, session=self.session, reason=reason)
@@ -1170,7 +1202,7 @@ class Webhook(BaseWebhook):
         if avatar is not MISSING:
             payload['avatar'] = utils._bytes_to_base64_data(avatar) if avatar is not None else None
 
-        adapter = async_context.get()
+        adapter = self._adapter or async_context.get()
 
         data: Optional[WebhookPayload] = None
         # If a channel is given, always use the authenticated endpoint
@@ -1379,7 +1411,7 @@ class Webhook(BaseWebhook):
             allowed_mentions=allowed_mentions,
             previous_allowed_mentions=previous_mentions,
         )
-        adapter = async_context.get()
+        adapter = self._adapter or async_context.get()
         thread_id: Optional[int] = None
         if thread is not MISSING:
             thread_id = thread.id
@@ -1437,7 +1469,7 @@ class Webhook(BaseWebhook):
         if self.token is None:
             raise InvalidArgument('This webhook does not have a token associated with it')
 
-        adapter = async_context.get()
+        adapter = self._adapter or async_context.get()
         data = await adapter.get_webhook_message(
             self.id,
             self.token,
@@ -1540,7 +1572,7 @@ class Webhook(BaseWebhook):
             allowed_mentions=allowed_mentions,
             previous_allowed_mentions=previous_mentions,
         )
-        adapter = async_context.get()
+        adapter = self._adapter or async_context.get()
         data = await adapter.edit_webhook_message(
             self.id,
             self.token,
@@ -1581,7 +1613,7 @@ class Webhook(BaseWebhook):
         if self.token is None:
             raise InvalidArgument('This webhook does not have a token associated with it')
 
-        adapter = async_context.get()
+        adapter = self._adapter or async_context.get()
         await adapter.delete_webhook_message(
             self.id,
             self.token,
@@ -107,6 +107,9 @@ class WebhookAdapter:
     ) -> Any:
         headers: Dict[str, str] = {}
         files = files or []
+        if any(file.is_stream() for file in files):
+            raise InvalidArgument('streamed files can only be sent with an asynchronous webhook')
+
         to_send: Optional[Union[str, Dict[str, Any]]] = None
         bucket = (route.webhook_id, route.webhook_token)
 
@@ -42,7 +42,10 @@ extras_require = {
     ],
     'speed': [
         'orjson>=3.5.4',
-    ]
+    ],
+    'test': [
+        'pytest',
+    ],
 }
 
 packages = [
@@ -52,6 +55,7 @@ packages = [
     'discord.webhook',
     'discord.ext.commands',
     'discord.ext.tasks',
+    'discord.ext.mock',
     'discord.slash'
 ]
 
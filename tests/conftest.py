@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def clock(loop, monkeypatch):
+    # only replaces the time seen by the code under test, the loop is never run with it
+    clock = Clock()
+    monkeypatch.setattr(loop, 'time', clock)
+    return clock
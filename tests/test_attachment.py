@@ -0,0 +1,65 @@
+import asyncio
+import io
+from types import SimpleNamespace
+
+from discord.message import Attachment
+
+
+class CDN:
+    def __init__(self, content):
+        self.content = content
+        self.offsets = []
+
+    async def stream_from_cdn(self, url, *, offset=0, size=None, chunk_size=65536):
+        self.offsets.append(offset)
+        end = len(self.content) if size is None else offset + size
+        for start in range(offset, end, chunk_size):
+            yield self.content[start : min(start + chunk_size, end)]
+
+
+def make_attachment(content):
+    cdn = CDN(content)
+    data = {'id': '1', 'size': len(content), 'filename': 'data.bin', 'url': 'https://cdn/1', 'proxy_url': 'https://media/1'}
+    return Attachment(data=data, state=SimpleNamespace(http=cdn)), cdn
+
+
+def test_save_to_buffer():
+    attachment, _ = make_attachment(b'x' * 100)
+    buffer = io.BytesIO()
+    assert asyncio.run(attachment.save(buffer)) == 100
+    assert buffer.getvalue() == b'x' * 100
+    assert buffer.tell() == 0
+
+
+def test_save_empty_attachment_truncates(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'stale')
+    attachment, _ = make_attachment(b'')
+
+    assert asyncio.run(attachment.save(str(path))) == 0
+    assert path.read_bytes() == b''
+
+
+def test_save_overwrites_without_resume(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'stale')
+    attachment, cdn = make_attachment(b'content')
+
+    assert asyncio.run(attachment.save(str(path))) == 7
+    assert path.read_bytes() == b'content'
+    assert cdn.offsets == [0]
+
+
+def test_save_resumes_partial_download(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'cont')
+    attachment, cdn = make_attachment(b'content')
+
+    assert asyncio.run(attachment.save(str(path), resume=True)) == 3
+    assert path.read_bytes() == b'content'
+    assert cdn.offsets == [4]
+
+    # a complete download is not requested again
+    assert asyncio.run(attachment.save(str(path), resume=True)) == 0
+    assert path.read_bytes() == b'content'
+    assert cdn.offsets == [4]
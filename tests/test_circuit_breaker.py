@@ -0,0 +1,123 @@
+from discord.enums import CircuitState
+from discord.http import CircuitBreaker, RetryBudget
+
+
+def make_breaker(loop, **kwargs):
+    changes = []
+    breaker = CircuitBreaker(
+        'GET /gateway', loop, lambda route, before, after: changes.append((route, before, after)), **kwargs
+    )
+    return breaker, changes
+
+
+def test_opens_after_threshold_failures(loop, clock):
+    breaker, changes = make_breaker(loop, threshold=3, window=10.0, cooldown=30.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.closed
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.open
+    assert changes == [('GET /gateway', CircuitState.closed, CircuitState.open)]
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30.0
+
+
+def test_failures_outside_the_window_are_forgotten(loop, clock):
+    breaker, _ = make_breaker(loop, threshold=3, window=10.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.advance(10.0)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.closed
+
+    # a success resets the count
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.closed
+
+
+def test_half_open_probe_closes_on_success(loop, clock):
+    breaker, changes = make_breaker(loop, threshold=1, cooldown=30.0)
+    breaker.record_failure()
+    clock.advance(29.0)
+    assert not breaker.allow()
+    assert breaker.retry_after() == 1.0
+
+    clock.advance(1.0)
+    assert breaker.allow()
+    assert breaker.state is CircuitState.half_open
+    # only a single probe is let through
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state is CircuitState.closed
+    assert breaker.allow()
+    assert [after for _, _, after in changes] == [CircuitState.open, CircuitState.half_open, CircuitState.closed]
+
+
+def test_half_open_probe_reopens_on_failure(loop, clock):
+    breaker, changes = make_breaker(loop, threshold=1, cooldown=30.0)
+    breaker.record_failure()
+    clock.advance(30.0)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.open
+    assert breaker.retry_after() == 30.0
+    assert not breaker.allow()
+    assert [after for _, _, after in changes] == [CircuitState.open, CircuitState.half_open, CircuitState.open]
+
+
+def test_lost_probe_is_replaced_after_cooldown(loop, clock):
+    breaker, _ = make_breaker(loop, threshold=1, cooldown=30.0)
+    breaker.record_failure()
+    clock.advance(30.0)
+    assert breaker.allow()
+
+    # the probe never reported back
+    clock.advance(29.0)
+    assert not breaker.allow()
+    clock.advance(1.0)
+    assert breaker.allow()
+    assert breaker.state is CircuitState.half_open
+
+
+def test_retry_budget_minimum(loop, clock):
+    budget = RetryBudget(loop, ratio=0.0, min_retries=2, window=10)
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    assert budget.retries == 2
+
+
+def test_retry_budget_ratio(loop, clock):
+    budget = RetryBudget(loop, ratio=0.5, min_retries=0, window=10)
+    assert not budget.withdraw()
+
+    for _ in range(4):
+        budget.deposit()
+    assert budget.requests == 4
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+def test_retry_budget_window(loop, clock):
+    budget = RetryBudget(loop, ratio=0.0, min_retries=1, window=10)
+    budget.deposit()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    clock.advance(5.0)
+    budget.deposit()
+    assert budget.requests == 2
+    assert not budget.withdraw()
+
+    # the first second falls out of the window
+    clock.advance(5.0)
+    assert budget.requests == 1
+    assert budget.retries == 0
+    assert budget.withdraw()
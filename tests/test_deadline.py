@@ -0,0 +1,74 @@
+import asyncio
+import datetime
+
+import pytest
+
+from discord import utils
+from discord.errors import CircuitOpen, DeadlineExceeded
+from discord.http import HTTPClient, Ratelimit, Route
+
+
+def dirty_bucket(ratelimit, limit=5):
+    ratelimit.limit = limit
+    ratelimit.remaining = limit
+    ratelimit.dirty = True
+
+
+def test_release_gives_unsent_slots_back(loop):
+    ratelimit = Ratelimit(loop)
+    dirty_bucket(ratelimit)
+
+    async def main():
+        await ratelimit.acquire()
+        ratelimit.release(sent=False)
+        assert ratelimit.remaining == 5
+
+        await ratelimit.acquire()
+        ratelimit.release()
+        assert ratelimit.remaining == 4
+
+    loop.run_until_complete(main())
+    assert ratelimit.outgoing == 0
+
+
+def test_dropped_request_does_not_use_a_slot():
+    async def main():
+        http = HTTPClient(loop=asyncio.get_running_loop(), max_requests_per_second=1)
+        route = Route('GET', '/channels/{channel_id}', channel_id=1)
+        ratelimit = http.get_ratelimit(http._get_ratelimit_key(route))
+        dirty_bucket(ratelimit)
+
+        # the global pacer has no token left for another second
+        await http.global_ratelimit.block()
+        with pytest.raises(DeadlineExceeded):
+            await http.request(route, deadline=utils.utcnow() + datetime.timedelta(seconds=0.05))
+
+        assert ratelimit.remaining == 5
+        assert ratelimit.outgoing == 0
+        assert http.stats.get(route.key).deadline_exceeded == 1
+
+    asyncio.run(main())
+
+
+def test_short_circuited_request_does_not_use_a_slot():
+    async def main():
+        http = HTTPClient(loop=asyncio.get_running_loop(), circuit_breaker_threshold=1)
+        route = Route('GET', '/channels/{channel_id}', channel_id=1)
+        ratelimit = http.get_ratelimit(http._get_ratelimit_key(route))
+        dirty_bucket(ratelimit, limit=1)
+
+        # hold the only slot so the request has to queue
+        await ratelimit.acquire()
+        task = asyncio.create_task(http.request(route))
+        await asyncio.sleep(0)
+
+        # the breaker opens while the request is queued
+        http._get_circuit_breaker(route.key).record_failure()
+        ratelimit.release(sent=False)
+        with pytest.raises(CircuitOpen):
+            await task
+
+        assert ratelimit.remaining == 1
+        assert ratelimit.outgoing == 0
+
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from discord.dispatcher import EventDispatcher
+
+
+async def handler(results, name, gate):
+    await gate.wait()
+    results.append(name)
+
+
+def run_overflow(policy):
+    async def main():
+        dispatcher = EventDispatcher(1, queue_size=1, policy=policy)
+        gate = asyncio.Event()
+        results = []
+        for name in ('first', 'second', 'third'):
+            dispatcher.schedule(handler(results, name, gate), 'on_message', name)
+
+        stats = dispatcher.stats()
+        gate.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return results, stats, dispatcher
+
+    return asyncio.run(main())
+
+
+def test_drop_newest():
+    results, stats, _ = run_overflow('drop_newest')
+    assert results == ['first', 'second']
+    assert stats == {'message': {'limit': 1, 'running': 1, 'pending': 1, 'queued': 1, 'dropped': 1}}
+
+
+def test_drop_oldest():
+    results, stats, _ = run_overflow('drop_oldest')
+    assert results == ['first', 'third']
+    assert stats == {'message': {'limit': 1, 'running': 1, 'pending': 1, 'queued': 2, 'dropped': 1}}
+
+
+def test_block():
+    results, stats, dispatcher = run_overflow('block')
+    assert results == ['first', 'second', 'third']
+    assert stats == {'message': {'limit': 1, 'running': 1, 'pending': 2, 'queued': 2, 'dropped': 0}}
+    assert not dispatcher._full
+
+
+def test_events_without_a_limit_are_not_queued():
+    async def main():
+        dispatcher = EventDispatcher({'message': 1, 'MESSAGE_CREATE': 1}, queue_size=0, policy='drop_newest')
+        gate = asyncio.Event()
+        results = []
+        tasks = [dispatcher.schedule(handler(results, name, gate), 'on_typing', name) for name in ('a', 'b')]
+        assert all(task is not None for task in tasks)
+
+        # raw handlers are limited by the name of the gateway event
+        tasks.append(dispatcher.schedule(handler(results, 'message', gate), 'on_message', 'message'))
+        tasks.append(dispatcher.schedule(handler(results, 'raw', gate), 'MESSAGE_CREATE', 'raw'))
+        assert dispatcher.schedule(handler(results, 'raw', gate), 'MESSAGE_CREATE', 'raw') is None
+
+        gate.set()
+        await asyncio.gather(*tasks)
+        return dispatcher.stats()
+
+    assert asyncio.run(main()) == {
+        'message': {'limit': 1, 'running': 0, 'pending': 0, 'queued': 0, 'dropped': 0},
+        'MESSAGE_CREATE': {'limit': 1, 'running': 0, 'pending': 0, 'queued': 0, 'dropped': 1},
+    }
+
+
+def test_wait_for_room():
+    async def main():
+        dispatcher = EventDispatcher(1, queue_size=1, policy='block')
+        gate = asyncio.Event()
+        results = []
+
+        # nothing to wait for while there is room
+        await asyncio.wait_for(dispatcher.wait_for_room(60.0), timeout=1.0)
+
+        dispatcher.schedule(handler(results, 'first', gate), 'on_message', 'first')
+        dispatcher.schedule(handler(results, 'second', gate), 'on_message', 'second')
+        assert dispatcher._full
+
+        # gives up once the timeout passes
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await dispatcher.wait_for_room(0.05)
+        assert loop.time() - start >= 0.05
+        assert not dispatcher._waiters
+
+        # and is woken up once a handler finishes
+        waiter = asyncio.create_task(dispatcher.wait_for_room(60.0))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        gate.set()
+        await asyncio.wait_for(waiter, timeout=1.0)
+        assert not dispatcher._full
+        assert not dispatcher._waiters
+
+    asyncio.run(main())
+
+
+def test_close_drops_pending_events():
+    async def main():
+        dispatcher = EventDispatcher(1, queue_size=1, policy='block')
+        gate = asyncio.Event()
+        results = []
+        running = dispatcher.schedule(handler(results, 'first', gate), 'on_message', 'first')
+        dispatcher.schedule(handler(results, 'second', gate), 'on_message', 'second')
+        waiter = asyncio.create_task(dispatcher.wait_for_room(60.0))
+        await asyncio.sleep(0)
+
+        dispatcher.close()
+        await asyncio.wait_for(waiter, timeout=1.0)
+        gate.set()
+        await running
+        return results
+
+    assert asyncio.run(main()) == ['first']
+
+
+@pytest.mark.parametrize(
+    'concurrency, options',
+    [
+        (1, {'queue_size': 1, 'policy': 'drop_everything'}),
+        (1, {'queue_size': -1, 'policy': 'block'}),
+        (0, {'queue_size': 1, 'policy': 'block'}),
+        ({'MESSAGE_CREATE': 0}, {'queue_size': 1, 'policy': 'block'}),
+    ],
+)
+def test_invalid_options(concurrency, options):
+    with pytest.raises(ValueError):
+        EventDispatcher(concurrency, **options)
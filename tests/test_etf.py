@@ -0,0 +1,75 @@
+import zlib
+
+import pytest
+
+from discord import etf
+
+SAMPLES = [
+    None,
+    True,
+    False,
+    0,
+    255,
+    256,
+    -1,
+    2 ** 31 - 1,
+    -(2 ** 31),
+    2 ** 31,
+    -(2 ** 31) - 1,
+    # snowflakes
+    853209154374156338,
+    2 ** 64 - 1,
+    -(2 ** 64),
+    0.0,
+    -1.5,
+    3.141592653589793,
+    '',
+    'hello',
+    'héllo 🎉',
+    [],
+    [1, 'two', 3.0, None],
+    {},
+    {'op': 0, 't': 'MESSAGE_CREATE', 's': 42, 'd': {'id': 853209154374156338, 'mentions': [], 'pinned': False}},
+    {'nested': [{'a': [1, [2, [3]]]}, {'b': None}]},
+]
+
+
+@pytest.mark.parametrize('value', SAMPLES)
+def test_round_trip(value):
+    assert etf._loads(etf._dumps(value)) == value
+    assert etf.loads(etf.dumps(value)) == value
+
+
+def test_round_trip_types():
+    decoded = etf._loads(etf._dumps([True, 1, 1.0, None]))
+    assert [type(item) for item in decoded] == [bool, int, float, type(None)]
+
+
+def test_tuples_and_bytes_are_encoded_as_lists_and_binaries():
+    assert etf._loads(etf._dumps((1, 2))) == [1, 2]
+    assert etf._loads(etf._dumps(b'raw')) == 'raw'
+
+
+def test_decodes_terms_the_encoder_does_not_produce():
+    # a small tuple, a latin-1 atom and a string of bytes
+    data = bytes([131, 104, 3, 100, 0, 2]) + b'ok' + bytes([107, 0, 3, 1, 2, 3]) + bytes([106])
+    assert etf._loads(data) == ('ok', [1, 2, 3], [])
+
+
+def test_decodes_compressed_terms():
+    body = etf._dumps({'d': 'x' * 100})[1:]
+    data = bytes([131, 80]) + len(body).to_bytes(4, 'big') + zlib.compress(body)
+    assert etf._loads(data) == {'d': 'x' * 100}
+
+
+@pytest.mark.parametrize('data', [b'', b'\x00', b'\x83', b'\x83\x62\x00', b'\x83\xff'])
+def test_malformed_data(data):
+    with pytest.raises(etf.ETFDecodeError):
+        etf._loads(data)
+
+
+def test_unserializable_values():
+    with pytest.raises(TypeError):
+        etf._dumps(object())
+    with pytest.raises(ValueError):
+        etf._dumps(1 << 2048)
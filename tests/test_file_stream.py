@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+import discord
+from discord.errors import InvalidArgument
+from discord.http import HTTPClient
+from discord.webhook.sync import SyncWebhook
+
+
+def test_every_iteration_starts_a_new_stream():
+    calls = []
+
+    async def factory():
+        calls.append(len(calls))
+        yield b'a'
+        yield b'b'
+
+    async def read(file):
+        return b''.join([chunk async for chunk in file.fp])
+
+    async def main():
+        file = discord.File.from_stream(factory, 'data.bin', spoiler=True)
+        assert file.is_stream()
+        assert file.filename == 'SPOILER_data.bin'
+        assert file.spoiler
+
+        assert await read(file) == b'ab'
+        file.reset(seek=1)
+        assert await read(file) == b'ab'
+        file.close()
+
+    asyncio.run(main())
+    assert calls == [0, 1]
+
+
+def test_regular_files_are_not_streams(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'data')
+    file = discord.File(str(path))
+    assert not file.is_stream()
+    file.close()
+
+
+def test_sync_webhook_rejects_streams():
+    async def factory():
+        yield b'data'
+
+    webhook = SyncWebhook({'id': 1, 'type': 1, 'token': 'token'}, session=object())
+    with pytest.raises(InvalidArgument):
+        webhook.send(file=discord.File.from_stream(factory, 'data.bin'))
+
+
+def json_response(data, **kwargs):
+    # the client expects the content type without a charset
+    return web.Response(body=json.dumps(data).encode(), content_type='application/json', **kwargs)
+
+
+async def start_server(handler):
+    async def me(request):
+        return json_response({'id': '1'})
+
+    app = web.Application()
+    app.router.add_get('/api/v8/users/@me', me)
+    app.router.add_post('/api/v8/channels/{channel_id}/messages', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    http = HTTPClient(loop=asyncio.get_running_loop(), api_base_url=f'http://127.0.0.1:{port}/api/v8')
+    await http.static_login('token')
+    return runner, http
+
+
+# large enough for the server to find the first chunk without the boundary
+FIRST = b'a' * 65536
+
+
+def test_upload_is_streamed_and_restarted_on_retry():
+    async def main():
+        received = []
+        first_chunk = asyncio.Event()
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            yield FIRST
+            # the server has to see the first chunk before the rest is produced
+            await asyncio.wait_for(first_chunk.wait(), timeout=5.0)
+            yield b'second'
+
+        async def handler(request):
+            reader = await request.multipart()
+            part = await reader.next()
+            while part.name != 'file':
+                part = await reader.next()
+
+            chunks = []
+            while True:
+                chunk = await part.read_chunk(1024)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                first_chunk.set()
+
+            received.append((part.filename, b''.join(chunks)))
+            first_chunk.clear()
+            if len(received) == 1:
+                # a rate limit is retried with a new form and a new stream
+                data = {'retry_after': 0.01, 'global': False, 'message': 'rate limited'}
+                return json_response(data, status=429, headers={'Via': '1.1 google'})
+            return json_response({'id': '2'})
+
+        runner, http = await start_server(handler)
+        try:
+            file = discord.File.from_stream(factory, 'data.bin')
+            data = await http.send_files(1, files=[file])
+        finally:
+            await http.close()
+            await runner.cleanup()
+
+        assert data == {'id': '2'}
+        assert calls == 2
+        assert received == [('data.bin', FIRST + b'second'), ('data.bin', FIRST + b'second')]
+
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+import asyncio
+
+from discord.gateway import GatewayRatelimiter
+
+
+def test_control_lane_uses_reserved_capacity():
+    async def main():
+        ratelimiter = GatewayRatelimiter(count=3, per=60.0, reserved=1)
+        await ratelimiter.block()
+        await ratelimiter.block(GatewayRatelimiter.HIGH)
+        assert ratelimiter.is_ratelimited()
+
+        # the other lanes have to wait for the next window
+        normal = asyncio.create_task(ratelimiter.block())
+        await asyncio.sleep(0)
+        assert not normal.done()
+        assert ratelimiter.queue_depth() == {'control': 0, 'high': 0, 'normal': 1}
+
+        # while heartbeats can still be sent
+        await asyncio.wait_for(ratelimiter.block(GatewayRatelimiter.CONTROL), timeout=1.0)
+        assert ratelimiter.used == 3
+
+        # until the reserved capacity is used up as well
+        control = asyncio.create_task(ratelimiter.block(GatewayRatelimiter.CONTROL))
+        await asyncio.sleep(0)
+        assert not control.done()
+        assert ratelimiter.queue_depth() == {'control': 1, 'high': 0, 'normal': 1}
+
+        for task in (normal, control):
+            task.cancel()
+        await asyncio.gather(normal, control, return_exceptions=True)
+        assert ratelimiter.queue_depth() == {'control': 0, 'high': 0, 'normal': 0}
+
+    asyncio.run(main())
+
+
+def test_queued_sends_are_served_by_lane():
+    async def main():
+        ratelimiter = GatewayRatelimiter(count=1, per=0.05, reserved=0)
+        order = []
+
+        async def send(name, priority):
+            await ratelimiter.block(priority)
+            order.append(name)
+
+        await ratelimiter.block()
+        await asyncio.gather(
+            send('normal', GatewayRatelimiter.NORMAL),
+            send('second normal', GatewayRatelimiter.NORMAL),
+            send('high', GatewayRatelimiter.HIGH),
+        )
+        return order
+
+    assert asyncio.run(main()) == ['high', 'normal', 'second normal']
+
+
+def test_cancelled_sends_are_removed_from_the_queue():
+    async def main():
+        ratelimiter = GatewayRatelimiter(count=1, per=0.05, reserved=0)
+        await ratelimiter.block()
+
+        cancelled = asyncio.create_task(ratelimiter.block(GatewayRatelimiter.HIGH))
+        normal = asyncio.create_task(ratelimiter.block())
+        await asyncio.sleep(0)
+        assert len(ratelimiter._queue) == 2
+
+        cancelled.cancel()
+        await asyncio.wait_for(normal, timeout=1.0)
+        assert cancelled.cancelled()
+        assert not ratelimiter._queue
+        # the cancelled send did not use up the window
+        assert ratelimiter.used == 1
+        assert ratelimiter._drain_task is None
+
+    asyncio.run(main())
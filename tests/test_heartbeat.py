@@ -0,0 +1,69 @@
+import asyncio
+import gc
+import logging
+import weakref
+
+from discord.gateway import HeartbeatScheduler
+
+
+class Handler:
+    def __init__(self, interval):
+        self.interval = interval
+        self.shard_id = 0
+        self.behind_msg = 'Can\'t keep up, shard ID %s websocket is %.1fs behind.'
+        self._handle = None
+        self._task = None
+        self._last_send = 0.0
+        self.beats = 0
+        self.sent = asyncio.Event()
+
+    async def beat(self):
+        self.beats += 1
+        # stuck behind the gateway rate limiter
+        await self.sent.wait()
+
+
+def test_scheduler_does_not_keep_its_loop_alive():
+    async def main():
+        return HeartbeatScheduler.current()
+
+    loop = asyncio.new_event_loop()
+    scheduler = loop.run_until_complete(main())
+    assert scheduler.loop is loop
+    assert HeartbeatScheduler._schedulers[loop] is scheduler
+
+    ref = weakref.ref(loop)
+    loop.close()
+    del loop
+    gc.collect()
+    assert ref() is None
+    assert scheduler not in HeartbeatScheduler._schedulers.values()
+
+
+def test_one_scheduler_per_loop():
+    async def main():
+        return HeartbeatScheduler.current(), HeartbeatScheduler.current()
+
+    first, second = asyncio.run(main())
+    assert first is second
+    assert asyncio.run(main())[0] is not first
+
+
+def test_late_heartbeats_are_skipped(caplog):
+    async def main():
+        scheduler = HeartbeatScheduler.current()
+        handler = Handler(0.01)
+        scheduler.add(handler)
+        await asyncio.sleep(0.1)
+        assert handler.beats == 1
+
+        # once the heartbeat is sent the next one goes out on time
+        handler.sent.set()
+        await asyncio.sleep(0.05)
+        beats = handler.beats
+        scheduler.remove(handler)
+        return beats
+
+    with caplog.at_level(logging.WARNING, logger='discord.gateway'):
+        assert asyncio.run(main()) > 1
+    assert any('Can\'t keep up' in record.getMessage() for record in caplog.records)
@@ -0,0 +1,116 @@
+import asyncio
+
+from discord.enums import RequestPriority
+from discord.http import GlobalRatelimit, Ratelimit, _PriorityWaiters
+
+
+def test_waiters_are_served_by_priority(loop, clock):
+    waiters = _PriorityWaiters(loop)
+    background = waiters.push(RequestPriority.background)
+    normal = waiters.push(RequestPriority.normal)
+    interaction = waiters.push(RequestPriority.interaction)
+    second_normal = waiters.push(RequestPriority.normal)
+
+    assert len(waiters) == 4
+    assert waiters.depths() == {'interaction': 1, 'normal': 2, 'background': 1}
+    assert waiters.ahead_of(RequestPriority.normal) == 3
+    assert [waiters.pop() for _ in range(4)] == [interaction, normal, second_normal, background]
+    assert waiters.pop() is None
+    assert not waiters
+
+
+def test_starved_waiter_is_served_first(loop, clock):
+    waiters = _PriorityWaiters(loop, max_wait=5.0)
+    background = waiters.push(RequestPriority.background)
+    clock.advance(1.0)
+    normal = waiters.push(RequestPriority.normal)
+
+    clock.advance(3.9)
+    interaction = waiters.push(RequestPriority.interaction)
+    assert waiters.pop() is interaction
+
+    # the background waiter has now been queued for 5 seconds
+    clock.advance(0.1)
+    queued = waiters.push(RequestPriority.interaction)
+    assert waiters.pop() is background
+
+    # the oldest starved waiter goes first
+    clock.advance(10.0)
+    late = waiters.push(RequestPriority.interaction)
+    assert waiters.pop() is normal
+    assert waiters.pop() is queued
+    assert waiters.pop() is late
+
+
+def test_cancelled_waiters_are_skipped(loop, clock):
+    waiters = _PriorityWaiters(loop)
+    cancelled = waiters.push(RequestPriority.interaction)
+    normal = waiters.push(RequestPriority.normal)
+    cancelled.cancel()
+
+    assert waiters.pop() is normal
+    assert waiters.pop() is None
+
+
+def test_ratelimit_hands_slots_out_by_priority():
+    async def main():
+        loop = asyncio.get_running_loop()
+        ratelimit = Ratelimit(loop)
+        order = []
+
+        async def request(name, priority):
+            await ratelimit.acquire(priority)
+            order.append(name)
+            await asyncio.sleep(0)
+            ratelimit.release()
+
+        # the first request holds the only slot while the others queue up
+        await ratelimit.acquire()
+        tasks = [
+            asyncio.create_task(request('background', RequestPriority.background)),
+            asyncio.create_task(request('normal', RequestPriority.normal)),
+            asyncio.create_task(request('interaction', RequestPriority.interaction)),
+        ]
+        await asyncio.sleep(0)
+        assert len(ratelimit._pending) == 3
+
+        ratelimit.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(main()) == ['interaction', 'normal', 'background']
+
+
+def test_global_ratelimit_wakes_by_priority():
+    async def main():
+        loop = asyncio.get_running_loop()
+        ratelimit = GlobalRatelimit(loop, rate=1, per=0.01)
+        order = []
+
+        async def request(name, priority):
+            await ratelimit.block(priority)
+            order.append(name)
+
+        await ratelimit.block()
+        await asyncio.gather(
+            request('background', RequestPriority.background),
+            request('normal', RequestPriority.normal),
+            request('interaction', RequestPriority.interaction),
+        )
+        return order
+
+    assert asyncio.run(main()) == ['interaction', 'normal', 'background']
+
+
+def test_global_ratelimit_deadline():
+    async def main():
+        loop = asyncio.get_running_loop()
+        ratelimit = GlobalRatelimit(loop, rate=1, per=60.0)
+        await ratelimit.block()
+        try:
+            await ratelimit.block(deadline=loop.time() + 1.0)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    assert asyncio.run(main())
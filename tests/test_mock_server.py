@@ -0,0 +1,59 @@
+import asyncio
+import io
+from types import SimpleNamespace
+
+import pytest
+
+import discord
+from discord.errors import NotFound
+from discord.ext.mock import MockServer
+from discord.http import HTTPClient
+from discord.message import Attachment
+
+CONTENT = bytes(range(256)) * 1024
+
+
+async def upload(server):
+    http = HTTPClient(loop=asyncio.get_running_loop(), api_base_url=server.api_base_url)
+    await http.static_login('token')
+
+    async def factory():
+        for start in range(0, len(CONTENT), 65536):
+            yield CONTENT[start : start + 65536]
+
+    channel_id = server.guilds[next(iter(server.guilds))]['channels'][0]['id']
+    message = await http.send_files(channel_id, files=[discord.File.from_stream(factory, 'data.bin')])
+    attachment = Attachment(data=message['attachments'][0], state=SimpleNamespace(http=http))
+    return http, message, attachment
+
+
+def test_uploaded_attachments_are_served(tmp_path):
+    async def main():
+        async with MockServer() as server:
+            http, message, attachment = await upload(server)
+            try:
+                assert attachment.size == len(CONTENT)
+                assert await attachment.read() == CONTENT
+
+                buffer = io.BytesIO()
+                assert await attachment.save(buffer, use_cached=True) == len(CONTENT)
+                assert buffer.getvalue() == CONTENT
+
+                # ranges are honoured so downloads can be resumed
+                chunks = [chunk async for chunk in attachment.stream(offset=1000, size=5000, chunk_size=1024)]
+                assert b''.join(chunks) == CONTENT[1000:6000]
+
+                path = tmp_path / 'data.bin'
+                path.write_bytes(CONTENT[:100000])
+                assert await attachment.save(str(path), resume=True) == len(CONTENT) - 100000
+                assert path.read_bytes() == CONTENT
+                assert [chunk async for chunk in attachment.stream(offset=len(CONTENT))] == []
+
+                # deleting the message deletes its attachments
+                await http.delete_message(message['channel_id'], message['id'])
+                with pytest.raises(NotFound):
+                    await attachment.read()
+            finally:
+                await http.close()
+
+    asyncio.run(main())
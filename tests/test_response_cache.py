@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from discord.http import ResponseCache, Route
+from discord.utils import MISSING
+
+GUILD = 'GET /guilds/{guild_id}'
+INVITE = 'GET /invites/{invite_id}'
+
+
+def key(route_key, params=None, **parameters):
+    method, _, path = route_key.partition(' ')
+    return (Route(method, path, **parameters).url, params)
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_entries_expire(now):
+    cache = ResponseCache(ttls={GUILD: 60.0})
+    cache.set(GUILD, key(GUILD, guild_id=1), {'id': '1'})
+    assert cache.get(key(GUILD, guild_id=1)) == {'id': '1'}
+
+    now[0] += 60.0
+    assert cache.get(key(GUILD, guild_id=1)) == {'id': '1'}
+    now[0] += 0.1
+    assert cache.get(key(GUILD, guild_id=1)) is MISSING
+    assert len(cache) == 0
+
+
+def test_routes_without_a_ttl_are_not_cached(now):
+    cache = ResponseCache(ttls={GUILD: 60.0})
+    cache.set(INVITE, key(INVITE, invite_id='abc'), {'code': 'abc'})
+    assert cache.get(key(INVITE, invite_id='abc')) is MISSING
+
+    cache.set_ttl(INVITE, 10.0)
+    cache.set(INVITE, key(INVITE, invite_id='abc'), {'code': 'abc'})
+    assert cache.get(key(INVITE, invite_id='abc')) == {'code': 'abc'}
+
+    # and disabling a route drops what was cached for it
+    cache.set_ttl(INVITE, None)
+    assert cache.get(key(INVITE, invite_id='abc')) is MISSING
+    cache.set(INVITE, key(INVITE, invite_id='abc'), {'code': 'abc'})
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted(now):
+    cache = ResponseCache(max_size=2, ttls={GUILD: 60.0})
+    for guild_id in (1, 2):
+        cache.set(GUILD, key(GUILD, guild_id=guild_id), guild_id)
+
+    # using the first entry makes the second one the oldest
+    assert cache.get(key(GUILD, guild_id=1)) == 1
+    cache.set(GUILD, key(GUILD, guild_id=3), 3)
+
+    assert len(cache) == 2
+    assert cache.get(key(GUILD, guild_id=2)) is MISSING
+    assert cache.get(key(GUILD, guild_id=1)) == 1
+    assert cache.get(key(GUILD, guild_id=3)) == 3
+    assert set(cache._by_url) == {key(GUILD, guild_id=1)[0], key(GUILD, guild_id=3)[0]}
+
+
+def test_invalidate_url_drops_every_query(now):
+    cache = ResponseCache(ttls={INVITE: 60.0})
+    url, _ = key(INVITE, invite_id='abc')
+    cache.set(INVITE, (url, None), 'plain')
+    cache.set(INVITE, (url, frozenset({('with_counts', 'true')})), 'counts')
+    cache.set(INVITE, key(INVITE, invite_id='xyz'), 'other')
+
+    cache.invalidate_url(url)
+    assert cache.get((url, None)) is MISSING
+    assert cache.get((url, frozenset({('with_counts', 'true')}))) is MISSING
+    assert cache.get(key(INVITE, invite_id='xyz')) == 'other'
+
+
+def test_invalidate_route(now):
+    cache = ResponseCache(ttls={GUILD: 60.0, INVITE: 60.0})
+    cache.set(GUILD, key(GUILD, guild_id=1), 1)
+    cache.set(GUILD, key(GUILD, guild_id=2), 2)
+    cache.set(INVITE, key(INVITE, invite_id='abc'), 'abc')
+
+    cache.invalidate(GUILD, guild_id=1)
+    assert cache.get(key(GUILD, guild_id=1)) is MISSING
+    assert cache.get(key(GUILD, guild_id=2)) == 2
+
+    cache.invalidate(GUILD)
+    assert cache.get(key(GUILD, guild_id=2)) is MISSING
+    assert cache.get(key(INVITE, invite_id='abc')) == 'abc'
+
+
+def test_invalidate_from_event(now):
+    cache = ResponseCache()
+    cache.set(GUILD, key(GUILD, guild_id=1), 1)
+    cache.set(GUILD, key(GUILD, guild_id=2), 2)
+    webhook = 'GET /webhooks/{webhook_id}'
+    cache.set(webhook, key(webhook, webhook_id=3), 3)
+
+    cache.invalidate_from_event('GUILD_UPDATE', {'id': '1'})
+    assert cache.get(key(GUILD, guild_id=1)) is MISSING
+    assert cache.get(key(GUILD, guild_id=2)) == 2
+
+    # payloads without the expected key are ignored
+    cache.invalidate_from_event('GUILD_DELETE', {'unavailable': True})
+    cache.invalidate_from_event('GUILD_DELETE', None)
+    assert cache.get(key(GUILD, guild_id=2)) == 2
+
+    cache.invalidate_from_event('WEBHOOKS_UPDATE', {'guild_id': '2', 'channel_id': '4'})
+    assert cache.get(key(webhook, webhook_id=3)) is MISSING